@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+
+import os
+import re
+import json
+import gzip
+import hashlib
+import staged_output
+import config_builder
+
+try:
+    import brotli
+except ImportError:
+    # Listed in requirements.txt; without it only .gz siblings are written
+    brotli = None
+
+# Configuration
+# The page is built from the index.html source, which stays as it is and
+# keeps working on its own with the plain file names. Serve the built page
+# as the site index (e.g. nginx "index index.build.html;").
+INDEX_FILE = "index.html"
+BUILT_INDEX_FILE = "index.build.html"
+ASSETS_DIR = "assets"
+MANIFEST_FILE = "asset-manifest.json"
+
+# Files copied to content-hashed names, e.g. words_config.json ->
+# assets/words_config.3f322045e0e81388.json. A hashed file never changes,
+# so it can be cached forever; the built page is the only file to revalidate.
+STATIC_ASSETS = ["styles.css", "script.js"]
+
+# Length of the content hash in the file names
+HASH_LENGTH = 16
+
+# Precompressed siblings for servers that serve them as is (nginx
+# gzip_static/brotli_static, Caddy precompressed, ...)
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+
+# Element of the built page holding the manifest, which script.js reads
+MANIFEST_ELEMENT = '<script id="asset-manifest" type="application/json">{}</script>'
+MANIFEST_PATTERN = re.compile(r'<script id="asset-manifest" type="application/json">.*?</script>', re.DOTALL)
+
+
+def get_asset_files():
+    """
+    Return the files to fingerprint: the stylesheet, the script and the configs.
+    """
+    return STATIC_ASSETS + list(config_builder.CONFIG_FILES.values())
+
+
+def read_file(path):
+    """
+    Return the current content of a live file, or None if it does not exist.
+    """
+    resolved = staged_output.input_path(path)
+    if resolved is None:
+        return None
+    try:
+        with open(resolved, "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def write_file(path, data):
+    """
+    Write a file through the staged output, unless it already has this content.
+    Returns True if it was written.
+    """
+    if read_file(path) == data:
+        return False
+    target = staged_output.output_path(path)
+    # Without staging, output_path does not create the directory
+    if os.path.dirname(target):
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+    with open(target, "wb") as f:
+        f.write(data)
+    return True
+
+
+def fingerprint_path(path, data):
+    """
+    Return the content-hashed name of a file in the assets directory.
+    """
+    stem, extension = os.path.splitext(os.path.basename(path))
+    digest = hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+    return f"{ASSETS_DIR}/{stem}.{digest}{extension}"
+
+
+def compress(data):
+    """
+    Return the precompressed variants of data by file suffix. Variants that
+    are not smaller than the original are left out.
+    """
+    variants = {".gz": gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)}
+    if brotli is not None:
+        variants[".br"] = brotli.compress(data, quality=BROTLI_QUALITY)
+    return {suffix: compressed for suffix, compressed in variants.items() if len(compressed) < len(data)}
+
+
+def write_compressed(path, data):
+    """
+    Write the precompressed siblings of a file and remove stale ones.
+    Returns the sizes of the written variants by suffix.
+    """
+    variants = compress(data)
+    for suffix in (".gz", ".br"):
+        if suffix in variants:
+            write_file(path + suffix, variants[suffix])
+        elif read_file(path + suffix) is not None:
+            staged_output.remove_output(path + suffix)
+    return {suffix: len(compressed) for suffix, compressed in variants.items()}
+
+
+def load_manifest():
+    """
+    Return the manifest of the previous build, or an empty one.
+    """
+    data = read_file(MANIFEST_FILE)
+    if data is None:
+        return {}
+    try:
+        return json.loads(data)
+    except ValueError:
+        return {}
+
+
+def render_index(html, manifest):
+    """
+    Point the stylesheet and script references of the page at their
+    fingerprinted names and embed the manifest for script.js.
+    """
+    for path in STATIC_ASSETS:
+        if path not in manifest:
+            continue
+        stem, extension = os.path.splitext(path)
+        # Matches the plain name and any earlier fingerprinted name
+        pattern = re.compile(
+            rf'(src|href)="(?:{ASSETS_DIR}/)?{re.escape(stem)}(?:\.[0-9a-f]{{{HASH_LENGTH}}})?{re.escape(extension)}"')
+        html = pattern.sub(lambda match: f'{match.group(1)}="{manifest[path]}"', html)
+
+    element = MANIFEST_ELEMENT.format(json.dumps(manifest, sort_keys=True))
+    if MANIFEST_PATTERN.search(html):
+        return MANIFEST_PATTERN.sub(lambda match: element, html, count=1)
+    # First build: embed the manifest right before the first script
+    return html.replace("<script", f"{element}\n    <script", 1)
+
+
+def remove_old_assets(manifest, previous):
+    """
+    Remove fingerprinted files that neither this build nor the previous one
+    refers to. The previous ones stay for pages loaded before the update.
+    """
+    keep = set(manifest.values()) | set(previous.values())
+    removed = 0
+    for name in staged_output.list_output(ASSETS_DIR):
+        path = f"{ASSETS_DIR}/{name}"
+        for suffix in (".gz", ".br"):
+            if path.endswith(suffix):
+                path = path[:-len(suffix)]
+        if path not in keep:
+            staged_output.remove_output(f"{ASSETS_DIR}/{name}")
+            removed += 1
+    return removed
+
+
+def build_assets():
+    """
+    Write fingerprinted, precompressed copies of the static files and
+    configs, the asset manifest, and the page referencing them. Run after
+    the configs are written. Returns the manifest.
+    """
+    previous = load_manifest()
+    manifest = {}
+    original_bytes = 0
+    compressed_bytes = 0
+    for path in get_asset_files():
+        data = read_file(path)
+        if data is None:
+            continue
+        manifest[path] = fingerprint_path(path, data)
+        write_file(manifest[path], data)
+        sizes = write_compressed(manifest[path], data)
+        original_bytes += len(data)
+        compressed_bytes += min(sizes.values(), default=len(data))
+
+    if not manifest:
+        print("No static assets found; skipping the asset build")
+        return manifest
+
+    write_file(MANIFEST_FILE, (json.dumps(manifest, indent=2, sort_keys=True) + "\n").encode("utf-8"))
+
+    removed = remove_old_assets(manifest, previous)
+
+    # The built page goes live last, once everything it refers to is in place
+    html = read_file(INDEX_FILE)
+    if html is not None:
+        html = render_index(html.decode("utf-8"), manifest).encode("utf-8")
+        write_file(BUILT_INDEX_FILE, html)
+        write_compressed(BUILT_INDEX_FILE, html)
+
+    share = 100 * compressed_bytes / original_bytes if original_bytes else 0
+    print(f"  Fingerprinted {len(manifest)} assets into {ASSETS_DIR}/: {original_bytes} bytes, "
+          f"{compressed_bytes} bytes precompressed ({share:.0f}%)")
+    if brotli is None:
+        print("  Warning: the brotli package is not installed, no .br files were written (gzip only)")
+    if removed:
+        print(f"  Removed {removed} outdated asset files")
+    return manifest
+
+
+def main():
+    """
+    Fingerprint and precompress the static files and configs.
+    """
+    print("Building static assets...")
+    staging = staged_output.begin()
+    try:
+        build_assets()
+        staging.commit()
+    finally:
+        staged_output.end()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,22 @@
 import os
+import sys
 import time
-import glob
 import re
-import shutil
-from gtts import gTTS
+import json
+import hashlib
+import argparse
+import contextlib
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from tts_cache import TTSCache
+from tts_scheduler import SynthesisScheduler, JobJournal
+import tts_backends
+import config_builder
+import sprite_packer
+import audio_postprocess
+import audio_renditions
+import asset_builder
+import build_metrics
+import staged_output
 
 # =============== CONFIGURATION ===============
 # Input directory for category files
@@ -13,9 +26,85 @@ CATEGORIES_DIR = "Categories"
 KOREAN_DIR = "Korean"
 ENGLISH_DIR = "English"
 
-# Target bin to process: "Alphabet", "Words", "Phrases", or "ALL"
-# Change this to focus on only one bin at a time
-TARGET_BIN = "Alphabet"  # Options: "Alphabet", "Words", "Phrases", or "ALL"
+# Bin processed when --bin is not given
+TARGET_BIN = "Alphabet"  # Options: "Alphabet", "Words", "Phrases", "ALL", or a list of bins
+
+# Maximum number of speech requests that run at the same time.
+# gTTS is network bound, so a small pool hides most of the round-trip latency.
+MAX_WORKERS = 8
+
+# Synthesis requests queued per worker. Jobs are handed to the pool only as
+# earlier ones finish, so memory does not grow with the size of the input.
+IN_FLIGHT_PER_WORKER = 2
+
+# Worker processes that category files are spread across. Each process runs
+# its own pool of MAX_WORKERS synthesis threads and gets an equal share of
+# the request rate limit. 1 processes everything in this process.
+PROCESSES = 1
+
+# TTS backend used to synthesize speech: "gtts" (online), "espeak" (offline,
+# needs espeak-ng), "stub" (silent clips, for tests) or "stub-throttled" (stub
+# that answers some requests with 429s). See tts_backends.py.
+TTS_BACKEND = "gtts"
+
+# Persistent cache of synthesized clips, keyed by text, language, slow flag
+# and TTS version. Set CACHE_DIR to None to always synthesize.
+CACHE_DIR = ".tts_cache"
+CACHE_MAX_BYTES = 200 * 1024 * 1024  # 200 MB, least recently used clips are evicted
+
+# Incremental mode keeps clips of unchanged lines from the previous build and
+# only synthesizes added or changed lines. The build manifests that record
+# which files each line produced are kept in MANIFEST_DIR.
+INCREMENTAL = False
+MANIFEST_DIR = ".build_manifest"
+
+# Pack each processed category into one audio sprite per language, so the web
+# client fetches one file per category instead of one per clip
+PACK_SPRITES = False
+
+# Trim leading/trailing silence and normalize the loudness of newly
+# synthesized clips (see audio_postprocess.py)
+POSTPROCESS_AUDIO = False
+
+# Encode low-bitrate Opus and AAC renditions of the processed clips next to
+# their copy in the audio store (see audio_renditions.py). Needs ffmpeg.
+TRANSCODE_RENDITIONS = False
+
+# Write fingerprinted, precompressed copies of the configs and static files
+# after the configs, and a page referencing them (see asset_builder.py)
+BUILD_ASSETS = True
+
+# Maximum number of short items of the same language packed into one
+# synthesis request, for backends that support it. 1 disables batching.
+SYNTHESIS_BATCH_SIZE = 1
+
+# Rate limit shared by all workers: at most REQUESTS_PER_SECOND synthesis
+# requests start per second, after an initial burst of REQUEST_BURST.
+# None uses the backend's own limit (10/s for gTTS, none for local engines).
+# Throttled (HTTP 429) and other transient failures are retried up to
+# MAX_ATTEMPTS times with jittered exponential backoff.
+REQUESTS_PER_SECOND = None
+REQUEST_BURST = 8
+MAX_ATTEMPTS = 5
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_MAX_SECONDS = 60.0
+
+# Journals of clips completed by the current run, one per selection of
+# category files. If a run is interrupted, the next run over the same files
+# keeps those clips and resumes where it stopped. A journal is deleted once
+# the run's output is committed. Set to None to disable resuming.
+JOURNAL_DIR = ".build_journal"
+
+# New audio, sprites, manifests and configs are written to this staging
+# directory and swapped into the live tree only once the whole run is
+# complete, so the game keeps serving the previous build while a run is in
+# progress and a crash leaves the live files as they were. Each selection of
+# bins and categories stages in a directory of its own inside it (see
+# get_staging_root), so runs over different bins can execute side by side.
+STAGING_DIR = staged_output.STAGING_DIR
+
+# Journals of file groups finalized by this run, deleted after the commit
+_finished_journals = []
 
 # Sound examples for English consonants to generate proper sounds
 ENGLISH_CONSONANT_SOUND_EXAMPLES = {
@@ -127,6 +216,21 @@ KOREAN_VOWEL_SOUND_EXAMPLES = {
     'ㅣ': '이'
 }
 
+# Separators of the "Korean → English" and "Korean, English" line formats,
+# tried in this order
+LINE_SEPARATORS = ["→", ","]
+
+# Hangul syllables, Hangul Jamo (including the compatibility Jamo ㄱ-ㅣ used
+# by the alphabet files) and the extended Jamo blocks
+HANGUL_CHARACTERS = "\u1100-\u11ff\u3131-\u318e\ua960-\ua97f\uac00-\ud7a3\ud7b0-\ud7ff"
+
+# "Korean English" lines: everything up to the last Hangul character (plus
+# any sentence punctuation right after it), then the English text
+KOREAN_ENGLISH_PATTERN = re.compile(rf"(.*[{HANGUL_CHARACTERS}][.?!]*)(.*)", re.DOTALL)
+
+# Characters removed from file names
+FILENAME_UNSAFE_TABLE = str.maketrans("", "", '\\/*?:"<>|')
+
 # =============== CODE ===============
 
 
@@ -143,92 +247,199 @@ def parse_line(line):
     if not line:
         return None
 
-    # Format 1: With arrows (→)
-    if "→" in line:
-        parts = [part.strip() for part in line.split("→")]
-        if len(parts) >= 2:
-            return parts[0], parts[1]
+    # Format 1, 3 & 4: arrow or comma separated (with or without spaces)
+    for separator in LINE_SEPARATORS:
+        if separator in line:
+            parts = line.split(separator, 2)
+            return parts[0].strip(), parts[1].strip()
+
+    # Format 2: Space-separated. The Korean part runs up to the last Hangul
+    # character (so it may contain digits or Latin letters, e.g. "3시" or
+    # "K팝"), and the English part is everything after it.
+    match = KOREAN_ENGLISH_PATTERN.fullmatch(line)
+    if match:
+        korean_text = match.group(1).strip()
+        english_text = match.group(2).strip()
+        if korean_text and english_text:
+            return korean_text, english_text
 
-    # Format 3 & 4: Comma-separated (with or without spaces)
-    elif "," in line:
-        parts = [part.strip() for part in line.split(",")]
-        if len(parts) >= 2:
-            return parts[0], parts[1]
+    # If we can't parse the line properly
+    return None
 
-    # Format 2: Space-separated (this might cause issues with multi-word items)
-    else:
-        # Try to determine where Korean ends and English begins
-        # Korean characters are in the range U+AC00 to U+D7A3
-        korean_chars = []
-        non_korean_start = 0
-
-        for i, char in enumerate(line):
-            if "\uac00" <= char <= "\ud7a3" or char.isspace() or char in ".,?!":
-                korean_chars.append(char)
-                non_korean_start = i + 1
-            else:
-                break
 
-        # If we found any Korean characters, split at that point
-        if korean_chars and non_korean_start < len(line):
-            korean_text = "".join(korean_chars).strip()
-            english_text = line[non_korean_start:].strip()
+def clean_filename(text):
+    """
+    Remove characters that are not allowed in file names.
+    """
+    return text.translate(FILENAME_UNSAFE_TABLE)
+
 
-            if korean_text and english_text:
-                return korean_text, english_text
+def read_category_file(file_path):
+    """
+    Read a vocabulary file one line at a time, so files of any size are read
+    in constant memory. Yields (line number, stripped line, parsed pair) for
+    every non-empty line; the pair is None if the line could not be parsed.
+    """
+    with open(file_path, "r", encoding="utf-8") as file:
+        for line_number, line in enumerate(file, 1):
+            line = line.strip()
+            if line:
+                yield line_number, line, parse_line(line)
 
-    # If we can't parse the line properly
-    return None
+
+# Seconds spent in each pipeline stage by this process: "parse", "clear",
+# "filesystem", "synthesis", "postprocess", "sprites", "configs" and "commit"
+STAGE_TIMES = {}
+_stage_stack = []
+
+
+@contextlib.contextmanager
+def timed_stage(name):
+    """
+    Add the time spent in the block to STAGE_TIMES[name]. Time spent in a
+    stage nested inside another one is only counted for the inner stage.
+    Stages are timed from the main thread only.
+    """
+    start = time.perf_counter()
+    # Time of nested stages, which the outer stage does not count
+    _stage_stack.append(0.0)
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        nested = _stage_stack.pop()
+        STAGE_TIMES[name] = STAGE_TIMES.get(name, 0.0) + elapsed - nested
+        if _stage_stack:
+            _stage_stack[-1] += elapsed
+
+
+# Latency histograms and counters of this process, written with --metrics
+# and --prometheus
+METRICS = build_metrics.MetricsRegistry()
+
+
+def timed_request(func):
+    """
+    Wrap a backend call so the duration of every attempt is recorded.
+    """
+    def request(*args):
+        with METRICS.timer("synthesis_request_seconds"):
+            return func(*args)
+    return request
 
 
-def get_next_file_number(directory):
+_tts_cache = None
+
+
+def get_tts_cache():
     """
-    Find the highest file number in the directory and return the next number.
-    Files are expected to have names like: 000_filename.mp3, 001_filename.mp3, etc.
+    Return the shared synthesis cache, or None if caching is disabled.
     """
-    # Get all MP3 files in the directory
-    files = glob.glob(os.path.join(directory, "*.mp3"))
+    global _tts_cache
+    if CACHE_DIR is None:
+        return None
+    if _tts_cache is None or _tts_cache.cache_dir != CACHE_DIR:
+        _tts_cache = TTSCache(CACHE_DIR, CACHE_MAX_BYTES)
+    return _tts_cache
 
-    # Extract the numbers from filenames
-    numbers = []
-    for file in files:
-        basename = os.path.basename(file)
-        if basename[:3].isdigit():
-            try:
-                numbers.append(int(basename[:3]))
-            except ValueError:
-                pass
 
-    # If there are no files or no numbered files, start with 0
-    if not numbers:
-        return 0
+_tts_backend = None
 
-    # Return the next number after the highest one found
-    return max(numbers) + 1
+
+def get_tts_backend():
+    """
+    Return the shared instance of the configured TTS backend.
+    """
+    global _tts_backend
+    if _tts_backend is None or _tts_backend.name != TTS_BACKEND:
+        _tts_backend = tts_backends.get_backend(TTS_BACKEND)
+    return _tts_backend
+
+
+_scheduler = None
+
+
+def get_scheduler():
+    """
+    Return the shared rate limiter and retry policy for synthesis requests.
+    """
+    global _scheduler
+    if _scheduler is None:
+        rate = REQUESTS_PER_SECOND
+        if rate is None:
+            rate = get_tts_backend().requests_per_second
+        _scheduler = SynthesisScheduler(rate, REQUEST_BURST, MAX_ATTEMPTS,
+                                        BACKOFF_BASE_SECONDS, BACKOFF_MAX_SECONDS)
+    return _scheduler
+
+
+def get_tts_version():
+    """
+    Identify the TTS backend and its version, so cached clips from a different
+    engine or engine release are never reused.
+    """
+    backend = get_tts_backend()
+    return f"{backend.name}/{backend.version}"
+
+
+def remove_existing_file(output_filename):
+    """
+    Remove an output file left over from an earlier run.
+    """
+    if os.path.exists(output_filename):
+        print(f"  - Removing existing file: {output_filename}")
+        os.remove(output_filename)
+
+
+def fetch_cached_mp3(text, output_filename, language, slow):
+    """
+    Copy a clip from the synthesis cache to output_filename. Returns True on a hit.
+    """
+    cache = get_tts_cache()
+    if cache is None:
+        return False
+    cache_key = cache.make_key(text, language, slow, get_tts_version())
+    with METRICS.timer("cache_fetch_seconds"):
+        hit = cache.fetch(cache_key, output_filename)
+    if hit:
+        print(f"Using cached {language} speech for: {text}")
+        return True
+    return False
+
+
+def store_cached_mp3(text, output_filename, language, slow):
+    """
+    Add a freshly synthesized clip to the synthesis cache.
+    """
+    cache = get_tts_cache()
+    if cache is not None:
+        with METRICS.timer("cache_store_seconds"):
+            cache.store(cache.make_key(text, language, slow, get_tts_version()), output_filename)
 
 
 def create_mp3_from_text(text, output_filename, language="ko", slow=False):
     """
-    Creates an MP3 file from text using gTTS.
+    Creates an MP3 file from text using the configured TTS backend (gTTS by default).
+    Clips already in the synthesis cache are copied instead of synthesized.
     """
     try:
-        print(f"Generating {language} speech for: {text}")
-
         # Check if file already exists and remove it
-        if os.path.exists(output_filename):
-            print(f"  - Removing existing file: {output_filename}")
-            os.remove(output_filename)
+        remove_existing_file(output_filename)
 
-        # Create a gTTS object
-        tts = gTTS(text=text, lang=language, slow=slow)
+        if fetch_cached_mp3(text, output_filename, language, slow):
+            return True
 
-        # Save directly to a file
-        tts.save(output_filename)
+        print(f"Generating {language} speech for: {text}")
+
+        # Synthesize directly to the output file, within the rate limit
+        get_scheduler().call(timed_request(get_tts_backend().synthesize), text, language, slow, output_filename)
 
         # Verify file was created
         if not os.path.exists(output_filename):
             raise Exception(f"File was not created at {output_filename}")
 
+        store_cached_mp3(text, output_filename, language, slow)
+
         print(f"Successfully saved to: {output_filename}")
         return True
     except Exception as e:
@@ -236,17 +447,47 @@ def create_mp3_from_text(text, output_filename, language="ko", slow=False):
         return False
 
 
-def clear_directory(directory_path):
+def create_mp3s_from_texts(texts, output_filenames, language="ko", slow=False):
+    """
+    Creates several MP3 files with one batched request to the TTS backend.
+    If the batch fails (or cannot be split back into clips), each text is
+    synthesized on its own instead. Returns a list of success flags.
+    """
+    try:
+        for output_filename in output_filenames:
+            remove_existing_file(output_filename)
+
+        print(f"Generating {language} speech for {len(texts)} items in one request: {' / '.join(texts)}")
+        get_scheduler().call(timed_request(get_tts_backend().synthesize_batch),
+                             texts, language, slow, output_filenames)
+
+        for text, output_filename in zip(texts, output_filenames):
+            if not os.path.exists(output_filename):
+                raise Exception(f"File was not created at {output_filename}")
+            store_cached_mp3(text, output_filename, language, slow)
+
+        print(f"Successfully saved {len(texts)} batched clips")
+        return [True] * len(texts)
+    except Exception as e:
+        print(f"Error in batched request ({str(e)}), synthesizing {len(texts)} items one by one")
+        return [create_mp3_from_text(text, output_filename, language, slow)
+                for text, output_filename in zip(texts, output_filenames)]
+
+
+def clear_directory(directory_path, keep=()):
     """
-    Clear all MP3 files in the specified directory.
+    Clear all MP3 files in the specified directory, except the paths in keep.
     """
     if os.path.exists(directory_path):
         print(f"Clearing existing MP3 files in {directory_path}")
         for filename in os.listdir(directory_path):
             if filename.lower().endswith('.mp3'):
                 file_path = os.path.join(directory_path, filename)
+                if file_path in keep:
+                    continue
                 try:
                     os.remove(file_path)
+                    METRICS.increment("files_removed")
                     print(f"  - Removed: {filename}")
                 except Exception as e:
                     print(f"  - Error removing {filename}: {e}")
@@ -256,10 +497,18 @@ def clear_directory(directory_path):
         print(f"Created directory: {directory_path}")
 
 
-def process_file(file_path):
+def plan_file(file_path, incremental=None, journal=None):
     """
-    Process a vocabulary file and generate MP3 files for each word in
-    both Korean and English.
+    Read a vocabulary file and plan every MP3 that needs to be generated for it.
+    The staged output directories are cleared here, but no speech is
+    synthesized yet. In incremental mode, clips of lines unchanged since the
+    last build are carried over from the live directories. Clips recorded in
+    the journal of an interrupted run are kept as well.
+
+    Each planned item is one numbered output for one language. It holds an
+    optional "name" job (alphabet letter names) and a "sound" job. Items are
+    given provisional slot numbers in line order; the final NNN_ numbers are
+    assigned by finalize_plan once we know which jobs succeeded.
     """
     # Get full relative path from Categories directory
     rel_path = os.path.relpath(file_path, CATEGORIES_DIR)
@@ -284,199 +533,634 @@ def process_file(file_path):
     is_english_file = category.startswith("english_")
     is_korean_file = category.startswith("korean_")
     
-    # Create output directories with bin structure, only for the appropriate language
-    if is_english_file:
-        english_dir = os.path.join(ENGLISH_DIR, bin_name, category)
-        # Clear and create English directory
-        clear_directory(english_dir)
-    elif is_korean_file:
-        korean_dir = os.path.join(KOREAN_DIR, bin_name, category)
-        # Clear and create Korean directory
-        clear_directory(korean_dir)
-    else:
-        # For non-language-specific files, create both directories
-        korean_dir = os.path.join(KOREAN_DIR, bin_name, category)
-        english_dir = os.path.join(ENGLISH_DIR, bin_name, category)
-        # Clear and create both directories
-        clear_directory(korean_dir)
-        clear_directory(english_dir)
-
-    # Get the next file number for each language
-    next_korean_number = 0 # Always start from 0 after clearing
-    next_english_number = 0 # Always start from 0 after clearing
-
-    # Only show the directories we're actually using
+    if incremental is None:
+        incremental = INCREMENTAL
+
+    # Output directories with bin structure, only for the appropriate language
+    korean_dir = os.path.join(KOREAN_DIR, bin_name, category)
+    english_dir = os.path.join(ENGLISH_DIR, bin_name, category)
     if is_english_file:
-        print(f"English output directory: {english_dir}")
+        directories = [english_dir]
     elif is_korean_file:
-        print(f"Korean output directory: {korean_dir}")
+        directories = [korean_dir]
     else:
-        print(f"Korean output directory: {korean_dir}")
-        print(f"English output directory: {english_dir}")
-
-    print(f"Starting Korean file numbering at: {next_korean_number:03d}")
-    print(f"Starting English file numbering at: {next_english_number:03d}")
-
-    # Track successful Korean and English conversions
-    successful_korean = []
-    successful_english = []
-    failed_korean = []
-    failed_english = []
+        # For non-language-specific files, use both directories
+        directories = [korean_dir, english_dir]
+
+    # Clips are written to staged copies of the directories; the live ones
+    # are only replaced when the run is committed
+    staged_directories = {}
+    for directory in directories:
+        with timed_stage("clear"), METRICS.timer("clear_directory_seconds"):
+            staged_directory = staged_output.output_path(directory, kind="dir")
+            clear_directory(staged_directory, keep=journal.paths() if journal is not None else ())
+        staged_directories[directory] = staged_directory
+        language_name = "Korean" if directory == korean_dir else "English"
+        print(f"{language_name} output directory: {directory} (staged in {staged_directory})")
+
+    # Provisional slot numbers, always starting from 0 after clearing
+    slots = {"ko": 0, "en": 0}
+
+    # Ordered list of parse errors and planned items, in line order
+    entries = []
+
+    def add_item(language, directory, character, clean_text, sound_text, name_text=None, slow=False):
+        slot = slots[language]
+        slots[language] += 1
+        staged_directory = staged_directories[directory]
+        item = {
+            "type": "item",
+            "language": language,
+            "directory": directory,
+            "staged_directory": staged_directory,
+            "clean": clean_text,
+            "slot": slot,
+            "key": item_key(language, clean_text, sound_text, slow, name_text),
+            "name": None,
+            "sound": {
+                "text": sound_text,
+                "slow": slow,
+                "path": os.path.join(staged_directory, f"{slot:03d}_{clean_text}.mp3"),
+                "failure": f"{character} (sound)" if name_text is not None else character,
+                "ok": False,
+            },
+        }
+        if name_text is not None:
+            item["name"] = {
+                "text": name_text,
+                "slow": False,
+                "path": os.path.join(staged_directory, f"{slot:03d}_{clean_text}_name.mp3"),
+                "failure": f"{character} (name)",
+                "ok": False,
+            }
+        entries.append(item)
 
     try:
-        # Read and process the vocabulary file
-        with open(file_path, "r", encoding="utf-8") as file:
-            for line_number, line in enumerate(file, 1):
-                if not line.strip():
+        # Read and plan the vocabulary file
+        for line_number, line, result in read_category_file(file_path):
+            if not result:
+                error_msg = f"Line {line_number}: '{line}' could not be parsed. Skipping."
+                print(error_msg)
+                entries.append({"type": "error", "message": error_msg})
+                continue
+
+            character, pronunciation = result
+
+            # Special handling for alphabet files
+            if is_alphabet:
+                if is_english_file:
+                    # For English alphabet files, need separate handling for consonants and vowels
+                    base_category = category.replace("english_", "")
+                    
+                    # Clean filenames
+                    clean_character = clean_filename(character)
+                    
+                    # Get the appropriate sound example based on the category and character
+                    sound_example = ""
+                    if base_category == "consonants" and character in ENGLISH_CONSONANT_SOUND_EXAMPLES:
+                        sound_example = ENGLISH_CONSONANT_SOUND_EXAMPLES[character]
+                    elif base_category == "vowels" and character in ENGLISH_VOWEL_SOUND_EXAMPLES:
+                        sound_example = ENGLISH_VOWEL_SOUND_EXAMPLES[character]
+                    else:
+                        # If no special example, use character with the pronunciation
+                        sound_example = pronunciation
+                    
+                    print(f"Planned English alphabet {line_number}: '{character}' ('{sound_example}')")
+                    add_item("en", english_dir, character, clean_character, sound_example,
+                             name_text=character, slow=True)
+                    
+                    # Skip Korean generation for English alphabet files
                     continue
-
-                # Parse the line based on different formats
-                result = parse_line(line)
-                if not result:
-                    error_msg = f"Line {line_number}: '{line.strip()}' could not be parsed. Skipping."
-                    print(error_msg)
-                    failed_korean.append(error_msg)
-                    failed_english.append(error_msg)
+                
+                elif is_korean_file:
+                    # For Korean alphabet files, need separate handling for consonants and vowels
+                    base_category = category.replace("korean_", "")
+                    
+                    # Clean filenames
+                    clean_character = clean_filename(character)
+                    
+                    # Get the appropriate sound example based on the category and character
+                    sound_example = ""
+                    if base_category == "consonants" and character in KOREAN_CONSONANT_SOUND_EXAMPLES:
+                        sound_example = KOREAN_CONSONANT_SOUND_EXAMPLES[character]
+                    elif base_category == "vowels" and character in KOREAN_VOWEL_SOUND_EXAMPLES:
+                        sound_example = KOREAN_VOWEL_SOUND_EXAMPLES[character]
+                    else:
+                        # If no special example, use character
+                        sound_example = character
+                    
+                    print(f"Planned Korean alphabet {line_number}: '{character}' using '{sound_example}'")
+                    add_item("ko", korean_dir, character, clean_character, sound_example,
+                             name_text=character)
+                    
+                    # Skip English generation for Korean alphabet files
                     continue
 
-                character, pronunciation = result
-
-                # Special handling for alphabet files
-                if is_alphabet:
-                    if is_english_file:
-                        # For English alphabet files, need separate handling for consonants and vowels
-                        base_category = category.replace("english_", "")
-                        
-                        # Clean filenames
-                        clean_character = re.sub(r'[\\/*?:"<>|]', "", character)
-                        
-                        # Generate filenames with sequential numbers
-                        english_filename = f"{next_english_number:03d}_{clean_character}.mp3"
-                        english_name_filename = f"{next_english_number:03d}_{clean_character}_name.mp3"
-                        
-                        english_path = os.path.join(english_dir, english_filename)
-                        english_name_path = os.path.join(english_dir, english_name_filename)
-                        
-                        print(f"\nProcessing English alphabet {line_number}: {character}")
-                        
-                        # Generate English MP3 for letter name
-                        print(f"Generating letter name audio for '{character}'")
-                        if create_mp3_from_text(character, english_name_path, "en"):
-                            successful_english.append(f"{next_english_number:03d}_{clean_character}_name")
-                        else:
-                            failed_english.append(f"{character} (name)")
-                        
-                        # Get the appropriate sound example based on the category and character
-                        sound_example = ""
-                        if base_category == "consonants" and character in ENGLISH_CONSONANT_SOUND_EXAMPLES:
-                            sound_example = ENGLISH_CONSONANT_SOUND_EXAMPLES[character]
-                        elif base_category == "vowels" and character in ENGLISH_VOWEL_SOUND_EXAMPLES:
-                            sound_example = ENGLISH_VOWEL_SOUND_EXAMPLES[character]
-                        else:
-                            # If no special example, use character with the pronunciation
-                            sound_example = pronunciation
-                        
-                        # Generate English MP3 for letter sound
-                        print(f"Generating letter sound audio for '{character}' ('{sound_example}')")
-                        if create_mp3_from_text(sound_example, english_path, "en", slow=True):
-                            successful_english.append(f"{next_english_number:03d}_{clean_character}")
-                            next_english_number += 1
-                        else:
-                            failed_english.append(f"{character} (sound)")
-                        
-                        # Skip Korean generation for English alphabet files
-                        continue
-                    
-                    elif is_korean_file:
-                        # For Korean alphabet files, need separate handling for consonants and vowels
-                        base_category = category.replace("korean_", "")
-                        
-                        # Clean filenames
-                        clean_character = re.sub(r'[\\/*?:"<>|]', "", character)
-                        
-                        # Generate filenames with sequential numbers
-                        korean_filename = f"{next_korean_number:03d}_{clean_character}.mp3"
-                        korean_name_filename = f"{next_korean_number:03d}_{clean_character}_name.mp3"
-                        
-                        korean_path = os.path.join(korean_dir, korean_filename)
-                        korean_name_path = os.path.join(korean_dir, korean_name_filename)
-                        
-                        print(f"\nProcessing Korean alphabet {line_number}: {character}")
-                        
-                        # Generate Korean MP3 for letter name
-                        print(f"Generating letter name audio for '{character}' (name)")
-                        if create_mp3_from_text(character, korean_name_path, "ko"):
-                            successful_korean.append(f"{next_korean_number:03d}_{clean_character}_name")
-                        else:
-                            failed_korean.append(f"{character} (name)")
-                        
-                        # Get the appropriate sound example based on the category and character
-                        sound_example = ""
-                        if base_category == "consonants" and character in KOREAN_CONSONANT_SOUND_EXAMPLES:
-                            sound_example = KOREAN_CONSONANT_SOUND_EXAMPLES[character]
-                        elif base_category == "vowels" and character in KOREAN_VOWEL_SOUND_EXAMPLES:
-                            sound_example = KOREAN_VOWEL_SOUND_EXAMPLES[character]
-                        else:
-                            # If no special example, use character
-                            sound_example = character
-                        
-                        # Generate Korean MP3 for letter sound
-                        print(f"Generating letter sound audio for '{character}' using '{sound_example}'")
-                        if create_mp3_from_text(sound_example, korean_path, "ko"):
-                            successful_korean.append(f"{next_korean_number:03d}_{clean_character}")
-                            next_korean_number += 1
-                        else:
-                            failed_korean.append(f"{character} (sound)")
-                        
-                        # Skip English generation for Korean alphabet files
-                        continue
-
-                # Normal processing for non-alphabet files or unlabeled alphabet files
-                # Clean filenames (remove characters that aren't allowed in filenames)
-                clean_korean = re.sub(r'[\\/*?:"<>|]', "", character)
-                clean_english = re.sub(r'[\\/*?:"<>|]', "", pronunciation)
-
-                # Generate filenames with sequential numbers
-                korean_filename = f"{next_korean_number:03d}_{clean_korean}.mp3"
-                english_filename = f"{next_english_number:03d}_{clean_english}.mp3"
-
-                korean_path = os.path.join(korean_dir, korean_filename)
-                english_path = os.path.join(english_dir, english_filename)
-
-                print(f"\nProcessing word pair {line_number}: {character} / {pronunciation}")
-
-                # Generate Korean MP3
-                if create_mp3_from_text(character, korean_path, "ko"):
-                    successful_korean.append(f"{next_korean_number:03d}_{clean_korean}")
-                    next_korean_number += 1
-                else:
-                    failed_korean.append(character)
+            # Normal processing for non-alphabet files or unlabeled alphabet files
+            # Clean filenames (remove characters that aren't allowed in filenames)
+            clean_korean = clean_filename(character)
+            clean_english = clean_filename(pronunciation)
 
-                # Generate English MP3
-                if create_mp3_from_text(pronunciation, english_path, "en"):
-                    successful_english.append(f"{next_english_number:03d}_{clean_english}")
-                    next_english_number += 1
-                else:
-                    failed_english.append(pronunciation)
+            print(f"Planned word pair {line_number}: {character} / {pronunciation}")
+            add_item("ko", korean_dir, character, clean_korean, character)
+            add_item("en", english_dir, pronunciation, clean_english, pronunciation)
 
     except Exception as e:
         print(f"Error processing file {file_path}: {str(e)}")
 
-    # Return results for this category
-    return {
+    plan = {
         "bin": bin_name,
         "category": category,
-        "successful_korean": successful_korean,
-        "successful_english": successful_english,
-        "failed_korean": failed_korean,
-        "failed_english": failed_english,
+        "directories": directories,
+        "staged_directories": list(staged_directories.values()),
+        "entries": entries,
     }
 
+    with timed_stage("filesystem"):
+        if journal is not None:
+            resume_from_journal(plan, journal)
+
+        if incremental:
+            reuse_previous_build(plan)
+
+    return plan
+
+
+def iter_jobs(plan):
+    """
+    List every job of a plan as (job, language) pairs, name before sound.
+    """
+    jobs = []
+    for entry in plan["entries"]:
+        if entry["type"] != "item":
+            continue
+        if entry["name"] is not None:
+            jobs.append((entry["name"], entry["language"]))
+        jobs.append((entry["sound"], entry["language"]))
+    return jobs
+
+
+def journal_key(job, language):
+    """
+    Return the journal key of a synthesis job.
+    """
+    return JobJournal.make_key(job["text"], language, job["slow"], get_tts_version())
+
+
+def resume_from_journal(plan, journal):
+    """
+    Mark jobs completed by an interrupted run as done, so they are not
+    synthesized again. Journaled files of this plan's staged directories
+    that no longer match a job (e.g. the vocabulary file changed) are removed.
+    """
+    claimed = set()
+    for job, language in iter_jobs(plan):
+        stage = journal.lookup(journal_key(job, language), job["path"])
+        if stage is not None:
+            job["ok"] = True
+            job["resumed"] = stage
+            claimed.add(job["path"])
 
-def process_all_categories():
+    for path in journal.paths() - claimed:
+        if os.path.dirname(path) in plan["staged_directories"] and os.path.exists(path):
+            os.remove(path)
+
+    if claimed:
+        print(f"Resuming: {len(claimed)} clips were completed by the interrupted run")
+
+
+def item_key(language, clean_text, sound_text, slow, name_text):
+    """
+    Hash everything that determines the content of an item's clips, apart
+    from its number. Items with the same key can reuse each other's files.
+    """
+    raw = json.dumps([get_tts_version(), language, clean_text, sound_text, slow, name_text],
+                     ensure_ascii=False)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def get_manifest_path(bin_name, category):
+    """
+    Return the path of the build manifest for a category.
+    """
+    return os.path.join(MANIFEST_DIR, bin_name, f"{category}.json")
+
+
+def load_manifest(bin_name, category):
+    """
+    Load the build manifest of a category, or an empty one if there is none.
+    """
+    manifest_path = get_manifest_path(bin_name, category)
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {"items": []}
+
+
+def save_manifest(plan):
+    """
+    Record which files every successfully generated item of a plan produced.
+    """
+    items = []
+    for entry in plan["entries"]:
+        if entry["type"] != "item" or not entry["sound"]["ok"]:
+            continue
+        item = {
+            "key": entry["key"],
+            "directory": entry["directory"],
+            "sound": os.path.basename(entry["sound"]["path"]),
+            "name": None,
+        }
+        if entry["name"] is not None and entry["name"]["ok"]:
+            item["name"] = os.path.basename(entry["name"]["path"])
+        items.append(item)
+
+    # Staged with the clips, so the manifest never describes files that are not live
+    manifest_path = staged_output.output_path(get_manifest_path(plan["bin"], plan["category"]))
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump({"items": items}, f, ensure_ascii=False, indent=2)
+
+
+def reuse_previous_build(plan):
+    """
+    Match planned items against the last build's manifest and keep the files
+    of unchanged items, so only added or changed lines are synthesized.
+
+    Kept files are hard-linked (or copied, where links are not supported)
+    from the live directory to their provisional slot path in the staged
+    directory; finalize_plan renames them to their final number. Clips of
+    changed or removed lines are simply not carried over.
+    """
+    # Map item keys to the files they produced last time (keys can repeat)
+    previous = {}
+    for item in load_manifest(plan["bin"], plan["category"])["items"]:
+        previous.setdefault(item["key"], []).append(item)
+
+    reused_count = 0
+    for entry in plan["entries"]:
+        if entry["type"] != "item":
+            continue
+        if any(job is not None and job.get("resumed") for job in (entry["name"], entry["sound"])):
+            # Clips already synthesized by an interrupted run of this build
+            continue
+        candidates = previous.get(entry["key"])
+        if not candidates:
+            continue
+        old = candidates[0]
+        if old["directory"] != entry["directory"]:
+            continue
+
+        jobs = [(entry["sound"], old["sound"])]
+        if entry["name"] is not None:
+            if old["name"] is None:
+                continue
+            jobs.append((entry["name"], old["name"]))
+
+        old_paths = [os.path.join(old["directory"], old_file) for _, old_file in jobs]
+        if not all(os.path.isfile(path) for path in old_paths):
+            continue
+
+        candidates.pop(0)
+        reused_count += 1
+        for (job, _), old_path in zip(jobs, old_paths):
+            # The live file stays in place until the run is committed
+            config_builder.link_or_copy(old_path, job["path"])
+            job["ok"] = True
+            job["reused"] = True
+
+    print(f"Incremental build: reusing {reused_count} items")
+
+
+def plan_jobs(plan):
+    """
+    List the jobs of a plan that still need synthesis as (job, language) pairs.
+    """
+    return [(job, language) for job, language in iter_jobs(plan)
+            if not job.get("reused") and not job.get("resumed")]
+
+
+def make_batches(jobs, batch_size, max_chars):
+    """
+    Group (job, language) pairs into batches of the same language and speed,
+    with at most batch_size items and max_chars characters of text each.
+    Jobs keep their order, so batches hold neighbouring items of a category.
+    Batches are yielded as soon as they are full, so jobs can be a generator.
+    """
+    open_batches = {}
+    for job, language in jobs:
+        group = (language, job["slow"])
+        batch = open_batches.get(group)
+        if batch is not None:
+            batch_chars = sum(len(j["text"]) + 1 for j, _ in batch)
+            if len(batch) >= batch_size or batch_chars + len(job["text"]) > max_chars:
+                yield batch
+                batch = None
+        if batch is None:
+            batch = []
+            open_batches[group] = batch
+        batch.append((job, language))
+    yield from open_batches.values()
+
+
+def run_bounded(executor, func, items, max_pending):
+    """
+    Call func on every item in the executor, with at most max_pending calls
+    submitted at once. Items are pulled from the iterable only as calls
+    finish, so memory stays bounded however many items there are.
+    Exceptions raised by func are raised here.
+    """
+    pending = set()
+    for item in items:
+        if len(pending) >= max_pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                future.result()
+        pending.add(executor.submit(func, item))
+    for future in pending:
+        future.result()
+
+
+def synthesize_plans(plans, max_workers=None, batch_size=None, journal=None):
+    """
+    Synthesize the jobs of all plans using a bounded thread pool.
+    Each job records its outcome in its "ok" field, and completed jobs are
+    appended to the journal if one is given.
+
+    Jobs that repeat the text, language and speed of an earlier job (e.g.
+    the same greeting in several categories) are not synthesized again;
+    they get a link to the earlier job's clip once the pool is done.
+
+    With a batch size above 1 and a backend that can pack several texts into
+    one request, cached clips are copied as the jobs are handed out and the
+    remaining jobs are sent in batches. Jobs are fed to the pool lazily,
+    with a few requests per worker in flight.
+    """
+    if max_workers is None:
+        max_workers = MAX_WORKERS
+    if batch_size is None:
+        batch_size = SYNTHESIS_BATCH_SIZE
+
+    job_count = sum(len(plan_jobs(plan)) for plan in plans)
+    if not job_count:
+        return
+
+    # Later jobs with the same speech as an earlier one, with that job
+    duplicates = []
+
+    def iter_jobs_of_plans():
+        first_jobs = {}
+        for plan in plans:
+            for job, language in plan_jobs(plan):
+                first_job = first_jobs.setdefault((job["text"], language, job["slow"]), job)
+                if first_job is not job:
+                    duplicates.append((job, language, first_job))
+                    continue
+                yield job, language
+
+    def record(job, language):
+        if not job["ok"]:
+            METRICS.increment("clips_failed")
+            return
+        METRICS.increment("clips_written")
+        METRICS.increment("bytes_written", os.path.getsize(job["path"]))
+        if journal is not None:
+            journal.record(journal_key(job, language), job["path"])
+
+    backend = get_tts_backend()
+    if batch_size > 1 and backend.max_batch_chars > 0:
+        def iter_cache_misses():
+            # Only cache misses need a request
+            for job, language in iter_jobs_of_plans():
+                remove_existing_file(job["path"])
+                if fetch_cached_mp3(job["text"], job["path"], language, job["slow"]):
+                    job["ok"] = True
+                    record(job, language)
+                else:
+                    yield job, language
+
+        work = make_batches(iter_cache_misses(), batch_size, backend.max_batch_chars)
+        print(f"\nSynthesizing {job_count} clips in batches of up to {batch_size} "
+              f"with up to {max_workers} workers...")
+    else:
+        work = ([job_and_language] for job_and_language in iter_jobs_of_plans())
+        print(f"\nSynthesizing {job_count} clips with up to {max_workers} workers...")
+
+    def run_batch(batch):
+        language = batch[0][1]
+        if len(batch) == 1:
+            job = batch[0][0]
+            job["ok"] = create_mp3_from_text(job["text"], job["path"], language, slow=job["slow"])
+            record(job, language)
+            return
+        texts = [job["text"] for job, _ in batch]
+        paths = [job["path"] for job, _ in batch]
+        outcomes = create_mp3s_from_texts(texts, paths, language, slow=batch[0][0]["slow"])
+        for (job, _), ok in zip(batch, outcomes):
+            job["ok"] = ok
+            record(job, language)
+
+    max_workers = max(1, max_workers)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        run_bounded(executor, run_batch, work, max_workers * IN_FLIGHT_PER_WORKER)
+
+    if duplicates:
+        print(f"Linking {len(duplicates)} clips that repeat the speech of other items")
+    for job, language, first_job in duplicates:
+        remove_existing_file(job["path"])
+        if first_job["ok"]:
+            config_builder.link_or_copy(first_job["path"], job["path"])
+            job["ok"] = True
+            METRICS.increment("clips_deduplicated")
+        record(job, language)
+
+
+def postprocess_plans(plans, journal=None):
+    """
+    Trim and normalize the clips synthesized for the given plans.
+    Clips reused from a previous build, or processed before an interrupted
+    run stopped, were already processed and are skipped.
+    """
+    languages = {}
+    for plan in plans:
+        for job, language in iter_jobs(plan):
+            if job["ok"] and not job.get("reused") and job.get("resumed") != "postprocessed":
+                languages[job["path"]] = (job, language)
+
+    stats = audio_postprocess.process_files(list(languages))
+    if journal is not None:
+        for item in stats:
+            job, language = languages[item["path"]]
+            journal.record(journal_key(job, language), job["path"], stage="postprocessed")
+
+
+def finalize_plan(plan):
+    """
+    Assign final sequential numbers to a synthesized plan and build its result dict.
+
+    Numbers only advance when an item's sound was generated, so failed items
+    leave no gaps. Files written under a provisional slot are renamed to their
+    final number; because final numbers never exceed slot numbers and are
+    assigned in increasing order, a rename never overwrites a kept file.
+    """
+    next_number = {"ko": 0, "en": 0}
+    successful = {"ko": [], "en": []}
+    failed = {"ko": [], "en": []}
+
+    for entry in plan["entries"]:
+        if entry["type"] == "error":
+            failed["ko"].append(entry["message"])
+            failed["en"].append(entry["message"])
+            continue
+
+        language = entry["language"]
+        number = next_number[language]
+        clean = entry["clean"]
+
+        name_job = entry["name"]
+        sound_job = entry["sound"]
+
+        if name_job is not None:
+            if name_job["ok"] and sound_job["ok"]:
+                final_path = os.path.join(entry["staged_directory"], f"{number:03d}_{clean}_name.mp3")
+                if final_path != name_job["path"]:
+                    with METRICS.timer("file_rename_seconds"):
+                        os.replace(name_job["path"], final_path)
+                    name_job["path"] = final_path
+                successful[language].append(f"{number:03d}_{clean}_name")
+            elif name_job["ok"]:
+                # A name clip without its sound would be reused by the next item
+                os.remove(name_job["path"])
+            else:
+                failed[language].append(name_job["failure"])
+
+        if sound_job["ok"]:
+            final_path = os.path.join(entry["staged_directory"], f"{number:03d}_{clean}.mp3")
+            if final_path != sound_job["path"]:
+                with METRICS.timer("file_rename_seconds"):
+                    os.replace(sound_job["path"], final_path)
+                sound_job["path"] = final_path
+            successful[language].append(f"{number:03d}_{clean}")
+            next_number[language] += 1
+        else:
+            failed[language].append(sound_job["failure"])
+
+    save_manifest(plan)
+
+    # Return results for this category
+    return {
+        "bin": plan["bin"],
+        "category": plan["category"],
+        "successful_korean": successful["ko"],
+        "successful_english": successful["en"],
+        "failed_korean": failed["ko"],
+        "failed_english": failed["en"],
+    }
+
+
+def process_file(file_path, max_workers=None, incremental=None):
+    """
+    Process a vocabulary file and generate MP3 files for each word in
+    both Korean and English. The category's directories are swapped in
+    once the file is done; configs are not rebuilt.
+    """
+    staging = staged_output.begin(staged_output.new_root(STAGING_DIR))
+    try:
+        plan = plan_file(file_path, incremental)
+        synthesize_plans([plan], max_workers)
+        if POSTPROCESS_AUDIO:
+            postprocess_plans([plan])
+        result = finalize_plan(plan)
+        staging.commit()
+    finally:
+        staged_output.end()
+    return result
+
+
+def find_text_files(bins, categories=None):
+    """
+    List the vocabulary files of the given bins (None for all bins), optionally
+    only those whose category name is in categories.
+    """
+    text_files = []
+
+    if bins is None:
+        # Get all text files in the Categories directory and subdirectories
+        for root, _, files in os.walk(CATEGORIES_DIR):
+            for file in files:
+                if file.endswith(".txt"):
+                    text_files.append(os.path.join(root, file))
+    else:
+        # Get only text files in the specified bin directories
+        for bin_name in bins:
+            bin_dir = os.path.join(CATEGORIES_DIR, bin_name)
+            if os.path.exists(bin_dir):
+                for file in os.listdir(bin_dir):
+                    if file.endswith(".txt"):
+                        text_files.append(os.path.join(bin_dir, file))
+            else:
+                print(f"Warning: The selected bin directory '{bin_dir}' doesn't exist.")
+                print(f"Make sure to create it and add text files before running this script.")
+
+    if categories is not None:
+        text_files = [path for path in text_files
+                      if os.path.splitext(os.path.basename(path))[0] in categories]
+
+    return sorted(text_files)
+
+
+def get_target_bins():
+    """
+    Return the bins selected by TARGET_BIN as a list, or None for all bins.
+    TARGET_BIN is a bin name, "ALL", or a list of bin names.
+    """
+    if TARGET_BIN == "ALL":
+        return None
+    if isinstance(TARGET_BIN, str):
+        return [TARGET_BIN]
+    return list(TARGET_BIN)
+
+
+def get_journal_path(text_files):
+    """
+    Return the journal path of a run over the given files. Each selection
+    of files has its own journal, so runs over different bins can execute
+    side by side and each resumes only its own work.
+    """
+    digest = hashlib.sha1("\n".join(text_files).encode("utf-8")).hexdigest()[:12]
+    return os.path.join(JOURNAL_DIR, f"{digest}.jsonl")
+
+
+def get_staging_root(categories=None):
+    """
+    Return the staging root of a run over the configured bins, optionally
+    limited to the named categories. Every selection stages in a root of
+    its own, so concurrent runs over different bins never touch each
+    other's staged files, and a run repeated after an interruption finds
+    the clips its journals recorded.
+    """
+    bins = get_target_bins()
+    key = "all" if bins is None else "-".join(bins)
+    if categories:
+        key += "-" + hashlib.sha1("\n".join(sorted(categories)).encode("utf-8")).hexdigest()[:8]
+    return os.path.join(STAGING_DIR, key)
+
+
+def remove_finished_journals():
+    """
+    Delete the journals of the file groups whose output was committed.
+    """
+    for path in _finished_journals:
+        if os.path.exists(path):
+            os.remove(path)
+    _finished_journals.clear()
+
+
+def process_all_categories(categories=None):
     """
     Process all text files in the Categories directory, including subdirectories.
-    Based on the TARGET_BIN setting.
+    Based on the TARGET_BIN setting; categories optionally limits the run
+    to the named categories.
     """
     # Ensure Categories directory exists
     if not os.path.exists(CATEGORIES_DIR):
@@ -503,30 +1187,17 @@ def process_all_categories():
         os.makedirs(os.path.join(ENGLISH_DIR, bin_name), exist_ok=True)
 
     # Get text files based on TARGET_BIN setting
-    text_files = []
-
-    if TARGET_BIN == "ALL":
-        # Get all text files in the Categories directory and subdirectories
-        for root, _, files in os.walk(CATEGORIES_DIR):
-            for file in files:
-                if file.endswith(".txt"):
-                    text_files.append(os.path.join(root, file))
-    else:
-        # Get only text files in the specified bin directory
-        bin_dir = os.path.join(CATEGORIES_DIR, TARGET_BIN)
-        if os.path.exists(bin_dir):
-            for file in os.listdir(bin_dir):
-                if file.endswith(".txt"):
-                    text_files.append(os.path.join(bin_dir, file))
-        else:
-            print(f"Warning: The selected bin directory '{bin_dir}' doesn't exist.")
-            print(f"Make sure to create it and add text files before running this script.")
+    bins = get_target_bins()
+    text_files = find_text_files(bins, categories)
 
     if not text_files:
-        if TARGET_BIN == "ALL":
+        if bins is None:
             print(f"No text files found in {CATEGORIES_DIR}/ directory or its subdirectories.")
         else:
-            print(f"No text files found in {os.path.join(CATEGORIES_DIR, TARGET_BIN)}/ directory.")
+            for bin_name in bins:
+                print(f"No text files found in {os.path.join(CATEGORIES_DIR, bin_name)}/ directory.")
+        if categories is not None:
+            print(f"Selected categories: {', '.join(sorted(categories))}")
         print(f"Please add vocabulary files with the format: Korean English")
         return []
 
@@ -534,12 +1205,152 @@ def process_all_categories():
     for file in text_files:
         print(f"  - {file}")
 
-    results = []
+    if PROCESSES > 1 and len(text_files) > 1:
+        return process_files_in_parallel(text_files, PROCESSES)
+    return process_file_group(text_files)
 
-    # Process each text file
-    for file_path in text_files:
-        result = process_file(file_path)
-        results.append(result)
+
+def process_file_group(text_files):
+    """
+    Plan, synthesize and finalize a group of category files in this process.
+    """
+    # Clips completed by an interrupted earlier run are kept
+    journal = None
+    if JOURNAL_DIR:
+        os.makedirs(JOURNAL_DIR, exist_ok=True)
+        journal = JobJournal(get_journal_path(text_files))
+        if journal.entries:
+            print(f"Found journal of an interrupted run with {len(journal.entries)} clips: {journal.path}")
+
+    # Plan every file first so one worker pool can synthesize across categories
+    with timed_stage("parse"):
+        plans = [plan_file(file_path, journal=journal) for file_path in text_files]
+    with timed_stage("synthesis"):
+        synthesize_plans(plans, journal=journal)
+    if POSTPROCESS_AUDIO:
+        with timed_stage("postprocess"):
+            postprocess_plans(plans, journal)
+
+    # Assign final numbers and collect results for each category
+    with timed_stage("filesystem"):
+        results = [finalize_plan(plan) for plan in plans]
+
+    # The journal stays until the staged clips are committed, so a run
+    # killed before then resumes from it
+    if journal is not None:
+        journal.close()
+        _finished_journals.append(journal.path)
+
+    return results
+
+
+# Module settings copied into worker processes, so they also apply where
+# workers are started fresh instead of forked (Windows, macOS)
+WORKER_SETTINGS = [
+    "CATEGORIES_DIR", "KOREAN_DIR", "ENGLISH_DIR", "MAX_WORKERS", "TTS_BACKEND", "CACHE_DIR",
+    "CACHE_MAX_BYTES", "INCREMENTAL", "MANIFEST_DIR", "POSTPROCESS_AUDIO", "SYNTHESIS_BATCH_SIZE",
+    "REQUESTS_PER_SECOND", "REQUEST_BURST", "MAX_ATTEMPTS", "BACKOFF_BASE_SECONDS",
+    "BACKOFF_MAX_SECONDS", "JOURNAL_DIR", "STAGING_DIR",
+]
+
+
+def init_worker_process(settings, log_to_stderr):
+    """
+    Apply the parent's settings in a worker process.
+    """
+    globals().update(settings)
+    if log_to_stderr:
+        sys.stdout = sys.stderr
+
+
+def run_file_group(text_files, staging_root):
+    """
+    Worker process entry point: process a group of files and return the
+    results with this process's cache and request counters, and the paths
+    it staged under the parent's staging root for the parent to commit.
+    """
+    staging = staged_output.begin(staging_root)
+    try:
+        results = process_file_group(text_files)
+    finally:
+        staged_output.end()
+    cache = get_tts_cache()
+    scheduler = get_scheduler()
+    counters = {
+        "cache_hits": cache.hits if cache is not None else 0,
+        "cache_misses": cache.misses if cache is not None else 0,
+        "requests": scheduler.requests,
+        "retries": scheduler.retries,
+        "throttled": scheduler.throttled,
+        "stages": dict(STAGE_TIMES),
+        "metrics": METRICS.snapshot(),
+        "staged": staging.paths,
+        "journals": list(_finished_journals),
+    }
+    # Counters are reported per group, so start from zero for the next one
+    if cache is not None:
+        cache.hits = cache.misses = 0
+    scheduler.requests = scheduler.retries = scheduler.throttled = 0
+    _finished_journals.clear()
+    STAGE_TIMES.clear()
+    METRICS.reset()
+    return results, counters
+
+
+def process_files_in_parallel(text_files, processes):
+    """
+    Spread category files over worker processes and merge their results in
+    file order.
+
+    Files are handed out in small groups, so fast workers pick up more of
+    them. Every category writes only its own output directories, and each
+    group keeps its own resume journal. The stage times of the workers are
+    added up, so they can exceed the wall time.
+    """
+    # Several groups per process balance uneven category sizes
+    group_size = max(1, -(-len(text_files) // (processes * 4)))
+    groups = [text_files[i:i + group_size] for i in range(0, len(text_files), group_size)]
+    processes = min(processes, len(groups))
+
+    settings = {name: globals()[name] for name in WORKER_SETTINGS}
+    # The request rate limit is shared out between the processes
+    rate = REQUESTS_PER_SECOND
+    if rate is None:
+        rate = get_tts_backend().requests_per_second
+    if rate is not None:
+        settings["REQUESTS_PER_SECOND"] = rate / processes
+
+    print(f"\nProcessing {len(text_files)} files in {len(groups)} groups with {processes} processes...")
+
+    # Post-processing pools inside the workers split the CPUs between them
+    audio_postprocess_processes = audio_postprocess.MAX_PROCESSES
+    audio_postprocess.MAX_PROCESSES = max(1, audio_postprocess_processes // processes)
+    try:
+        with ProcessPoolExecutor(max_workers=processes, initializer=init_worker_process,
+                                 initargs=(settings, sys.stdout is sys.stderr)) as executor:
+            staging_root = staged_output.active().root
+            group_outputs = list(executor.map(run_file_group, groups, [staging_root] * len(groups)))
+    finally:
+        audio_postprocess.MAX_PROCESSES = audio_postprocess_processes
+
+    # Fold the workers' counters into this process's, which the summary reports
+    cache = get_tts_cache()
+    scheduler = get_scheduler()
+    results = []
+    for group_results, counters in group_outputs:
+        results.extend(group_results)
+        if cache is not None:
+            cache.hits += counters["cache_hits"]
+            cache.misses += counters["cache_misses"]
+        scheduler.requests += counters["requests"]
+        scheduler.retries += counters["retries"]
+        scheduler.throttled += counters["throttled"]
+        for name, seconds in counters["stages"].items():
+            STAGE_TIMES[name] = STAGE_TIMES.get(name, 0.0) + seconds
+        METRICS.merge(counters["metrics"])
+        # The workers' staged paths are committed with the rest of this run
+        staged_output.active().merge(counters["staged"])
+        _finished_journals.extend(counters["journals"])
 
     return results
 
@@ -550,11 +1361,13 @@ def display_welcome():
     print("Korean & English Text-to-Speech MP3 Generator".center(70))
     print("=" * 70)
 
-    # Display the current target bin
-    if TARGET_BIN == "ALL":
+    # Display the current target bins
+    bins = get_target_bins()
+    if bins is None:
         print("Target: Processing ALL bins")
     else:
-        print(f"Target: Processing only '{TARGET_BIN}' bin")
+        print(f"Target: Processing only {', '.join(repr(bin_name) for bin_name in bins)}")
+    print(f"TTS backend: {TTS_BACKEND}")
     print("-" * 70)
 
     print(f"Input directory structure:")
@@ -570,76 +1383,374 @@ def display_welcome():
     print("  3. 안녕하세요, Hello")
     print("  4. 안녕하세요,Hello")
     print("-" * 70)
-    print("To change which bin is processed, modify the TARGET_BIN variable")
-    print("at the top of this script to 'Alphabet', 'Words', 'Phrases', or 'ALL'")
+    print("To change which bins are processed, pass --bin 'Alphabet', 'Words',")
+    print("'Phrases' or 'ALL' (see --help for all options)")
     print("-" * 70)
 
 
-def main():
-    display_welcome()
+def parse_arguments(argv=None):
+    """
+    Parse command-line options. Defaults come from the configuration constants
+    at the top of this script.
+    """
+    parser = argparse.ArgumentParser(description="Generate Korean and English MP3 files from category files.")
+    parser.add_argument("--bin", dest="bins", action="append", choices=["Alphabet", "Words", "Phrases", "ALL"],
+                        help=f"bin to process, can be repeated (default: {TARGET_BIN})")
+    parser.add_argument("--category", dest="categories", action="append", metavar="NAME",
+                        help="only process this category (file name without .txt), can be repeated")
+    parser.add_argument("--backend", choices=sorted(tts_backends.BACKENDS), default=TTS_BACKEND,
+                        help=f"TTS backend to use (default: {TTS_BACKEND})")
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS, metavar="N",
+                        help=f"maximum concurrent synthesis requests (default: {MAX_WORKERS})")
+    parser.add_argument("--processes", type=int, default=PROCESSES, metavar="N",
+                        help=f"worker processes to spread categories over (default: {PROCESSES})")
+    parser.add_argument("--rate", type=float, default=REQUESTS_PER_SECOND, metavar="N",
+                        help="maximum synthesis requests per second (default: the backend's limit)")
+    parser.add_argument("--batch-size", type=int, default=SYNTHESIS_BATCH_SIZE, metavar="N",
+                        help=f"items packed into one synthesis request (default: {SYNTHESIS_BATCH_SIZE})")
+    parser.add_argument("--cache-dir", default=CACHE_DIR, metavar="DIR",
+                        help=f"synthesis cache directory (default: {CACHE_DIR})")
+    parser.add_argument("--no-cache", action="store_true", help="always synthesize, ignoring the cache")
+    parser.add_argument("--categories-dir", default=CATEGORIES_DIR, metavar="DIR",
+                        help=f"directory with the vocabulary files (default: {CATEGORIES_DIR})")
+    parser.add_argument("--output-root", default=".", metavar="DIR",
+                        help="directory the audio, config files, sprites and build state are "
+                             "written to (default: current directory)")
+    parser.add_argument("--incremental", action="store_true", default=INCREMENTAL,
+                        help="only synthesize lines that changed since the last build")
+    parser.add_argument("--pack-sprites", action="store_true", default=PACK_SPRITES,
+                        help="pack each category into audio sprites")
+    parser.add_argument("--postprocess", action="store_true", default=POSTPROCESS_AUDIO,
+                        help="trim silence and normalize loudness of new clips")
+    parser.add_argument("--assets", action=argparse.BooleanOptionalAction, default=BUILD_ASSETS,
+                        help="write fingerprinted, precompressed static assets and index.build.html "
+                             "after the configs (default: on)")
+    parser.add_argument("--renditions", action="store_true", default=TRANSCODE_RENDITIONS,
+                        help="encode Opus and AAC renditions of the clips and list them in the configs")
+    parser.add_argument("--summary", metavar="FILE",
+                        help="write a JSON summary to FILE instead of printing the report; "
+                             "with '-' it goes to stdout and progress output to stderr")
+    parser.add_argument("--metrics", metavar="FILE",
+                        help="write per-stage times, counters and latency histograms as JSON to FILE")
+    parser.add_argument("--prometheus", metavar="FILE",
+                        help="write the same metrics in the Prometheus text format to FILE")
+    parser.add_argument("--pause", action="store_true",
+                        help="wait for Enter before exiting (for double-click launches)")
+    args = parser.parse_args(argv)
+
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.processes < 1:
+        parser.error("--processes must be at least 1")
+    if args.rate is not None and args.rate <= 0:
+        parser.error("--rate must be positive")
+    if args.batch_size < 1:
+        parser.error("--batch-size must be at least 1")
+    if args.bins and "ALL" in args.bins and len(args.bins) > 1:
+        parser.error("--bin ALL cannot be combined with other bins")
+    return args
+
+
+def apply_arguments(args):
+    """
+    Apply parsed command-line options to the module configuration.
 
-    start_time = time.time()
+    Input paths and the paths of the summary and metrics files are made
+    absolute before changing into the output root, so they are resolved
+    from the directory the command was run in.
+    """
+    global TARGET_BIN, TTS_BACKEND, MAX_WORKERS, PROCESSES, REQUESTS_PER_SECOND, SYNTHESIS_BATCH_SIZE
+    global CACHE_DIR, CATEGORIES_DIR
+    global INCREMENTAL, PACK_SPRITES, POSTPROCESS_AUDIO, TRANSCODE_RENDITIONS, BUILD_ASSETS
+
+    if args.bins:
+        TARGET_BIN = "ALL" if args.bins == ["ALL"] else list(dict.fromkeys(args.bins))
+    TTS_BACKEND = args.backend
+    MAX_WORKERS = args.workers
+    PROCESSES = args.processes
+    REQUESTS_PER_SECOND = args.rate
+    SYNTHESIS_BATCH_SIZE = args.batch_size
+    CACHE_DIR = None if args.no_cache else os.path.abspath(args.cache_dir)
+    CATEGORIES_DIR = os.path.abspath(args.categories_dir)
+    config_builder.CATEGORIES_DIR = CATEGORIES_DIR
+    INCREMENTAL = args.incremental
+    PACK_SPRITES = args.pack_sprites
+    POSTPROCESS_AUDIO = args.postprocess
+    TRANSCODE_RENDITIONS = args.renditions
+    BUILD_ASSETS = args.assets
+
+    # Output files named on the command line are relative to the caller's directory
+    for name in ("summary", "metrics", "prometheus"):
+        path = getattr(args, name)
+        if path and path != "-":
+            setattr(args, name, os.path.abspath(path))
+
+    os.makedirs(args.output_root, exist_ok=True)
+    os.chdir(args.output_root)
+
+
+def build_summary(results, elapsed_time):
+    """
+    Build the machine-readable summary of a run.
+    """
+    cache = get_tts_cache()
+    scheduler = get_scheduler()
+    bins = get_target_bins()
+    return {
+        "bins": bins if bins is not None else "ALL",
+        "backend": TTS_BACKEND,
+        "elapsed_seconds": round(elapsed_time, 3),
+        "totals": {
+            "successful_korean": sum(len(r["successful_korean"]) for r in results),
+            "successful_english": sum(len(r["successful_english"]) for r in results),
+            "failed_korean": sum(len(r["failed_korean"]) for r in results),
+            "failed_english": sum(len(r["failed_english"]) for r in results),
+        },
+        "cache": {"hits": cache.hits, "misses": cache.misses} if cache is not None else None,
+        "requests": {
+            "total": scheduler.requests,
+            "retries": scheduler.retries,
+            "rate_limited": scheduler.throttled,
+        },
+        "stages": {name: round(seconds, 3) for name, seconds in STAGE_TIMES.items()},
+        "categories": [
+            {
+                "bin": r["bin"],
+                "category": r["category"],
+                "successful_korean": len(r["successful_korean"]),
+                "successful_english": len(r["successful_english"]),
+                "failed_korean": r["failed_korean"],
+                "failed_english": r["failed_english"],
+            }
+            for r in results
+        ],
+    }
+
+
+def print_report(summary):
+    """
+    Print the human-readable summary of a run.
+    """
+    totals = summary["totals"]
+    print("\n" + "=" * 70)
+    print("Summary".center(70))
+    print("=" * 70)
 
-    # Process all category files
-    results = process_all_categories()
-
-    end_time = time.time()
-    elapsed_time = end_time - start_time
-
-    # Print summary for all categories
-    if results:
-        print("\n" + "=" * 70)
-        print("Summary".center(70))
-        print("=" * 70)
-
-        total_korean_success = sum(len(r["successful_korean"]) for r in results)
-        total_english_success = sum(len(r["successful_english"]) for r in results)
-        total_korean_failed = sum(len(r["failed_korean"]) for r in results)
-        total_english_failed = sum(len(r["failed_english"]) for r in results)
-
-        print(f"Total Korean files generated: {total_korean_success}")
-        print(f"Total English files generated: {total_english_success}")
-        print(f"Total Korean files failed: {total_korean_failed}")
-        print(f"Total English files failed: {total_english_failed}")
-        print(f"Total processing time: {elapsed_time:.1f} seconds")
-
-        # Detailed summary per category
-        for result in results:
-            bin_name = result["bin"] if result["bin"] else "Default"
-            category = result["category"]
-            print(f"\nBin: {bin_name}, Category: {category}")
-            print(f"  Korean success: {len(result['successful_korean'])}")
-            print(f"  English success: {len(result['successful_english'])}")
-
-            if result["failed_korean"] or result["failed_english"]:
-                print("  Failed items:")
-                if result["failed_korean"]:
-                    print("    Korean:")
-                    for item in result["failed_korean"]:
-                        print(f"    - {item}")
-                if result["failed_english"]:
-                    print("    English:")
-                    for item in result["failed_english"]:
-                        print(f"    - {item}")
+    print(f"Total Korean files generated: {totals['successful_korean']}")
+    print(f"Total English files generated: {totals['successful_english']}")
+    print(f"Total Korean files failed: {totals['failed_korean']}")
+    print(f"Total English files failed: {totals['failed_english']}")
+    print(f"Total processing time: {summary['elapsed_seconds']:.1f} seconds")
+
+    if summary["cache"] is not None:
+        print(f"Synthesis cache hits: {summary['cache']['hits']}, misses: {summary['cache']['misses']}")
+    requests = summary["requests"]
+    print(f"Synthesis requests: {requests['total']} "
+          f"(retries: {requests['retries']}, rate limited: {requests['rate_limited']})")
+    if summary["stages"]:
+        print("Stage times: " + ", ".join(f"{name} {seconds:.1f} s" for name, seconds in summary["stages"].items()))
+
+    # Detailed summary per category
+    for result in summary["categories"]:
+        bin_name = result["bin"] if result["bin"] else "Default"
+        category = result["category"]
+        print(f"\nBin: {bin_name}, Category: {category}")
+        print(f"  Korean success: {result['successful_korean']}")
+        print(f"  English success: {result['successful_english']}")
+
+        if result["failed_korean"] or result["failed_english"]:
+            print("  Failed items:")
+            if result["failed_korean"]:
+                print("    Korean:")
+                for item in result["failed_korean"]:
+                    print(f"    - {item}")
+            if result["failed_english"]:
+                print("    English:")
+                for item in result["failed_english"]:
+                    print(f"    - {item}")
 
     print("\nOutput locations:")
     print(f"- {KOREAN_DIR}/[BIN_NAME]/[CATEGORY_NAME]/")
     print(f"- {ENGLISH_DIR}/[BIN_NAME]/[CATEGORY_NAME]/")
     print("\nNext steps:")
     print("1. Check the output directories to make sure the files were generated correctly.")
+    print("2. The config files of the processed bins were regenerated automatically.")
+    print("   To rebuild them from the output directories alone, run config_builder.py")
+
+
+def collect_metrics(summary):
+    """
+    Build the metrics of a run: stage times, request and cache counters,
+    bytes written and latency histograms with estimated quantiles.
+    """
+    counters = {
+        "requests": summary["requests"]["total"],
+        "retries": summary["requests"]["retries"],
+        "rate_limited": summary["requests"]["rate_limited"],
+    }
+    cache_hit_rate = None
+    if summary["cache"] is not None:
+        counters["cache_hits"] = summary["cache"]["hits"]
+        counters["cache_misses"] = summary["cache"]["misses"]
+        lookups = counters["cache_hits"] + counters["cache_misses"]
+        cache_hit_rate = round(counters["cache_hits"] / lookups, 4) if lookups else None
+    counters.update(METRICS.counters)
+
+    return {
+        "backend": summary["backend"],
+        "elapsed_seconds": summary["elapsed_seconds"],
+        "stages": summary["stages"],
+        "counters": counters,
+        "cache_hit_rate": cache_hit_rate,
+        "histograms": {name: build_metrics.summarize_histogram(histogram)
+                       for name, histogram in METRICS.histograms.items()},
+    }
 
-    if TARGET_BIN == "ALL":
-        print("2. Run the appropriate config generator script for each bin:")
-        print("   - config_alphabet_generator.py")
-        print("   - config_words_generator.py")
-        print("   - config_phrases_generator.py")
-    else:
-        print(f"2. Run the config generator script for the {TARGET_BIN} bin:")
-        print(f"   - config_{TARGET_BIN.lower()}_generator.py")
 
-    print("\nDone! Press any key to exit...")
-    input()
+def write_metrics(metrics, path):
+    """
+    Write the metrics of a run as JSON.
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(metrics, f, ensure_ascii=False, indent=2)
+    print(f"Metrics written to {path}")
+
+
+def write_prometheus_metrics(metrics, path):
+    """
+    Write the metrics of a run in the Prometheus text format. The file is
+    replaced atomically, so a collector never reads half of it.
+    """
+    gauges = {
+        "elapsed_seconds": metrics["elapsed_seconds"],
+        "cache_hit_rate": metrics["cache_hit_rate"],
+    }
+    text = build_metrics.to_prometheus(metrics["counters"], gauges, METRICS.histograms, metrics["stages"])
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(temp_path, path)
+    print(f"Prometheus metrics written to {path}")
+
+
+def run(categories=None):
+    """
+    Generate the audio of the configured bins, pack or drop sprites and
+    rebuild the configs. Everything is staged and swapped into the live tree
+    at the end, so an interrupted run leaves the previous build in place.
+    Returns the run summary.
+    """
+    display_welcome()
+
+    start_time = time.time()
+
+    staging = staged_output.begin(get_staging_root(categories))
+    try:
+        if not staging.claim():
+            raise RuntimeError(f"another run over the same bins is staging in {staging.root}")
+        staging.recover()
+
+        # Process all category files
+        results = process_all_categories(categories)
+
+        if results:
+            with timed_stage("sprites"):
+                if PACK_SPRITES:
+                    print("\nPacking audio sprites...")
+                    sprite_packer.pack_results(results)
+                else:
+                    # Sprites of regenerated categories no longer match their clips
+                    for result in results:
+                        for language in sprite_packer.category_languages(result["category"]):
+                            sprite_packer.remove_sprite(result["bin"], result["category"], language)
+
+            if TRANSCODE_RENDITIONS:
+                with timed_stage("renditions"):
+                    audio_renditions.transcode_files(audio_renditions.result_audio_paths(results))
+
+        # The configs are built, committed and the audio store cleaned up
+        # under the commit lock, so no other run commits or cleans up
+        # between this run choosing stored clips and its configs going live
+        with staging.lock():
+            if results:
+                # Rebuild the config files of the processed bins from the in-memory results
+                print("\nBuilding configuration files...")
+                with timed_stage("configs"):
+                    config_builder.build_configs(results)
+
+                if BUILD_ASSETS:
+                    print("\nBuilding static assets...")
+                    with timed_stage("assets"):
+                        asset_builder.build_assets()
+
+            # Swap the new audio, sprites, manifests and configs into place
+            with timed_stage("commit"):
+                if results:
+                    swapped = config_builder.commit_build(staging)
+                else:
+                    swapped = staging.commit()
+        if swapped:
+            print(f"\nSwapped {swapped} staged directories and files into place")
+        remove_finished_journals()
+    finally:
+        staged_output.end()
+
+    return build_summary(results, time.time() - start_time)
+
+
+def main(argv=None):
+    """
+    Command-line entry point. Returns the exit status: 0 if every item was
+    generated, 1 if some failed, 2 if the run could not start or found no
+    category files.
+    """
+    args = parse_arguments(argv)
+    apply_arguments(args)
+
+    # With the summary on stdout, keep it clean of progress output
+    log = sys.stderr if args.summary == "-" else sys.stdout
+    with contextlib.redirect_stdout(log):
+        # Fail early if the selected engine is not installed
+        try:
+            get_tts_backend()
+        except ValueError as e:
+            print(f"Error: {e}")
+            return 2
+
+        try:
+            summary = run(set(args.categories) if args.categories else None)
+        except RuntimeError as e:
+            print(f"Error: {e}")
+            return 2
+
+        if args.summary is None:
+            if summary["categories"]:
+                print_report(summary)
+        elif args.summary != "-":
+            with open(args.summary, "w", encoding="utf-8") as f:
+                json.dump(summary, f, ensure_ascii=False, indent=2)
+            print(f"\nSummary written to {args.summary}")
+
+        if args.metrics or args.prometheus:
+            metrics = collect_metrics(summary)
+            if args.metrics:
+                write_metrics(metrics, args.metrics)
+            if args.prometheus:
+                write_prometheus_metrics(metrics, args.prometheus)
+
+    if args.summary == "-":
+        json.dump(summary, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+
+    if args.pause:
+        print("\nDone! Press Enter to exit...")
+        input()
+
+    if not summary["categories"]:
+        return 2
+    totals = summary["totals"]
+    return 1 if totals["failed_korean"] or totals["failed_english"] else 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from pydub import AudioSegment
+
+# Configuration
+ENGLISH_DIR = "English"
+KOREAN_DIR = "Korean"
+
+# Loudness every clip is normalized to (RMS of its non-silent parts, in dBFS)
+TARGET_DBFS = -18.0
+
+# Gain is limited so that peaks stay below this level
+PEAK_CEILING_DBFS = -1.0
+
+# Windows quieter than this are silence
+SILENCE_THRESHOLD_DBFS = -45.0
+
+# Analysis window length, and silence kept before and after the speech
+WINDOW_MS = 10
+KEEP_PADDING_MS = 40
+
+# Clips analyzed together in one NumPy batch, and worker processes
+BATCH_SIZE = 32
+MAX_PROCESSES = os.cpu_count() or 1
+
+# Bitrate of the re-encoded clips (gTTS output is 32 kbps mono)
+EXPORT_BITRATE = "32k"
+
+
+def analyze_batch(sample_arrays, frame_rate, sample_width):
+    """
+    Find the speech boundaries and normalization gain of a batch of mono clips.
+
+    All clips are zero-padded into one (clips x windows x samples) array, so
+    window RMS, silence detection and loudness are computed for the whole
+    batch at once. Returns (start, end, gain_db) arrays, with start and end
+    as sample indexes of the part to keep.
+    """
+    full_scale = float(1 << (8 * sample_width - 1))
+    window = max(1, frame_rate * WINDOW_MS // 1000)
+    padding_windows = KEEP_PADDING_MS // WINDOW_MS
+
+    lengths = np.array([len(samples) for samples in sample_arrays])
+    window_counts = (lengths + window - 1) // window
+    max_windows = max(int(window_counts.max()), 1)
+
+    batch = np.zeros((len(sample_arrays), max_windows * window), dtype=np.float32)
+    for i, samples in enumerate(sample_arrays):
+        batch[i, :len(samples)] = samples
+    batch /= full_scale
+
+    windows = batch.reshape(len(sample_arrays), max_windows, window)
+    power = np.mean(windows * windows, axis=2)
+    power_db = 10 * np.log10(np.maximum(power, 1e-12))
+
+    valid = np.arange(max_windows)[None, :] < window_counts[:, None]
+    loud = (power_db > SILENCE_THRESHOLD_DBFS) & valid
+    has_sound = loud.any(axis=1)
+
+    # First and last loud window of every clip, widened by the padding
+    first = np.argmax(loud, axis=1)
+    last = max_windows - 1 - np.argmax(loud[:, ::-1], axis=1)
+    start = np.maximum(first - padding_windows, 0) * window
+    end = np.minimum((last + 1 + padding_windows) * window, lengths)
+    start = np.where(has_sound, start, 0)
+    end = np.where(has_sound, end, lengths)
+
+    # Loudness is the mean power of the loud windows only
+    loud_power = np.where(loud, power, 0).sum(axis=1) / np.maximum(loud.sum(axis=1), 1)
+    loudness_db = 10 * np.log10(np.maximum(loud_power, 1e-12))
+    peak_db = 20 * np.log10(np.maximum(np.abs(batch).max(axis=1), 1e-6))
+    gain_db = np.minimum(TARGET_DBFS - loudness_db, PEAK_CEILING_DBFS - peak_db)
+    gain_db = np.where(has_sound, gain_db, 0.0)
+
+    return start, end, gain_db
+
+
+def apply_trim_and_gain(samples, start, end, gain_db, sample_width, channels):
+    """
+    Cut interleaved samples to [start, end) frames and apply the gain.
+    """
+    full_scale = float(1 << (8 * sample_width - 1))
+    trimmed = samples[start * channels:end * channels].astype(np.float32)
+    trimmed *= 10 ** (gain_db / 20)
+    np.clip(trimmed, -full_scale, full_scale - 1, out=trimmed)
+    return trimmed.astype(samples.dtype)
+
+
+def to_mono(samples, channels):
+    """
+    Mix interleaved samples down to one channel for analysis.
+    """
+    if channels == 1:
+        return samples
+    return samples.reshape(-1, channels).mean(axis=1)
+
+
+def process_batch(paths):
+    """
+    Trim and normalize a batch of MP3 files in place. Returns one stats dict per file.
+    """
+    clips = []
+    for path in paths:
+        try:
+            segment = AudioSegment.from_mp3(path)
+        except Exception as e:
+            print(f"  - Error reading {path}: {e}")
+            continue
+        samples = np.array(segment.get_array_of_samples())
+        clips.append((path, segment, samples))
+
+    # Clips can only share a batch if their sample format matches
+    groups = {}
+    for clip in clips:
+        segment = clip[1]
+        groups.setdefault((segment.frame_rate, segment.sample_width, segment.channels), []).append(clip)
+
+    stats = []
+    for (frame_rate, sample_width, channels), group in groups.items():
+        mono_arrays = [to_mono(samples, channels) for _, _, samples in group]
+        starts, ends, gains = analyze_batch(mono_arrays, frame_rate, sample_width)
+
+        for (path, segment, samples), start, end, gain_db in zip(group, starts, ends, gains):
+            processed = apply_trim_and_gain(samples, int(start), int(end), float(gain_db),
+                                            sample_width, channels)
+            bytes_before = os.path.getsize(path)
+
+            # Write next to the original and swap it in, so a crash never leaves a broken clip
+            temp_path = f"{path}.tmp"
+            segment._spawn(processed.tobytes()).export(temp_path, format="mp3", bitrate=EXPORT_BITRATE)
+            os.replace(temp_path, path)
+
+            frame_count = len(samples) // channels
+            stats.append({
+                "path": path,
+                "bytes_before": bytes_before,
+                "bytes_after": os.path.getsize(path),
+                "leading_ms": 1000.0 * int(start) / frame_rate,
+                "trailing_ms": 1000.0 * (frame_count - int(end)) / frame_rate,
+                "gain_db": float(gain_db),
+            })
+
+    return stats
+
+
+def process_files(paths, max_processes=None):
+    """
+    Trim and normalize MP3 files across a process pool and print a report.
+    Every run re-encodes the files, so only pass freshly synthesized clips.
+    """
+    if max_processes is None:
+        max_processes = MAX_PROCESSES
+
+    paths = list(paths)
+    if not paths:
+        return []
+
+    batches = [paths[i:i + BATCH_SIZE] for i in range(0, len(paths), BATCH_SIZE)]
+    print(f"\nPost-processing {len(paths)} clips in {len(batches)} batches "
+          f"with up to {max_processes} processes...")
+
+    stats = []
+    with ProcessPoolExecutor(max_workers=max(1, max_processes)) as executor:
+        for batch_stats in executor.map(process_batch, batches):
+            stats.extend(batch_stats)
+
+    print_report(stats)
+    return stats
+
+
+def print_report(stats):
+    """
+    Print bytes saved and average silence removed per bin.
+    """
+    per_bin = {}
+    for item in stats:
+        # Paths look like <language root>/<bin>/<category>/<file>
+        parts = os.path.normpath(item["path"]).split(os.sep)
+        bin_name = parts[-3] if len(parts) >= 3 else ""
+        per_bin.setdefault(bin_name, []).append(item)
+
+    for bin_name, items in sorted(per_bin.items()):
+        bytes_before = sum(item["bytes_before"] for item in items)
+        bytes_after = sum(item["bytes_after"] for item in items)
+        leading = sum(item["leading_ms"] for item in items) / len(items)
+        trailing = sum(item["trailing_ms"] for item in items) / len(items)
+        print(f"Bin: {bin_name or 'Default'} ({len(items)} clips)")
+        print(f"  Bytes: {bytes_before} -> {bytes_after} (saved {bytes_before - bytes_after})")
+        print(f"  Average silence removed: {leading:.0f} ms leading, {trailing:.0f} ms trailing")
+
+
+def find_mp3_files(bins=None):
+    """
+    List every MP3 under the English and Korean output trees.
+    """
+    paths = []
+    for root_dir in (ENGLISH_DIR, KOREAN_DIR):
+        for dirpath, _, filenames in os.walk(root_dir):
+            rel_parts = os.path.relpath(dirpath, root_dir).split(os.sep)
+            if bins is not None and rel_parts[0] not in bins:
+                continue
+            paths.extend(os.path.join(dirpath, name) for name in filenames if name.lower().endswith(".mp3"))
+    return sorted(paths)
+
+
+def main():
+    """
+    Trim and normalize every clip in the output trees.
+    """
+    start_time = time.time()
+    process_files(find_mp3_files())
+    print(f"Done in {time.time() - start_time:.1f} seconds")
+    print("If sprites are used, run sprite_packer.py again to repack them.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+
+import os
+import time
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+import mp3_metadata
+import staged_output
+import config_builder
+
+# Configuration
+ENGLISH_DIR = config_builder.ENGLISH_DIR
+KOREAN_DIR = config_builder.KOREAN_DIR
+
+# Encoder settings of every rendition in config_builder.RENDITION_EXTENSIONS.
+# Speech stays intelligible far below the MP3 bitrate: Opus at 16 kbps for
+# browsers that play it, AAC-LC in MP4 at 24 kbps for Safari on older iOS.
+RENDITION_SETTINGS = {
+    "opus": {"format": "ogg", "codec": "libopus", "bitrate": "16k"},
+    "aac": {"format": "ipod", "codec": "aac", "bitrate": "24k"},
+}
+
+# Clips transcoded per task, and worker processes
+BATCH_SIZE = 16
+MAX_PROCESSES = os.cpu_count() or 1
+
+# Renditions are made from the clips in the content-addressed audio store
+# (see config_builder.USE_AUDIO_STORE), so every distinct clip is transcoded
+# once, and never again in later runs: a stored clip never changes.
+
+
+def ffmpeg_available():
+    """
+    Return True if pydub can find an encoder binary.
+    """
+    return bool(shutil.which("ffmpeg") or shutil.which("avconv"))
+
+
+def plan_renditions(audio_paths):
+    """
+    Find the renditions missing for the given clips (live paths, as used in
+    the configs). Returns a list of (source path, {rendition: target path})
+    with one job per distinct clip.
+    """
+    jobs = []
+    seen = set()
+    for audio_path in audio_paths:
+        source_path = staged_output.input_path(audio_path)
+        try:
+            content_hash = mp3_metadata.file_hash(source_path)
+        except (FileNotFoundError, TypeError):
+            continue
+        if content_hash in seen:
+            continue
+        seen.add(content_hash)
+
+        store_path = config_builder.get_store_path(content_hash)
+        existing = config_builder.find_renditions(store_path)
+        targets = {
+            name: staged_output.output_path(path)
+            for name, path in config_builder.get_rendition_paths(store_path).items()
+            if name not in existing and name in RENDITION_SETTINGS
+        }
+        if targets:
+            jobs.append((source_path, targets))
+    return jobs
+
+
+def transcode_batch(jobs):
+    """
+    Encode the renditions of a batch of clips. Returns one stats dict per clip.
+    """
+    from pydub import AudioSegment
+
+    stats = []
+    for source_path, targets in jobs:
+        try:
+            segment = AudioSegment.from_mp3(source_path)
+        except Exception as e:
+            print(f"  - Error reading {source_path}: {e}")
+            continue
+
+        sizes = {}
+        for name, target_path in targets.items():
+            settings = RENDITION_SETTINGS[name]
+            # Write next to the target and swap it in, so a crash never leaves a broken file
+            temp_path = f"{target_path}.tmp"
+            try:
+                segment.export(temp_path, format=settings["format"], codec=settings["codec"],
+                               bitrate=settings["bitrate"])
+            except Exception as e:
+                print(f"  - Error encoding {name} rendition of {source_path}: {e}")
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                continue
+            os.replace(temp_path, target_path)
+            sizes[name] = os.path.getsize(target_path)
+
+        stats.append({"source": source_path, "bytes": os.path.getsize(source_path), "renditions": sizes})
+    return stats
+
+
+def transcode_files(audio_paths, max_processes=None):
+    """
+    Encode the missing renditions of the given clips across a process pool
+    and print a report. Returns the stats of the transcoded clips.
+    """
+    if max_processes is None:
+        max_processes = MAX_PROCESSES
+
+    if not config_builder.USE_AUDIO_STORE:
+        print("Renditions are made from the audio store, which is disabled; skipping")
+        return []
+    if not ffmpeg_available():
+        print("Warning: ffmpeg was not found, no audio renditions were made")
+        return []
+
+    jobs = plan_renditions(audio_paths)
+    if not jobs:
+        print("All audio renditions are up to date")
+        return []
+
+    batches = [jobs[i:i + BATCH_SIZE] for i in range(0, len(jobs), BATCH_SIZE)]
+    print(f"\nTranscoding {len(jobs)} clips into {', '.join(RENDITION_SETTINGS)} renditions "
+          f"in {len(batches)} batches with up to {max_processes} processes...")
+
+    stats = []
+    with ProcessPoolExecutor(max_workers=max(1, max_processes)) as executor:
+        for batch_stats in executor.map(transcode_batch, batches):
+            stats.extend(batch_stats)
+
+    print_report(stats)
+    return stats
+
+
+def print_report(stats):
+    """
+    Print the size of every rendition relative to the MP3 clips.
+    """
+    mp3_bytes = sum(item["bytes"] for item in stats)
+    print(f"Transcoded {len(stats)} clips ({mp3_bytes} bytes of MP3)")
+    for name in RENDITION_SETTINGS:
+        items = [item for item in stats if name in item["renditions"]]
+        if not items:
+            continue
+        source_bytes = sum(item["bytes"] for item in items)
+        rendition_bytes = sum(item["renditions"][name] for item in items)
+        share = 100 * rendition_bytes / source_bytes if source_bytes else 0
+        print(f"  {name}: {len(items)} files, {rendition_bytes} bytes ({share:.0f}% of the MP3 size)")
+
+
+def result_audio_paths(results):
+    """
+    List the clip paths of the categories processed by audio_generator.
+    """
+    paths = []
+    for bin_name, bin_listing in config_builder.listings_from_results(results).items():
+        for category, category_listing in bin_listing.items():
+            for language, root_dir in (("en", ENGLISH_DIR), ("ko", KOREAN_DIR)):
+                for filename in category_listing[language] or []:
+                    paths.append(f"{root_dir}/{bin_name}/{category}/{filename}")
+    return paths
+
+
+def find_audio_paths(bins=None):
+    """
+    List every MP3 under the English and Korean output trees.
+    """
+    if bins is None:
+        bins = config_builder.BINS
+
+    paths = []
+    for root_dir in (ENGLISH_DIR, KOREAN_DIR):
+        for bin_name in bins:
+            for dirpath, _, filenames in os.walk(os.path.join(root_dir, bin_name)):
+                paths.extend(os.path.join(dirpath, name) for name in sorted(filenames)
+                             if name.lower().endswith(".mp3"))
+    return paths
+
+
+def main():
+    """
+    Encode the missing renditions of every clip and rebuild the config files,
+    so they list the renditions.
+    """
+    start_time = time.time()
+    staging = staged_output.begin()
+    try:
+        transcode_files(find_audio_paths())
+        with staging.lock():
+            config_builder.build_configs()
+            config_builder.commit_build(staging)
+    finally:
+        staged_output.end()
+    print(f"Done in {time.time() - start_time:.1f} seconds")
+
+
+if __name__ == "__main__":
+    main()
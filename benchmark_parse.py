@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+
+import sys
+import time
+import random
+import audio_generator
+
+# Number of synthetic lines parsed by the benchmark
+LINE_COUNT = 1000000
+
+# Hangul syllables used to build random Korean words
+SYLLABLES = "가나다라마바사아자차카타파하고노도로모보소오조초코토포호기니디리미비시이지치키티피히"
+
+ENGLISH_WORDS = ["apple", "water", "school", "friend", "book", "house", "music", "city",
+                 "good morning", "thank you", "see you later", "how are you?"]
+
+
+def parse_line_reference(line):
+    """
+    The previous parse_line, kept to compare speed and results: tries arrow
+    and comma splits, then walks the line character by character.
+    """
+    line = line.strip()
+    if not line:
+        return None
+
+    if "→" in line:
+        parts = [part.strip() for part in line.split("→")]
+        if len(parts) >= 2:
+            return parts[0], parts[1]
+
+    elif "," in line:
+        parts = [part.strip() for part in line.split(",")]
+        if len(parts) >= 2:
+            return parts[0], parts[1]
+
+    else:
+        korean_chars = []
+        non_korean_start = 0
+
+        for i, char in enumerate(line):
+            if "가" <= char <= "힣" or char.isspace() or char in ".,?!":
+                korean_chars.append(char)
+                non_korean_start = i + 1
+            else:
+                break
+
+        if korean_chars and non_korean_start < len(line):
+            korean_text = "".join(korean_chars).strip()
+            english_text = line[non_korean_start:].strip()
+
+            if korean_text and english_text:
+                return korean_text, english_text
+
+    return None
+
+
+def make_corpus(count, seed=0):
+    """
+    Build count synthetic lines in all supported formats, including Jamo
+    and mixed-script entries.
+    """
+    rng = random.Random(seed)
+    jamo = [chr(code) for code in range(0x3131, 0x3164)]
+    lines = []
+    for _ in range(count):
+        korean = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 6)))
+        if rng.random() < 0.3:
+            korean += " " + "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 4)))
+        english = rng.choice(ENGLISH_WORDS)
+
+        kind = rng.random()
+        if kind < 0.05:
+            korean = rng.choice(jamo)
+        elif kind < 0.10:
+            korean = f"{rng.randint(1, 12)}{korean}"
+
+        fmt = rng.randrange(4)
+        if fmt == 0:
+            lines.append(f"{korean} → {english}\n")
+        elif fmt == 1:
+            lines.append(f"{korean} {english}\n")
+        elif fmt == 2:
+            lines.append(f"{korean}, {english}\n")
+        else:
+            lines.append(f"{korean},{english}\n")
+    return lines
+
+
+def time_parser(parse, lines):
+    """
+    Parse every line. Returns (seconds, number of parsed lines).
+    """
+    start_time = time.perf_counter()
+    parsed = 0
+    for line in lines:
+        if parse(line) is not None:
+            parsed += 1
+    return time.perf_counter() - start_time, parsed
+
+
+def main():
+    """
+    Compare the throughput of the current and the previous parse_line.
+    """
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else LINE_COUNT
+    print(f"Building a synthetic corpus of {count} lines...")
+    lines = make_corpus(count)
+
+    # Lines the previous parser handled must still parse the same way
+    mismatches = sum(1 for line in lines
+                     if parse_line_reference(line) is not None
+                     and parse_line_reference(line) != audio_generator.parse_line(line))
+    print(f"Lines parsed differently from the previous parser: {mismatches}")
+
+    for name, parse in (("previous", parse_line_reference), ("current", audio_generator.parse_line)):
+        seconds, parsed = time_parser(parse, lines)
+        print(f"  {name:>8}: {seconds:.2f} s, {count / seconds / 1000:.0f}k lines/s, "
+              f"{parsed} of {count} lines parsed")
+
+
+if __name__ == "__main__":
+    main()
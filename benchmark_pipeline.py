@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import contextlib
+import subprocess
+import tts_backends
+import audio_generator
+from benchmark_parse import make_corpus
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows; peak memory is then not reported
+    resource = None
+
+# Size of the default synthetic corpus
+CATEGORY_COUNT = 4
+LINES_PER_CATEGORY = 250
+
+# Simulated round-trip time of one synthesis request, in milliseconds
+LATENCY_MS = 20
+
+# Bin the synthetic categories are generated into
+BENCHMARK_BIN = "Words"
+
+
+def parse_arguments(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Run the audio generation pipeline on a synthetic corpus with the stub TTS "
+                    "backend and report throughput, per-stage times and peak memory.")
+    parser.add_argument("--categories", type=int, default=CATEGORY_COUNT,
+                        help=f"number of synthetic category files (default: {CATEGORY_COUNT})")
+    parser.add_argument("--lines", type=int, default=LINES_PER_CATEGORY,
+                        help=f"lines per category file (default: {LINES_PER_CATEGORY})")
+    parser.add_argument("--latency", type=float, default=LATENCY_MS,
+                        help=f"simulated latency of a synthesis request in ms (default: {LATENCY_MS})")
+    parser.add_argument("--workers", type=int, default=audio_generator.MAX_WORKERS,
+                        help=f"synthesis threads (default: {audio_generator.MAX_WORKERS})")
+    parser.add_argument("--processes", type=int, default=1,
+                        help="worker processes (default: 1)")
+    parser.add_argument("--batch-size", type=int, default=1,
+                        help="texts per synthesis request (default: 1)")
+    parser.add_argument("--postprocess", action="store_true",
+                        help="include the audio post-processing stage (needs ffmpeg)")
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="number of runs; the fastest one is reported (default: 1)")
+    parser.add_argument("--output", metavar="FILE",
+                        help="write the results as JSON to FILE")
+    parser.add_argument("--compare", metavar="FILE",
+                        help="compare against the JSON results of an earlier benchmark")
+    parser.add_argument("--keep", action="store_true",
+                        help="keep the generated working directory")
+    return parser.parse_args(argv)
+
+
+def write_corpus(root, categories, lines):
+    """
+    Write the synthetic category files into a fresh working directory.
+    Every category uses different lines, so nothing is deduplicated.
+    """
+    category_dir = os.path.join(root, audio_generator.CATEGORIES_DIR, BENCHMARK_BIN)
+    os.makedirs(category_dir)
+    for index in range(categories):
+        path = os.path.join(category_dir, f"bench_{index + 1:03d}.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.writelines(make_corpus(lines, seed=index))
+
+
+def peak_rss_mb():
+    """
+    Return the peak resident memory of this process and its finished child
+    processes in MB, or None if it cannot be measured here.
+    """
+    if resource is None:
+        return None
+    peak = 0
+    for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN):
+        peak = max(peak, resource.getrusage(who).ru_maxrss)
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(peak / divisor, 1)
+
+
+def get_commit():
+    """
+    Return the short hash of the checked-out commit, or None outside git.
+    """
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)),
+                              timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run_once(args):
+    """
+    Run the pipeline once with fresh backend, scheduler and stage timers.
+    Returns the run summary.
+    """
+    audio_generator._tts_backend = None
+    audio_generator._scheduler = None
+    audio_generator.STAGE_TIMES.clear()
+
+    with open(os.devnull, "w", encoding="utf-8") as devnull, contextlib.redirect_stdout(devnull):
+        return audio_generator.run()
+
+
+def benchmark(args):
+    """
+    Run the benchmark in a temporary directory and return the results.
+    """
+    # Worker processes inherit the latency through fork
+    tts_backends.StubBackend.latency = args.latency / 1000
+    audio_generator.TTS_BACKEND = tts_backends.StubBackend.name
+    audio_generator.TARGET_BIN = BENCHMARK_BIN
+    # Every run synthesizes every item
+    audio_generator.CACHE_DIR = None
+    audio_generator.INCREMENTAL = False
+    audio_generator.PACK_SPRITES = False
+    audio_generator.BUILD_ASSETS = False
+    audio_generator.POSTPROCESS_AUDIO = args.postprocess
+    audio_generator.MAX_WORKERS = args.workers
+    audio_generator.PROCESSES = args.processes
+    audio_generator.SYNTHESIS_BATCH_SIZE = args.batch_size
+
+    previous_directory = os.getcwd()
+    root = tempfile.mkdtemp(prefix="pipeline-benchmark-")
+    try:
+        write_corpus(root, args.categories, args.lines)
+        os.chdir(root)
+
+        best = None
+        for run in range(args.repeat):
+            summary = run_once(args)
+            print(f"  run {run + 1}: {summary['elapsed_seconds']:.2f} s")
+            if best is None or summary["elapsed_seconds"] < best["elapsed_seconds"]:
+                best = summary
+    finally:
+        os.chdir(previous_directory)
+        if args.keep:
+            print(f"Working directory kept in {root}")
+        else:
+            shutil.rmtree(root, ignore_errors=True)
+
+    totals = best["totals"]
+    # Count generated clips; every line yields a Korean and an English one
+    items = totals["successful_korean"] + totals["successful_english"]
+    failed = totals["failed_korean"] + totals["failed_english"]
+    elapsed = best["elapsed_seconds"]
+    return {
+        "commit": get_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": {
+            "categories": args.categories,
+            "lines": args.lines,
+            "latency_ms": args.latency,
+            "workers": args.workers,
+            "processes": args.processes,
+            "batch_size": args.batch_size,
+            "postprocess": args.postprocess,
+            "repeat": args.repeat,
+        },
+        "items": items,
+        "failed": failed,
+        "requests": best["requests"]["total"],
+        "elapsed_seconds": elapsed,
+        "items_per_second": round(items / elapsed, 1) if elapsed else None,
+        "stages": best["stages"],
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def print_results(results):
+    print(f"\nClips: {results['items']} ({results['failed']} failed) "
+          f"from {results['requests']} synthesis requests")
+    print(f"Wall time: {results['elapsed_seconds']:.2f} s, {results['items_per_second']} clips/s")
+    for name, seconds in results["stages"].items():
+        print(f"  {name:>12}: {seconds:.3f} s")
+    if results["peak_rss_mb"] is not None:
+        print(f"Peak memory: {results['peak_rss_mb']} MB")
+
+
+def print_comparison(results, previous):
+    """
+    Print the change of each measurement against an earlier benchmark.
+    """
+    def change(new, old):
+        if not old:
+            return "n/a"
+        return f"{(new - old) / old * 100:+.1f}%"
+
+    print(f"\nCompared with {previous.get('commit') or 'previous run'} ({previous.get('timestamp')}):")
+    if previous.get("parameters") != results["parameters"]:
+        print("  Warning: the benchmark parameters differ")
+    rows = [("wall time", results["elapsed_seconds"], previous.get("elapsed_seconds")),
+            ("clips/s", results["items_per_second"], previous.get("items_per_second")),
+            ("peak memory", results["peak_rss_mb"], previous.get("peak_rss_mb"))]
+    previous_stages = previous.get("stages", {})
+    for name in list(results["stages"]) + [name for name in previous_stages if name not in results["stages"]]:
+        rows.append((name, results["stages"].get(name, 0), previous_stages.get(name, 0)))
+    for name, new, old in rows:
+        if new is None or old is None:
+            continue
+        print(f"  {name:>12}: {old} -> {new} ({change(new, old)})")
+
+
+def main(argv=None):
+    args = parse_arguments(argv)
+    print(f"Benchmarking {args.categories} categories of {args.lines} lines "
+          f"with {args.latency:g} ms simulated latency...")
+    results = benchmark(args)
+    print_results(results)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            print_comparison(results, json.load(f))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    return 1 if results["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
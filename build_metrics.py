@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+
+import time
+import threading
+import contextlib
+
+# Upper bounds in seconds of the latency histogram buckets
+LATENCY_BUCKETS = [0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0]
+
+# Prefix of the metric names in the Prometheus output
+PROMETHEUS_PREFIX = "audio_generator"
+
+# Help text of the metrics, shown in the Prometheus output
+DESCRIPTIONS = {
+    "synthesis_request_seconds": "Duration of one TTS backend request attempt",
+    "cache_fetch_seconds": "Time to copy a clip from the synthesis cache",
+    "cache_store_seconds": "Time to add a synthesized clip to the synthesis cache",
+    "clear_directory_seconds": "Time to clear one output directory",
+    "file_rename_seconds": "Time to move a clip to its final file name",
+    "stage_seconds": "Wall time spent in each pipeline stage",
+    "elapsed_seconds": "Wall time of the whole run",
+    "requests": "TTS backend requests, including retries",
+    "retries": "TTS backend requests that were retried",
+    "rate_limited": "TTS backend requests rejected by rate limiting",
+    "cache_hits": "Clips copied from the synthesis cache",
+    "cache_misses": "Clips not found in the synthesis cache",
+    "cache_hit_rate": "Share of cache lookups that were hits",
+    "clips_written": "Clips written by synthesis or copied from the cache",
+    "clips_failed": "Clips that could not be generated",
+    "clips_deduplicated": "Clips linked to an identical clip instead of synthesized",
+    "bytes_written": "Bytes of audio written to the output directories",
+    "files_removed": "Old clips removed while clearing output directories",
+}
+
+
+class Histogram:
+    """
+    Cumulative latency histogram with fixed bucket bounds, like a Prometheus
+    histogram. Not thread-safe on its own; MetricsRegistry locks around it.
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = list(buckets)
+        # One count per bucket, plus the +Inf bucket
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                break
+        else:
+            index = len(self.buckets)
+        self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+    def to_dict(self):
+        return {"buckets": self.buckets, "counts": self.counts, "sum": self.sum, "count": self.count}
+
+    def merge(self, data):
+        """
+        Add the observations of a histogram exported with to_dict().
+        """
+        for index, count in enumerate(data["counts"]):
+            self.counts[index] += count
+        self.sum += data["sum"]
+        self.count += data["count"]
+
+    def quantile(self, q):
+        """
+        Estimate the q-quantile as the upper bound of the bucket holding it,
+        or None without observations.
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return self.buckets[index] if index < len(self.buckets) else float("inf")
+        return float("inf")
+
+
+class MetricsRegistry:
+    """
+    Thread-safe collection of counters and latency histograms of one
+    process. Worker processes export their registry with snapshot() and the
+    parent process folds it into its own with merge().
+    """
+
+    def __init__(self):
+        self.counters = {}
+        self.histograms = {}
+        self._lock = threading.Lock()
+
+    def increment(self, name, amount=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def observe(self, name, seconds):
+        with self._lock:
+            if name not in self.histograms:
+                self.histograms[name] = Histogram()
+            self.histograms[name].observe(seconds)
+
+    @contextlib.contextmanager
+    def timer(self, name):
+        """
+        Observe the duration of the block in histogram name, also when it raises.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "counters": dict(self.counters),
+                "histograms": {name: histogram.to_dict() for name, histogram in self.histograms.items()},
+            }
+
+    def merge(self, snapshot):
+        with self._lock:
+            for name, amount in snapshot["counters"].items():
+                self.counters[name] = self.counters.get(name, 0) + amount
+            for name, data in snapshot["histograms"].items():
+                if name not in self.histograms:
+                    self.histograms[name] = Histogram(data["buckets"])
+                self.histograms[name].merge(data)
+
+    def reset(self):
+        with self._lock:
+            self.counters = {}
+            self.histograms = {}
+
+
+def summarize_histogram(histogram):
+    """
+    Return the JSON form of a histogram with its mean and estimated quantiles.
+    """
+    data = histogram.to_dict()
+    data["mean"] = histogram.sum / histogram.count if histogram.count else None
+    for label, q in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99)):
+        value = histogram.quantile(q)
+        # JSON has no infinity; quantiles above the largest bucket are reported as "+Inf"
+        data[label] = format_value(value) if value == float("inf") else value
+    return data
+
+
+def format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def to_prometheus(counters, gauges, histograms, stages, prefix=PROMETHEUS_PREFIX):
+    """
+    Render metrics in the Prometheus text exposition format, e.g. for the
+    node_exporter textfile collector.
+    """
+    lines = []
+
+    def header(name, kind, metric=None):
+        metric = metric or f"{prefix}_{name}"
+        lines.append(f"# HELP {metric} {DESCRIPTIONS.get(name, name)}")
+        lines.append(f"# TYPE {metric} {kind}")
+
+    for name, value in counters.items():
+        # Counter samples carry the conventional _total suffix
+        header(name, "counter", f"{prefix}_{name}_total")
+        lines.append(f"{prefix}_{name}_total {format_value(value)}")
+
+    for name, value in gauges.items():
+        if value is None:
+            continue
+        header(name, "gauge")
+        lines.append(f"{prefix}_{name} {format_value(value)}")
+
+    if stages:
+        header("stage_seconds", "gauge")
+        for stage, seconds in stages.items():
+            lines.append(f'{prefix}_stage_seconds{{stage="{stage}"}} {format_value(seconds)}')
+
+    for name, histogram in histograms.items():
+        header(name, "histogram")
+        cumulative = 0
+        for bound, count in zip(histogram.buckets + [float("inf")], histogram.counts):
+            cumulative += count
+            lines.append(f'{prefix}_{name}_bucket{{le="{format_value(float(bound))}"}} {cumulative}')
+        lines.append(f"{prefix}_{name}_sum {format_value(histogram.sum)}")
+        lines.append(f"{prefix}_{name}_count {histogram.count}")
+
+    return "\n".join(lines) + "\n"
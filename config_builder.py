@@ -0,0 +1,1062 @@
+#!/usr/bin/env python3
+
+import os
+import re
+import json
+import time
+import shutil
+import hashlib
+import mp3_metadata
+import staged_output
+
+# Configuration
+ENGLISH_DIR = "English"
+KOREAN_DIR = "Korean"
+CATEGORIES_DIR = "Categories"
+BINS = ["Alphabet", "Words", "Phrases"]
+CONFIG_FILES = {
+    "Alphabet": "alphabet_config.json",
+    "Words": "words_config.json",
+    "Phrases": "phrases_config.json",
+}
+
+# Also write each bin as a small index plus one shard per category, so the
+# web client only downloads the categories that are actually played.
+WRITE_SHARDS = True
+SHARDS_DIR = "config_shards"
+SHARD_INDEX_FILE = "_index.json"
+
+# Write a precache manifest per category for the service worker
+# (service-worker.js): the URL and content hash of every clip and sprite the
+# category plays, so the client can fetch a whole category ahead of play.
+WRITE_PRECACHE_MANIFESTS = True
+PRECACHE_DIR = "precache"
+
+# Audio sprites written by sprite_packer.py. Entries of clips that are part
+# of a sprite get spriteEn/spriteKo (and spriteEnName/spriteKoName for the
+# Alphabet) as [sprite file, start ms, duration ms].
+SPRITES_DIR = "sprites"
+
+# Add metaEn/metaKo (and metaEnName/metaKoName for the Alphabet) to every
+# entry: {"duration": ms, "bytes": n, "bitrate": kbps, "hash": content hash},
+# measured from the MP3 frame headers by mp3_metadata.py
+INCLUDE_AUDIO_METADATA = True
+
+# Point the audio paths of every entry at a content-addressed store,
+# audio/<hh>/<hash>.mp3, that holds one copy of every distinct clip. Clips
+# shared by several categories or bins (greetings, common words) are then
+# downloaded and cached by the client once. The per-category files stay, as
+# hard links to the stored clips, because they name the entries. Stored
+# clips no longer referenced by any config are removed.
+USE_AUDIO_STORE = True
+AUDIO_STORE_DIR = "audio"
+
+# Lower-bitrate encodings of the stored clips written by audio_renditions.py,
+# by name and file extension. They sit next to the clip they encode, e.g.
+# audio/3f/3f322045e0e81388.ogg, and entries list the ones that exist in
+# renditionsEn/renditionsKo (renditionsEnName/renditionsKoName for the
+# Alphabet) as {"opus": path, "aac": path}. script.js picks one the browser
+# can play.
+RENDITION_EXTENSIONS = {"opus": ".ogg", "aac": ".m4a"}
+
+# Write configs and shards in the compact schema (version 2) instead of one
+# JSON object per entry. Audio paths are declared once as templates and every
+# entry becomes an array of field values. script.js decodes both schemas.
+COMPACT_CONFIGS = False
+COMPACT_SCHEMA_VERSION = 2
+
+# Placeholders of the compact path templates: {field}, or {field:.N} for
+# the first N characters of a field
+PATH_PLACEHOLDER_PATTERN = re.compile(r"\{(\w+)(?::\.(\d+))?\}")
+
+# Characters of JSON text collected before they are encoded and written
+WRITE_BLOCK_CHARS = 64 * 1024
+
+# Entry fields stored positionally in the compact schema, per bin
+COMPACT_FIELDS = {
+    "Alphabet": ["index", "english", "english_pronunciation", "korean", "korean_pronunciation"],
+    "Words": ["index", "english", "korean"],
+    "Phrases": ["index", "english", "korean"],
+}
+
+# With the audio store, compact rows also carry the content hash of every
+# stored clip, from which the store path templates rebuild the audio paths
+COMPACT_HASH_FIELDS = {
+    "audioEn": "hashEn",
+    "audioEnName": "hashEnName",
+    "audioKo": "hashKo",
+    "audioKoName": "hashKoName",
+}
+
+# Configs are written with a streaming JSON encoder: the entries of Words and
+# Phrases categories are generated one at a time while the files are written,
+# so even categories with tens of thousands of entries are never held in
+# memory as a whole. The output is byte-identical to json.dumps.
+
+# Listings map bin -> category -> {"en": [mp3 filenames], "ko": [mp3 filenames]},
+# with None for a language whose output directory does not exist. They are
+# built either from the in-memory results of audio_generator or from a single
+# os.scandir pass over the output trees, and every config is built from a
+# listing without touching the output trees again.
+
+
+class StreamedList:
+    """
+    A JSON array whose items are produced on demand by a generator function.
+    Every iteration calls the function again, so the same config can be
+    written to several files.
+    """
+
+    def __init__(self, make_items):
+        self.make_items = make_items
+
+    def __iter__(self):
+        return iter(self.make_items())
+
+
+def iter_json_chunks(value, indent=None, level=0):
+    """
+    Encode value as JSON in chunks, exactly like json.dumps(value,
+    ensure_ascii=False) with the given indent (or with compact separators
+    when indent is None). Dicts and StreamedLists are written piece by
+    piece; every other value, including the items of a StreamedList, is
+    encoded in one json.dumps call.
+    """
+    is_dict = isinstance(value, dict)
+    if not is_dict and not isinstance(value, StreamedList):
+        yield dump_json_value(value, indent, level)
+        return
+
+    open_char, close_char = ("{", "}") if is_dict else ("[", "]")
+    if indent is None:
+        item_separator, inner_prefix, closing_prefix = ",", "", ""
+        key_separator = ":"
+    else:
+        inner_prefix = "\n" + " " * (indent * (level + 1))
+        closing_prefix = "\n" + " " * (indent * level)
+        item_separator = "," + inner_prefix
+        key_separator = ": "
+
+    yield open_char
+    first = True
+    if is_dict:
+        for key, item in value.items():
+            yield inner_prefix if first else item_separator
+            first = False
+            yield json.dumps(key, ensure_ascii=False) + key_separator
+            yield from iter_json_chunks(item, indent, level + 1)
+    else:
+        for item in value:
+            yield (inner_prefix if first else item_separator) + dump_json_value(item, indent, level + 1)
+            first = False
+    yield close_char if first else closing_prefix + close_char
+
+
+def dump_json_value(value, indent, level):
+    """
+    Encode a plain JSON value nested level deep, as json.dumps would inside
+    its parent.
+    """
+    if indent is None:
+        return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+    text = json.dumps(value, ensure_ascii=False, indent=indent)
+    if level:
+        # JSON strings never contain a raw newline, so this only re-indents
+        text = text.replace("\n", "\n" + " " * (indent * level))
+    return text
+
+
+def extract_word(filename):
+    """
+    Extract the word from a filename like "000_Hello.mp3" -> "Hello"
+    """
+    # Remove the file extension
+    name_without_ext = os.path.splitext(filename)[0]
+
+    # Remove the index prefix (e.g., "000_")
+    if len(name_without_ext) > 4 and name_without_ext[3] == "_":
+        word = name_without_ext[4:]
+    else:
+        word = name_without_ext
+
+    # Replace underscores with spaces
+    word = word.replace("_", " ")
+
+    return word
+
+
+def listings_from_results(results):
+    """
+    Build listings from the result dicts returned by audio_generator.process_file.
+    """
+    listings = {}
+    for result in results:
+        category_listing = listings.setdefault(result["bin"], {}).setdefault(
+            result["category"], {"en": None, "ko": None})
+        category = result["category"]
+        # Alphabet categories only have an output directory for their own language
+        if not category.startswith("korean_"):
+            category_listing["en"] = [f"{name}.mp3" for name in result["successful_english"]]
+        if not category.startswith("english_"):
+            category_listing["ko"] = [f"{name}.mp3" for name in result["successful_korean"]]
+    return listings
+
+
+def scan_output_tree(bins, listings=None):
+    """
+    Fill listings with one os.scandir pass over the output trees of the given bins.
+    Categories already present in listings are not scanned again.
+    """
+    if listings is None:
+        listings = {}
+
+    # Categories known before scanning (e.g. from results) are kept as they are
+    known = {(bin_name, category) for bin_name in bins for category in listings.get(bin_name, {})}
+
+    for language, root_dir in (("en", ENGLISH_DIR), ("ko", KOREAN_DIR)):
+        for bin_name in bins:
+            bin_listing = listings.setdefault(bin_name, {})
+            try:
+                category_entries = list(os.scandir(os.path.join(root_dir, bin_name)))
+            except FileNotFoundError:
+                continue
+
+            for category_entry in category_entries:
+                if not category_entry.is_dir() or (bin_name, category_entry.name) in known:
+                    continue
+                category_listing = bin_listing.setdefault(category_entry.name, {"en": None, "ko": None})
+                with os.scandir(category_entry.path) as files:
+                    category_listing[language] = [
+                        f.name for f in files if f.name.lower().endswith(".mp3") and f.is_file()]
+
+    return listings
+
+
+def build_pair_config(bin_name, bin_listing):
+    """
+    Build the config of a Words or Phrases bin, pairing English and Korean
+    clips that share the same index.
+    """
+    config = {"bin": bin_name, "categories": [], "words": {}}
+
+    # Categories are the ones that have an English output directory
+    categories = sorted(category for category, files in bin_listing.items() if files["en"] is not None)
+    config["categories"] = categories
+
+    for category in categories:
+        config["words"][category] = StreamedList(
+            lambda category=category: iter_pair_words(bin_name, category, bin_listing[category]))
+
+    return config
+
+
+def iter_pair_words(bin_name, category, category_listing):
+    """
+    Yield the entries of one Words or Phrases category, one at a time.
+    """
+    english_files = sorted(category_listing["en"])
+    korean_files = sorted(category_listing["ko"] or [])
+
+    # Create a map of Korean files by index
+    korean_file_map = {}
+    for file in korean_files:
+        if len(file) > 3:
+            korean_file_map[file[:3]] = file
+
+    # Process English files and match with Korean
+    for english_file in english_files:
+        if len(english_file) <= 3:
+            continue
+        index = english_file[:3]
+
+        # If we have a matching Korean file
+        if index in korean_file_map:
+            korean_file = korean_file_map[index]
+            yield {
+                "index": index,
+                "english": extract_word(english_file),
+                "korean": extract_word(korean_file),
+                "audioEn": f"{ENGLISH_DIR}/{bin_name}/{category}/{english_file}",
+                "audioKo": f"{KOREAN_DIR}/{bin_name}/{category}/{korean_file}",
+            }
+
+
+def read_alphabet_file(file_path):
+    """
+    Read an alphabet category file as (index, letter, pronunciation) tuples,
+    one line at a time. The index counts every line, matching the numbering
+    of the audio files.
+    """
+    if not os.path.exists(file_path):
+        return
+    with open(file_path, "r", encoding="utf-8") as f:
+        for index, line in enumerate(f):
+            line = line.strip()
+            if not line:
+                continue
+
+            # Format should be "letter, pronunciation"
+            parts = line.split(",", 1)
+            letter = parts[0].strip()
+            # Use the pronunciation if available, otherwise use the letter
+            pronunciation = parts[1].strip() if len(parts) > 1 else letter
+            yield index, letter, pronunciation
+
+
+def build_alphabet_config(bin_listing):
+    """
+    Build the Alphabet config. Categories come from the english_/korean_ output
+    directories; letters and pronunciations are read from the category files.
+    Korean letters are merged into the English entries by position, so the
+    (alphabet-sized) entry lists are built in memory.
+    """
+    bin_name = "Alphabet"
+    config = {"bin": bin_name, "categories": [], "words": {}}
+
+    # Get unique category names (without english_/korean_ prefix)
+    unique_categories = set()
+    for category in bin_listing:
+        if category.startswith("english_"):
+            category = category[len("english_"):]
+        elif category.startswith("korean_"):
+            category = category[len("korean_"):]
+        unique_categories.add(category)
+    config["categories"] = sorted(unique_categories)
+
+    for category in config["categories"]:
+        words = []
+
+        # English alphabet files
+        english_file = os.path.join(CATEGORIES_DIR, bin_name, f"english_{category}.txt")
+        for index, letter, pronunciation in read_alphabet_file(english_file):
+            index_str = f"{index:03d}"
+            words.append({
+                "index": index_str,
+                "english": letter,
+                "english_pronunciation": pronunciation,
+                "korean": "",
+                "korean_pronunciation": "",
+                "audioEn": f"{ENGLISH_DIR}/{bin_name}/english_{category}/{index_str}_{letter}.mp3",
+                "audioEnName": f"{ENGLISH_DIR}/{bin_name}/english_{category}/{index_str}_{letter}_name.mp3",
+                "audioKo": "",
+                "audioKoName": "",
+            })
+
+        # Korean alphabet files
+        korean_file = os.path.join(CATEGORIES_DIR, bin_name, f"korean_{category}.txt")
+        for index, letter, pronunciation in read_alphabet_file(korean_file):
+            index_str = f"{index:03d}"
+            audio_ko = f"{KOREAN_DIR}/{bin_name}/korean_{category}/{index_str}_{letter}.mp3"
+            audio_ko_name = f"{KOREAN_DIR}/{bin_name}/korean_{category}/{index_str}_{letter}_name.mp3"
+
+            # Check if we already have an entry at this index
+            if index < len(words):
+                # Update existing entry with Korean info
+                words[index]["korean"] = letter
+                words[index]["korean_pronunciation"] = pronunciation
+                words[index]["audioKo"] = audio_ko
+                words[index]["audioKoName"] = audio_ko_name
+            else:
+                # Create new entry with just Korean info
+                words.append({
+                    "index": index_str,
+                    "english": "",
+                    "english_pronunciation": "",
+                    "korean": letter,
+                    "korean_pronunciation": pronunciation,
+                    "audioEn": "",
+                    "audioEnName": "",
+                    "audioKo": audio_ko,
+                    "audioKoName": audio_ko_name,
+                })
+
+        config["words"][category] = words
+
+    return config
+
+
+def load_sprite_positions(bin_name):
+    """
+    Read the sprite tables of a bin as a dict of audio path -> [file, start, duration].
+    """
+    positions = {}
+    # Tables written or removed by a build that is still staged count as done
+    sprite_dir = os.path.join(SPRITES_DIR, bin_name)
+    for name in staged_output.list_output(sprite_dir):
+        if not name.endswith(".json"):
+            continue
+        with open(staged_output.input_path(os.path.join(sprite_dir, name)), "r", encoding="utf-8") as f:
+            table = json.load(f)
+        for audio_path, (start, duration) in table["clips"].items():
+            positions[audio_path] = [table["file"], start, duration]
+    return positions
+
+
+def attach_sprites(word, positions):
+    """
+    Add the sprite position of every clip of an entry found in the sprite tables.
+    """
+    for key in ("audioEn", "audioEnName", "audioKo", "audioKoName"):
+        position = positions.get(word.get(key))
+        if position is not None:
+            # audioEn -> spriteEn, audioKoName -> spriteKoName, ...
+            word["sprite" + key[len("audio"):]] = position
+
+
+def attach_metadata(word):
+    """
+    Measure every clip referenced by an entry and add its metadata.
+    Clips that are missing on disk are left without metadata.
+    """
+    for key in ("audioEn", "audioEnName", "audioKo", "audioKoName"):
+        audio_path = word.get(key)
+        if not audio_path:
+            continue
+        try:
+            # Clips of a staged build are measured before they go live
+            metadata = mp3_metadata.read_mp3_metadata(staged_output.input_path(audio_path))
+        except FileNotFoundError:
+            continue
+        if metadata.get("truncated") or not metadata["duration"]:
+            print(f"  Warning: {audio_path} looks truncated or has no audio frames")
+        # audioEn -> metaEn, audioKoName -> metaKoName, ...
+        word["meta" + key[len("audio"):]] = metadata
+
+
+
+def link_or_copy(source, destination):
+    """
+    Hard-link source to destination, or copy it where links are not supported.
+    """
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copyfile(source, destination)
+
+
+def get_store_path(content_hash):
+    """
+    Return the audio store path of a clip with the given content hash.
+    """
+    return f"{AUDIO_STORE_DIR}/{content_hash[:2]}/{content_hash}.mp3"
+
+
+def get_rendition_paths(store_path):
+    """
+    Return the paths of every rendition of a stored clip, by rendition name.
+    """
+    base = os.path.splitext(store_path)[0]
+    return {name: base + extension for name, extension in RENDITION_EXTENSIONS.items()}
+
+
+def find_renditions(store_path):
+    """
+    Return the renditions of a stored clip that exist, by rendition name.
+    """
+    renditions = {}
+    for name, path in get_rendition_paths(store_path).items():
+        resolved = staged_output.input_path(path)
+        if resolved is not None and os.path.exists(resolved):
+            renditions[name] = path
+    return renditions
+
+
+def store_clip(audio_path, content_hash):
+    """
+    Add the clip at audio_path to the audio store, unless a clip with the
+    same content is stored already, and return its store path. The clip
+    file is then replaced by a link to the stored clip, so identical clips
+    take disk space once. Both changes go through the staged output.
+    """
+    store_path = get_store_path(content_hash)
+
+    source_path = staged_output.input_path(audio_path)
+    stored = staged_output.input_path(store_path)
+    if stored is None or not os.path.exists(stored):
+        target = staged_output.output_path(store_path)
+        # Without staging, output_path does not create the shard directory
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        link_or_copy(source_path, target)
+    elif not os.path.samefile(stored, source_path):
+        target = staged_output.output_path(audio_path)
+        temp_path = f"{target}.{os.getpid()}.tmp"
+        link_or_copy(stored, temp_path)
+        os.replace(temp_path, target)
+    return store_path
+
+
+def attach_store_paths(word):
+    """
+    Replace the audio paths of an entry with the paths of its clips in the
+    audio store, and list the renditions of the stored clips. Clips that
+    are missing on disk keep their path.
+    """
+    for key in ("audioEn", "audioEnName", "audioKo", "audioKoName"):
+        audio_path = word.get(key)
+        if not audio_path:
+            continue
+        source_path = staged_output.input_path(audio_path)
+        if source_path is None or not os.path.exists(source_path):
+            continue
+        metadata = word.get("meta" + key[len("audio"):])
+        content_hash = metadata["hash"] if metadata else mp3_metadata.file_hash(source_path)
+        word[key] = store_clip(audio_path, content_hash)
+
+        renditions = find_renditions(word[key])
+        if renditions:
+            # audioEn -> renditionsEn, audioKoName -> renditionsKoName, ...
+            word["renditions" + key[len("audio"):]] = renditions
+
+
+def iter_store_references(value):
+    """
+    Yield every audio store path in a parsed config, in either schema.
+    """
+    if isinstance(value, dict) and value.get("schema") == COMPACT_SCHEMA_VERSION:
+        value = decode_compact(value)
+    if isinstance(value, str):
+        if value.startswith(AUDIO_STORE_DIR + "/"):
+            yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from iter_store_references(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from iter_store_references(item)
+
+
+def iter_live_configs():
+    """
+    Yield the parsed config and shard files of every bin in the live tree.
+    """
+    paths = list(CONFIG_FILES.values())
+    for bin_name in CONFIG_FILES:
+        shard_dir = os.path.join(SHARDS_DIR, bin_name)
+        if os.path.isdir(shard_dir):
+            paths.extend(os.path.join(shard_dir, name) for name in sorted(os.listdir(shard_dir))
+                         if name.endswith(".json") and name != SHARD_INDEX_FILE)
+    for path in paths:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                yield json.load(f)
+        except (FileNotFoundError, ValueError):
+            continue
+
+
+def remove_unreferenced_clips():
+    """
+    Remove stored clips and renditions that no live config or shard refers
+    to. Works on the live tree, so run it after the build is committed and
+    with the commit lock held since before the configs were built (see
+    commit_build): the configs of every run are then either live or not
+    built yet, and none refers to a clip this removes.
+    """
+    referenced = set()
+    for config in iter_live_configs():
+        referenced.update(iter_store_references(config))
+
+    removed = 0
+    if os.path.isdir(AUDIO_STORE_DIR):
+        for shard in sorted(os.listdir(AUDIO_STORE_DIR)):
+            shard_dir = f"{AUDIO_STORE_DIR}/{shard}"
+            for name in sorted(os.listdir(shard_dir)):
+                store_path = f"{shard_dir}/{name}"
+                if store_path not in referenced:
+                    os.remove(store_path)
+                    removed += 1
+            if not os.listdir(shard_dir):
+                os.rmdir(shard_dir)
+    if removed:
+        print(f"Removed {removed} clips no longer used from {AUDIO_STORE_DIR}/")
+
+
+def commit_build(staging):
+    """
+    Swap a staged build that rebuilt configs into place and clean up the
+    audio store. Hold staging.lock() from before build_configs until this
+    returns, so no other run commits or cleans up the store in between.
+    Returns the number of swapped paths.
+    """
+    with staging.lock():
+        count = staging.commit()
+        if USE_AUDIO_STORE:
+            remove_unreferenced_clips()
+    return count
+
+
+def annotate_words(words, positions):
+    """
+    Yield the entries of a category with sprite positions and metadata
+    added, and their audio paths pointed at the audio store if it is used.
+    """
+    for word in words:
+        if positions:
+            attach_sprites(word, positions)
+        if INCLUDE_AUDIO_METADATA:
+            attach_metadata(word)
+        if USE_AUDIO_STORE:
+            attach_store_paths(word)
+        yield word
+
+
+def build_bin_config(bin_name, bin_listing):
+    """
+    Build the config dict of one bin from its listing. The entries of each
+    category are a StreamedList, annotated as they are generated.
+    """
+    if bin_name == "Alphabet":
+        config = build_alphabet_config(bin_listing)
+    else:
+        config = build_pair_config(bin_name, bin_listing)
+
+    positions = load_sprite_positions(bin_name)
+    config["words"] = {
+        category: StreamedList(lambda words=words: annotate_words(words, positions))
+        for category, words in config["words"].items()
+    }
+    return config
+
+
+def get_compact_fields(bin_name):
+    """
+    Return the fields stored positionally in the compact rows of a bin.
+    """
+    fields = list(COMPACT_FIELDS[bin_name])
+    if USE_AUDIO_STORE:
+        fields += [COMPACT_HASH_FIELDS[key] for key in get_path_templates(bin_name, store=False)]
+    return fields
+
+
+def get_store_hash(path):
+    """
+    Return the content hash of a stored clip from its store path, or "".
+    """
+    if not isinstance(path, str) or not path.startswith(AUDIO_STORE_DIR + "/"):
+        return ""
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def get_path_templates(bin_name, store=None):
+    """
+    Return the audio path templates of a bin. Placeholders are {category}
+    and the names of the entry fields (see expand_path_template). With the
+    audio store, paths are built from the hash fields of the clips.
+    """
+    if store is None:
+        store = USE_AUDIO_STORE
+    if store:
+        return {
+            key: f"{AUDIO_STORE_DIR}/{{{field}:.2}}/{{{field}}}.mp3"
+            for key, field in COMPACT_HASH_FIELDS.items()
+            if key in get_path_templates(bin_name, store=False)
+        }
+    if bin_name == "Alphabet":
+        return {
+            "audioEn": f"{ENGLISH_DIR}/{bin_name}/english_{{category}}/{{index}}_{{english}}.mp3",
+            "audioEnName": f"{ENGLISH_DIR}/{bin_name}/english_{{category}}/{{index}}_{{english}}_name.mp3",
+            "audioKo": f"{KOREAN_DIR}/{bin_name}/korean_{{category}}/{{index}}_{{korean}}.mp3",
+            "audioKoName": f"{KOREAN_DIR}/{bin_name}/korean_{{category}}/{{index}}_{{korean}}_name.mp3",
+        }
+    return {
+        "audioEn": f"{ENGLISH_DIR}/{bin_name}/{{category}}/{{index}}_{{english}}.mp3",
+        "audioKo": f"{KOREAN_DIR}/{bin_name}/{{category}}/{{index}}_{{korean}}.mp3",
+    }
+
+
+def expand_path_template(template, values):
+    """
+    Fill in a compact path template. A template with an empty placeholder
+    value expands to "", so entries without a clip need no override.
+    """
+    parts = []
+    position = 0
+    for match in PATH_PLACEHOLDER_PATTERN.finditer(template):
+        value = str(values.get(match.group(1), ""))
+        if not value:
+            return ""
+        if match.group(2):
+            value = value[:int(match.group(2))]
+        parts.append(template[position:match.start()])
+        parts.append(value)
+        position = match.end()
+    parts.append(template[position:])
+    return "".join(parts)
+
+
+def decode_compact(config):
+    """
+    Convert a parsed config or shard in the compact schema back to the
+    standard layout, like decodeConfig in script.js.
+    """
+    def decode_rows(category, rows):
+        words = []
+        for row in rows:
+            word = dict(zip(config["fields"], row))
+            values = dict(word, category=category)
+            for key, template in config["paths"].items():
+                word[key] = expand_path_template(template, values)
+            if len(row) > len(config["fields"]) and isinstance(row[-1], dict):
+                word.update(row[-1])
+            words.append(word)
+        return words
+
+    decoded = {key: value for key, value in config.items() if key not in ("schema", "fields", "paths")}
+    if isinstance(config["words"], list):
+        decoded["words"] = decode_rows(config["category"], config["words"])
+    else:
+        decoded["words"] = {category: decode_rows(category, rows) for category, rows in config["words"].items()}
+    return decoded
+
+
+def encode_compact_words(category, words, fields, templates):
+    """
+    Encode the entries of one category as arrays of field values, one at a time.
+
+    Paths that the templates reproduce are left out. Anything else (paths
+    that differ from their template, extra properties) goes into an object
+    appended as the last array element.
+    """
+    hash_fields = {field: key for key, field in COMPACT_HASH_FIELDS.items()}
+    for word in words:
+        row = [get_store_hash(word.get(hash_fields[field])) if field in hash_fields else word.get(field, "")
+               for field in fields]
+        values = dict(zip(fields, row), category=category)
+
+        extra = {}
+        for key, value in word.items():
+            if key in fields:
+                continue
+            if key in templates and expand_path_template(templates[key], values) == value:
+                continue
+            extra[key] = value
+        if extra:
+            row.append(extra)
+        yield row
+
+
+def encode_compact(bin_name, config):
+    """
+    Convert a config, or a category shard whose "words" is a single list, to
+    the compact schema. Keys other than "words" are kept as they are.
+    """
+    fields = get_compact_fields(bin_name)
+    templates = get_path_templates(bin_name)
+
+    compact = {key: value for key, value in config.items() if key != "words"}
+    compact["schema"] = COMPACT_SCHEMA_VERSION
+    compact["fields"] = fields
+    compact["paths"] = templates
+    if isinstance(config["words"], dict):
+        compact["words"] = {
+            category: StreamedList(
+                lambda category=category, words=words: encode_compact_words(category, words, fields, templates))
+            for category, words in config["words"].items()
+        }
+    else:
+        compact["words"] = StreamedList(
+            lambda: encode_compact_words(config["category"], config["words"], fields, templates))
+    return compact
+
+
+def iter_config_chunks(bin_name, config):
+    """
+    Serialize a config or shard in the configured schema, as JSON text chunks.
+    """
+    if COMPACT_CONFIGS:
+        return iter_json_chunks(encode_compact(bin_name, config))
+    return iter_json_chunks(config, indent=2)
+
+
+class JSONFileWriter:
+    """
+    Writes JSON text chunks to a file in blocks, hashing the bytes as they go.
+    """
+
+    def __init__(self, path):
+        self.file = open(path, "wb")
+        self.digest = hashlib.sha256()
+        self.size = 0
+        self._block = []
+        self._block_length = 0
+
+    def write(self, chunk):
+        self._block.append(chunk)
+        self._block_length += len(chunk)
+        # Encode and hash in blocks of many chunks rather than chunk by chunk
+        if self._block_length >= WRITE_BLOCK_CHARS:
+            self._flush()
+
+    def _flush(self):
+        data = "".join(self._block).encode("utf-8")
+        self.digest.update(data)
+        self.file.write(data)
+        self.size += len(data)
+        self._block = []
+        self._block_length = 0
+
+    def close(self):
+        """
+        Finish the file. Returns its SHA-256 hex digest.
+        """
+        self._flush()
+        self.file.close()
+        return self.digest.hexdigest()
+
+
+def counted(words, counter):
+    """
+    Yield the entries of words while counting them in counter[0].
+    """
+    for word in words:
+        counter[0] += 1
+        yield word
+
+
+def print_compact_report(bin_name, config):
+    """
+    Compare size and parse time of the standard and compact encodings.
+    Both encodings are held in memory to time the parse.
+    """
+    standard = "".join(iter_json_chunks(config, indent=2)).encode("utf-8")
+    compact = "".join(iter_json_chunks(encode_compact(bin_name, config))).encode("utf-8")
+
+    def parse_ms(data, repeat=20):
+        start_time = time.perf_counter()
+        for _ in range(repeat):
+            json.loads(data)
+        return (time.perf_counter() - start_time) * 1000 / repeat
+
+    saved = 100 * (1 - len(compact) / len(standard)) if standard else 0
+    print(f"  Compact encoding: {len(standard)} -> {len(compact)} bytes ({saved:.0f}% smaller), "
+          f"parse {parse_ms(standard):.2f} -> {parse_ms(compact):.2f} ms")
+
+
+def write_config(bin_name, config, write_shards=False):
+    """
+    Write a bin config to its JSON file and print a short summary.
+
+    With write_shards, the category shards are written in the same pass:
+    every entry is generated once and goes to both the bin config and the
+    shard of its category (see write_shard_entries).
+    """
+    config_file = CONFIG_FILES[bin_name]
+
+    shard_index = None
+    if write_shards:
+        shard_dir = staged_output.output_path(os.path.join(SHARDS_DIR, bin_name), kind="dir")
+        os.makedirs(shard_dir, exist_ok=True)
+        shard_index = {"bin": bin_name, "categories": config["categories"], "shards": {}}
+
+    precache_written = None
+    if WRITE_PRECACHE_MANIFESTS:
+        precache_dir = staged_output.output_path(os.path.join(PRECACHE_DIR, bin_name), kind="dir")
+        os.makedirs(precache_dir, exist_ok=True)
+        precache_written = set()
+
+    # Count the entries while they stream past
+    total_words = [0]
+    words_by_category = {}
+    for category, words in config["words"].items():
+        if write_shards:
+            words = StreamedList(lambda category=category, words=words:
+                                 write_shard_entries(bin_name, category, words, shard_index))
+        if WRITE_PRECACHE_MANIFESTS:
+            words = StreamedList(lambda category=category, words=words:
+                                 write_precache_entries(bin_name, category, words, precache_written))
+        words_by_category[category] = StreamedList(lambda words=words: counted(words, total_words))
+
+    writer = JSONFileWriter(staged_output.output_path(config_file))
+    for chunk in iter_config_chunks(bin_name, dict(config, words=words_by_category)):
+        writer.write(chunk)
+    writer.close()
+    # Restage, so the config goes live after the stored clips it refers to
+    staged_output.output_path(config_file)
+
+    print(f"Configuration file generated successfully: {config_file}")
+    print(f"  Total categories: {len(config['categories'])}, total word pairs: {total_words[0]}")
+    if write_shards:
+        write_shard_index(bin_name, shard_index)
+    if WRITE_PRECACHE_MANIFESTS:
+        remove_stale_precache_manifests(bin_name, precache_written)
+    if COMPACT_CONFIGS:
+        print_compact_report(bin_name, config)
+
+
+def write_shard_entries(bin_name, category, words, shard_index):
+    """
+    Write the shard of one category while passing its entries on, and add
+    the shard to shard_index once it is complete.
+
+    The shard is encoded from a stream that hands every entry over as soon
+    as the encoder has written it, so the caller receives the entries in
+    step with the shard being written and only one entry is held at a time.
+    """
+    handed_over = []
+
+    def entries():
+        for word in words:
+            handed_over.append(word)
+            yield word
+
+    count = [0]
+    shard = {"bin": bin_name, "category": category,
+             "words": StreamedList(lambda: counted(entries(), count))}
+
+    shard_file = f"{category}.json"
+    writer = JSONFileWriter(staged_output.output_path(os.path.join(SHARDS_DIR, bin_name, shard_file)))
+    for chunk in iter_config_chunks(bin_name, shard):
+        writer.write(chunk)
+        while handed_over:
+            yield handed_over.pop(0)
+    checksum = writer.close()
+
+    shard_index["shards"][category] = {
+        "file": f"{SHARDS_DIR}/{bin_name}/{shard_file}",
+        "count": count[0],
+        "checksum": checksum[:16],
+    }
+
+
+def write_shard_index(bin_name, shard_index):
+    """
+    Write the shard index of a bin and remove shards of categories that no
+    longer exist.
+    """
+    shard_dir = staged_output.output_path(os.path.join(SHARDS_DIR, bin_name), kind="dir")
+
+    # Write the index last so it never points at shards that are not there yet
+    with open(os.path.join(shard_dir, SHARD_INDEX_FILE), "w", encoding="utf-8") as f:
+        json.dump(shard_index, f, ensure_ascii=False, indent=2)
+
+    written = {SHARD_INDEX_FILE} | {f"{category}.json" for category in shard_index["shards"]}
+    for entry in os.scandir(shard_dir):
+        if entry.name.endswith(".json") and entry.name not in written:
+            os.remove(entry.path)
+
+    print(f"  Wrote {len(shard_index['shards'])} category shards to {os.path.join(SHARDS_DIR, bin_name)}")
+
+
+def iter_precache_files(word, file_hashes):
+    """
+    Yield a precache entry for every file an entry plays: its clips, or the
+    sprites they are part of. file_hashes caches the hashes of sprite files.
+    """
+    for key in ("audioEn", "audioEnName", "audioKo", "audioKoName"):
+        audio_path = word.get(key)
+        if not audio_path:
+            continue
+        suffix = key[len("audio"):]
+
+        # Clips in a sprite are played from the sprite file
+        sprite = word.get("sprite" + suffix)
+        url = sprite[0] if sprite else audio_path
+        metadata = word.get("meta" + suffix)
+        if not sprite and metadata:
+            content_hash = metadata["hash"]
+        elif url in file_hashes:
+            content_hash = file_hashes[url]
+        else:
+            resolved = staged_output.input_path(url)
+            try:
+                content_hash = file_hashes[url] = mp3_metadata.file_hash(resolved)
+            except (FileNotFoundError, TypeError):
+                continue
+
+        entry = {"url": url, "hash": content_hash}
+        renditions = word.get("renditions" + suffix)
+        if renditions and not sprite:
+            entry["renditions"] = renditions
+        yield entry
+
+
+def write_precache_entries(bin_name, category, words, written):
+    """
+    Pass the entries of a category on while collecting the files they play,
+    and write the precache manifest of the category once all have passed.
+    """
+    files = {}
+    file_hashes = {}
+    for word in words:
+        for entry in iter_precache_files(word, file_hashes):
+            files.setdefault(entry["url"], entry)
+        yield word
+
+    files = list(files.values())
+    version = hashlib.sha256(json.dumps(files, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+    manifest = {"bin": bin_name, "category": category, "version": version, "files": files}
+    manifest_file = f"{category}.json"
+    with open(staged_output.output_path(os.path.join(PRECACHE_DIR, bin_name, manifest_file)),
+              "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    written.add(manifest_file)
+
+
+def remove_stale_precache_manifests(bin_name, written):
+    """
+    Remove the precache manifests of categories that no longer exist.
+    """
+    precache_dir = staged_output.output_path(os.path.join(PRECACHE_DIR, bin_name), kind="dir")
+    for entry in os.scandir(precache_dir):
+        if entry.name.endswith(".json") and entry.name not in written:
+            os.remove(entry.path)
+    print(f"  Wrote {len(written)} precache manifests to {os.path.join(PRECACHE_DIR, bin_name)}")
+
+
+def build_configs(results=None, bins=None):
+    """
+    Build and write the config files of the given bins.
+
+    When results from audio_generator are given, their categories are used as
+    is and only categories that were not part of the run are scanned. Without
+    results the output trees are scanned once. Returns a dict of bin -> config.
+
+    Configs written in place, without staging, are followed by the audio
+    store cleanup; staged builds clean up in commit_build.
+    """
+    if results is not None:
+        listings = listings_from_results(results)
+        if bins is None:
+            bins = [bin_name for bin_name in BINS if bin_name in listings]
+    else:
+        listings = {}
+        if bins is None:
+            bins = BINS
+
+    bins = [bin_name for bin_name in bins if bin_name in CONFIG_FILES]
+    scan_output_tree(bins, listings)
+
+    configs = {}
+    with staged_output.commit_lock():
+        for bin_name in bins:
+            configs[bin_name] = build_bin_config(bin_name, listings.get(bin_name, {}))
+            write_config(bin_name, configs[bin_name], write_shards=WRITE_SHARDS)
+
+        if USE_AUDIO_STORE and staged_output.active() is None:
+            remove_unreferenced_clips()
+
+    return configs
+
+
+def main():
+    """
+    Generate the config files of every bin from the audio output directories,
+    and their fingerprinted copies.
+    """
+    print("Starting configuration file generation for all bins...")
+    start_time = time.time()
+    # Swap all configs and shards in together once they are complete
+    staging = staged_output.begin()
+    try:
+        with staging.lock():
+            build_configs()
+            # Imported here, asset_builder imports this module
+            import asset_builder
+            asset_builder.build_assets()
+            commit_build(staging)
+    finally:
+        staged_output.end()
+    print(f"Done in {(time.time() - start_time) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
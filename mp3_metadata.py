@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import time
+import hashlib
+
+# Bitrates in kbps, indexed by the 4-bit bitrate index of the frame header
+BITRATES = {
+    (1, 1): [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+    (1, 2): [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+    (1, 3): [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    (2, 1): [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+    (2, 2): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+    (2, 3): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+
+# Sample rates in Hz, indexed by MPEG version (1, 2, or 2.5 as 25)
+SAMPLE_RATES = {
+    1: [44100, 48000, 32000],
+    2: [22050, 24000, 16000],
+    25: [11025, 12000, 8000],
+}
+
+# Length of the content hash stored in the configs, in hex digits
+HASH_LENGTH = 16
+
+
+def content_hash(data):
+    """
+    Return the content hash of a file's bytes, as stored in the configs.
+    """
+    return hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+
+
+def file_hash(path):
+    """
+    Return the content hash of the file at path.
+    """
+    with open(path, "rb") as f:
+        return content_hash(f.read())
+
+
+def parse_frame_header(data, offset):
+    """
+    Parse the 4-byte MPEG audio frame header at offset.
+    Returns (frame length in bytes, samples in frame, sample rate) or None.
+    """
+    if offset + 4 > len(data) or data[offset] != 0xFF or (data[offset + 1] & 0xE0) != 0xE0:
+        return None
+
+    version_bits = (data[offset + 1] >> 3) & 0x03
+    layer_bits = (data[offset + 1] >> 1) & 0x03
+    bitrate_index = data[offset + 2] >> 4
+    sample_rate_index = (data[offset + 2] >> 2) & 0x03
+    padding = (data[offset + 2] >> 1) & 0x01
+
+    # Reserved or free-format values cannot be measured
+    if version_bits == 1 or layer_bits == 0 or bitrate_index in (0, 15) or sample_rate_index == 3:
+        return None
+
+    version = {3: 1, 2: 2, 0: 25}[version_bits]
+    layer = 4 - layer_bits
+    bitrate = BITRATES[(1 if version == 1 else 2, layer)][bitrate_index] * 1000
+    sample_rate = SAMPLE_RATES[version][sample_rate_index]
+
+    if layer == 1:
+        samples = 384
+        length = (12 * bitrate // sample_rate + padding) * 4
+    elif layer == 2 or version == 1:
+        samples = 1152
+        length = 144 * bitrate // sample_rate + padding
+    else:
+        # Layer III in MPEG 2 and 2.5 has half as many samples per frame
+        samples = 576
+        length = 72 * bitrate // sample_rate + padding
+
+    return length, samples, sample_rate
+
+
+def id3v2_size(data):
+    """
+    Return the size of a leading ID3v2 tag, or 0 if there is none.
+    """
+    if len(data) < 10 or data[:3] != b"ID3":
+        return 0
+    # Tag size is a 28-bit "syncsafe" integer (7 bits per byte)
+    size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+    footer = 10 if data[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def read_mp3_metadata(path):
+    """
+    Measure an MP3 file by walking its frame headers, without decoding audio.
+
+    Returns a dict with duration (ms), bytes, bitrate (kbps, averaged over
+    the audio frames) and hash (truncated SHA-256 of the file). "truncated"
+    is added when the last frame is cut off.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+
+    offset = id3v2_size(data)
+    total_samples = 0
+    audio_bytes = 0
+    sample_rate = 0
+    truncated = False
+    end = len(data)
+
+    while offset + 4 <= end:
+        header = parse_frame_header(data, offset)
+        if header is None:
+            # Not a frame (e.g. a trailing tag or junk); resync on the next 0xFF byte
+            next_sync = data.find(b"\xff", offset + 1)
+            if next_sync < 0:
+                break
+            offset = next_sync
+            continue
+
+        length, samples, sample_rate = header
+        if offset + length > end:
+            truncated = True
+            break
+        total_samples += samples
+        audio_bytes += length
+        offset += length
+
+    duration = 1000 * total_samples / sample_rate if sample_rate else 0
+    metadata = {
+        "duration": round(duration),
+        "bytes": len(data),
+        "bitrate": round(audio_bytes * 8 / duration) if duration else 0,
+        "hash": content_hash(data),
+    }
+    if truncated:
+        metadata["truncated"] = True
+    return metadata
+
+
+def main():
+    """
+    Measure every MP3 under the given directories (default: English and Korean).
+    """
+    roots = sys.argv[1:] or ["English", "Korean"]
+    start_time = time.time()
+
+    count = 0
+    total_bytes = 0
+    total_duration = 0
+    for root in roots:
+        for dirpath, _, filenames in os.walk(root):
+            for name in filenames:
+                if not name.lower().endswith(".mp3"):
+                    continue
+                path = os.path.join(dirpath, name)
+                metadata = read_mp3_metadata(path)
+                count += 1
+                total_bytes += metadata["bytes"]
+                total_duration += metadata["duration"]
+                if metadata.get("truncated") or not metadata["duration"]:
+                    print(f"Warning: {path} looks truncated or has no audio frames")
+
+    elapsed = time.time() - start_time
+    print(f"Measured {count} files ({total_bytes} bytes, {total_duration / 1000:.1f} s of audio) "
+          f"in {elapsed * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
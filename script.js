@@ -6,6 +6,7 @@ const gameState = {
     selectedCategories: [],
     availableCategories: [],
     words: {},
+    shardIndex: null, // Category shard index of the selected bin (null when using the single config file)
     score: 0,
     correctAnswers: 0,
     totalQuestions: 0,
@@ -16,6 +17,7 @@ const gameState = {
     confettiInterval: null, // Added for continuous confetti
     // Quiz mode specific properties
     quizWords: [], // Array to hold words for the quiz
+    upcomingQuestions: [], // Words of the next questions, decided ahead so their audio can preload
     correctlyAnsweredWords: [], // Array to track words answered correctly
     totalUniqueWords: 0, // Total unique words in the quiz
     // Flash card mode specific properties
@@ -26,6 +28,26 @@ const gameState = {
     incorrectCards: [], // Cards marked as incorrect
 };
 
+// Fingerprinted names of the static files and configs, embedded in
+// index.build.html by asset_builder.py. Without it the plain names are used.
+const assetManifest = (() => {
+    const element = document.getElementById('asset-manifest');
+    if (!element) {
+        return {};
+    }
+    try {
+        return JSON.parse(element.textContent);
+    } catch (error) {
+        console.warn(`Invalid asset manifest: ${error.message}`);
+        return {};
+    }
+})();
+
+// Return the URL of a static file, fingerprinted if the build produced one
+function assetUrl(path) {
+    return assetManifest[path] || path;
+}
+
 // Config files for each bin
 const configFiles = {
     'Alphabet': 'alphabet_config.json',
@@ -33,6 +55,16 @@ const configFiles = {
     'Phrases': 'phrases_config.json'
 };
 
+// Shard index files for each bin (one small index plus one JSON file per category)
+const shardIndexFiles = {
+    'Alphabet': 'config_shards/Alphabet/_index.json',
+    'Words': 'config_shards/Words/_index.json',
+    'Phrases': 'config_shards/Phrases/_index.json'
+};
+
+// Per-category lists of the audio files to precache, written by config_builder.py
+const PRECACHE_DIR = 'precache';
+
 // DOM elements
 const setupScreen = document.getElementById('setup-screen');
 const gameScreen = document.getElementById('game-screen');
@@ -75,18 +107,59 @@ audioPlayer.volume = 1.0;
 audioPlayer.addEventListener('ended', () => {
     // Release the audio resource after playback
     audioPlayer.src = '';
+    currentSpriteFile = null;
 });
 
-// Pre-create audio elements for correct and incorrect sounds
-const correctAudio = new Audio('sounds/correct.mp3');
-const incorrectAudio = new Audio('sounds/incorrect.mp3');
+// Category sprite currently loaded in audioPlayer, and the timer that stops
+// playback at the end of the current clip within the sprite
+let currentSpriteFile = null;
+let spriteStopTimer = null;
+
+// Lower-bitrate encodings listed in the config entries (renditionsEn,
+// renditionsKo, ...), in order of preference, with the MIME type to probe
+const AUDIO_RENDITIONS = [
+    ['opus', 'audio/ogg; codecs=opus'],
+    ['aac', 'audio/mp4; codecs="mp4a.40.2"']
+];
+const playableRenditions = AUDIO_RENDITIONS
+    .filter(([, type]) => audioPlayer.canPlayType(type) !== '')
+    .map(([name]) => name);
+
+// Return the smallest rendition of a clip the browser can play, or the MP3
+function selectRendition(audioPath, renditions) {
+    if (renditions) {
+        for (const name of playableRenditions) {
+            if (renditions[name]) {
+                return renditions[name];
+            }
+        }
+    }
+    return audioPath;
+}
+
+// Sound effect files; they are decoded once and played from the buffer pool
+const SOUND_EFFECTS = {
+    correct: 'sounds/correct.mp3',
+    incorrect: 'sounds/incorrect.mp3'
+};
+
+// Pre-create audio elements for correct and incorrect sounds, used without Web Audio
+const correctAudio = new Audio(SOUND_EFFECTS.correct);
+const incorrectAudio = new Audio(SOUND_EFFECTS.incorrect);
 
 // Use full volume for these sounds
 correctAudio.volume = 1.0;
 incorrectAudio.volume = 1.0;
 
-// Play sound effects using pre-created audio objects
+// Play a sound effect from its decoded buffer, or with its audio element
 function playSound(type) {
+    const buffer = SOUND_EFFECTS[type] && getDecodedAudio(SOUND_EFFECTS[type]);
+    if (buffer && audioContext.state === 'running') {
+        // Effects play over the word clip instead of stopping it
+        startBufferSource(buffer);
+        return;
+    }
+
     if (type === 'correct') {
         // Reset to the beginning before playing
         correctAudio.currentTime = 0;
@@ -102,19 +175,293 @@ function playSound(type) {
     }
 }
 
+// Play a word clip, seeking into its category sprite when the entry has one.
+// sprite is [sprite file, start ms, duration ms]; onEnded runs after the clip.
+function playAudioClip(audioPath, sprite, onEnded) {
+    clearTimeout(spriteStopTimer);
+    spriteStopTimer = null;
+
+    if (!sprite) {
+        // Separate file per clip
+        currentSpriteFile = null;
+        audioPlayer.src = audioPath;
+        if (onEnded) {
+            audioPlayer.addEventListener('ended', onEnded, { once: true });
+        }
+        return audioPlayer.play();
+    }
+
+    const [spriteFile, start, duration] = sprite;
+
+    const playSegment = () => {
+        audioPlayer.currentTime = start / 1000;
+        // Stop at the end of the clip; the silent gap after it absorbs timer jitter
+        spriteStopTimer = setTimeout(() => {
+            audioPlayer.pause();
+            spriteStopTimer = null;
+            if (onEnded) {
+                onEnded();
+            }
+        }, duration);
+        return audioPlayer.play();
+    };
+
+    // The sprite is fetched once and reused for every clip of the category
+    if (currentSpriteFile === spriteFile && audioPlayer.readyState >= HTMLMediaElement.HAVE_METADATA) {
+        audioPlayer.pause();
+        return playSegment();
+    }
+
+    currentSpriteFile = spriteFile;
+    audioPlayer.src = spriteFile;
+    return new Promise((resolve, reject) => {
+        audioPlayer.addEventListener('loadedmetadata', () => {
+            playSegment().then(resolve, reject);
+        }, { once: true });
+        audioPlayer.addEventListener('error', () => {
+            reject(new Error(`Failed to load audio sprite: ${spriteFile}`));
+        }, { once: true });
+    });
+}
+
 // Function to clean up audio resources
 function cleanupAudio() {
+    clearTimeout(spriteStopTimer);
+    spriteStopTimer = null;
+    playRequest++;
+    stopBufferSource();
+    currentSpriteFile = null;
     audioPlayer.pause();
     audioPlayer.src = '';
     correctAudio.pause();
     incorrectAudio.pause();
 }
 
+// Number of upcoming questions whose audio is loaded ahead of time
+const PRELOAD_LOOKAHEAD = 3;
+
+// Memory budget of the decoded clips kept for instant playback, in bytes of
+// PCM samples. The least recently used clips are evicted beyond it.
+const DECODED_AUDIO_BUDGET = 32 * 1024 * 1024;
+
+// Maximum number of decoded clips kept, whatever their size
+const DECODED_AUDIO_MAX_CLIPS = 300;
+
+// Web Audio context, created on first use (null if the browser has none)
+let audioContext = null;
+
+// Buffer pool: decoded clips by file URL in least recently used order, their
+// total size, and the decodes in flight. Every clip is fetched and decoded
+// once; playing it again only starts a new buffer source.
+const decodedAudio = new Map();
+let decodedAudioBytes = 0;
+const pendingAudio = new Map();
+
+// Buffer source of the word clip currently playing, and a counter that
+// invalidates clips still loading when another one starts
+let currentBufferSource = null;
+let playRequest = 0;
+
+function getAudioContext() {
+    if (!audioContext) {
+        const AudioContextClass = window.AudioContext || window.webkitAudioContext;
+        if (!AudioContextClass) {
+            return null;
+        }
+        audioContext = new AudioContextClass();
+    }
+    return audioContext;
+}
+
+// Resume the audio context, which browsers only allow during a user
+// gesture, and load the sound effects into the buffer pool
+function unlockAudio() {
+    const context = getAudioContext();
+    if (!context) {
+        return;
+    }
+    if (context.state === 'suspended') {
+        context.resume().catch(error => {
+            console.warn(`Could not start audio: ${error.message}`);
+        });
+    }
+    Object.values(SOUND_EFFECTS).forEach(loadAudioBuffer);
+}
+
+// Return the decoded clip of a URL if it is loaded, marking it as recently used
+function getDecodedAudio(url) {
+    const entry = decodedAudio.get(url);
+    if (!entry) {
+        return null;
+    }
+    decodedAudio.delete(url);
+    decodedAudio.set(url, entry);
+    return entry.buffer;
+}
+
+// Keep a decoded clip, evicting the least recently used ones over the caps
+function storeDecodedAudio(url, buffer) {
+    const bytes = buffer.length * buffer.numberOfChannels * 4;
+    decodedAudio.set(url, { buffer, bytes });
+    decodedAudioBytes += bytes;
+
+    for (const [oldUrl, entry] of decodedAudio) {
+        if ((decodedAudioBytes <= DECODED_AUDIO_BUDGET && decodedAudio.size <= DECODED_AUDIO_MAX_CLIPS)
+            || oldUrl === url) {
+            break;
+        }
+        decodedAudio.delete(oldUrl);
+        decodedAudioBytes -= entry.bytes;
+    }
+}
+
+// Fetch and decode a clip (or sprite file) unless it is already loaded.
+// Resolves to the AudioBuffer, or null if it cannot be decoded.
+function loadAudioBuffer(url) {
+    const buffer = getDecodedAudio(url);
+    if (buffer) {
+        return Promise.resolve(buffer);
+    }
+    if (pendingAudio.has(url)) {
+        return pendingAudio.get(url);
+    }
+
+    const context = getAudioContext();
+    if (!context) {
+        return Promise.resolve(null);
+    }
+
+    const pending = fetch(url)
+        .then(response => {
+            if (!response.ok) {
+                throw new Error(`${response.status} ${response.statusText}`);
+            }
+            return response.arrayBuffer();
+        })
+        // The callback form also works in Safari versions without the promise form
+        .then(data => new Promise((resolve, reject) => context.decodeAudioData(data, resolve, reject)))
+        .then(decoded => {
+            storeDecodedAudio(url, decoded);
+            return decoded;
+        })
+        .catch(error => {
+            console.warn(`Could not preload ${url}: ${error ? error.message : 'decoding failed'}`);
+            return null;
+        })
+        .finally(() => {
+            pendingAudio.delete(url);
+        });
+    pendingAudio.set(url, pending);
+    return pending;
+}
+
+// The clips a word plays in a language ('Ko' or 'En', by default the one of
+// the language mode): { audio, name }, each { path, sprite, url } with url
+// the file to load (the sprite file for sprite clips)
+function getWordClips(word, language) {
+    const suffix = language || (gameState.languageMode === 'korean' ? 'Ko' : 'En');
+    const clip = key => {
+        const sprite = word[`sprite${suffix}${key}`];
+        const path = selectRendition(word[`audio${suffix}${key}`], word[`renditions${suffix}${key}`]);
+        if (!path && !sprite) {
+            return null;
+        }
+        return { path, sprite, url: sprite ? sprite[0] : path };
+    };
+    return {
+        audio: clip(''),
+        name: gameState.selectedBin === 'Alphabet' ? clip('Name') : null
+    };
+}
+
+// Load the audio of the given words in the background
+function preloadWords(words) {
+    words.forEach(word => {
+        const clips = getWordClips(word);
+        [clips.audio, clips.name].forEach(clip => {
+            if (clip) {
+                loadAudioBuffer(clip.url);
+            }
+        });
+    });
+}
+
+// Start playing a decoded clip, or the segment of a decoded sprite
+function startBufferSource(buffer, sprite) {
+    const source = audioContext.createBufferSource();
+    source.buffer = buffer;
+    source.connect(audioContext.destination);
+    if (sprite) {
+        const [, start, duration] = sprite;
+        source.start(0, start / 1000, duration / 1000);
+    } else {
+        source.start();
+    }
+    return source;
+}
+
+// Play a word clip from its decoded buffer in place of the current one
+function playBuffer(buffer, sprite, onEnded) {
+    stopBufferSource();
+    // Stop whatever the media element was playing
+    clearTimeout(spriteStopTimer);
+    spriteStopTimer = null;
+    audioPlayer.pause();
+
+    const source = startBufferSource(buffer, sprite);
+    source.onended = () => {
+        if (currentBufferSource === source) {
+            currentBufferSource = null;
+            if (onEnded) {
+                onEnded();
+            }
+        }
+    };
+    currentBufferSource = source;
+}
+
+// Play a word clip (from getWordClips) through the buffer pool, decoding it
+// first if needed. Falls back to the media element without Web Audio, while
+// the audio context is not running yet, or if the clip cannot be decoded.
+// Resolves once the clip has started, or was replaced by another one.
+async function playClip(clip, onEnded) {
+    const request = ++playRequest;
+    stopBufferSource();
+
+    if (!audioContext || audioContext.state !== 'running') {
+        return playAudioClip(clip.path, clip.sprite, onEnded);
+    }
+
+    const buffer = await loadAudioBuffer(clip.url);
+    if (request !== playRequest) {
+        // Another clip was started while this one was loading
+        return;
+    }
+    if (!buffer) {
+        return playAudioClip(clip.path, clip.sprite, onEnded);
+    }
+    playBuffer(buffer, clip.sprite, onEnded);
+}
+
+// Stop the buffer source that is playing, without running its onEnded
+function stopBufferSource() {
+    if (currentBufferSource) {
+        const source = currentBufferSource;
+        currentBufferSource = null;
+        try {
+            source.stop();
+        } catch (error) {
+            // Already stopped
+        }
+    }
+}
+
 // Initialize the game
 async function initGame() {
     try {
         showLoading('Loading game data...');
         setupEventListeners();
+        registerServiceWorker();
 
         // Initially hide the categories until a bin is selected
         document.querySelector('.categories-section').style.display = 'none';
@@ -130,6 +477,35 @@ async function initGame() {
     }
 }
 
+// Register the service worker that caches the game and its audio for offline play
+function registerServiceWorker() {
+    if (!('serviceWorker' in navigator)) {
+        return;
+    }
+    navigator.serviceWorker.register('service-worker.js').catch(error => {
+        console.warn(`Service worker registration failed: ${error.message}`);
+    });
+}
+
+// Ask the service worker to cache every clip of the given categories, in the
+// renditions this browser plays, so questions play without a network fetch
+async function precacheCategories(bin, categories) {
+    if (!('serviceWorker' in navigator)) {
+        return;
+    }
+    try {
+        const registration = await navigator.serviceWorker.ready;
+        registration.active.postMessage({
+            type: 'precache',
+            manifests: categories.map(category =>
+                `${PRECACHE_DIR}/${encodeURIComponent(bin)}/${encodeURIComponent(category)}.json`),
+            renditions: playableRenditions
+        });
+    } catch (error) {
+        console.warn(`Could not precache categories: ${error.message}`);
+    }
+}
+
 // Show loading indicator
 function showLoading(message) {
     // Create loading overlay if it doesn't exist
@@ -200,13 +576,30 @@ async function loadConfigFile(bin) {
         }
 
         showLoading(`Loading ${bin} data...`);
-        const response = await fetch(configFile);
+
+        // Prefer the small shard index; category word lists are then loaded on demand
+        const shardIndex = await fetchShardIndex(bin);
+        if (shardIndex) {
+            gameState.shardIndex = shardIndex;
+            gameState.availableCategories = shardIndex.categories || [];
+            gameState.words = {};
+
+            console.log(`Shard index loaded successfully for ${bin}`);
+            console.log('Categories:', gameState.availableCategories);
+
+            hideLoading();
+            return true;
+        }
+
+        // Fall back to the single config file with every category
+        gameState.shardIndex = null;
+        const response = await fetch(assetUrl(configFile));
 
         if (!response.ok) {
             throw new Error(`Failed to load configuration file: ${response.status} ${response.statusText}`);
         }
 
-        const config = await response.json();
+        const config = decodeConfig(await response.json());
 
         // Set game state from configuration
         gameState.availableCategories = config.categories || [];
@@ -231,6 +624,140 @@ async function loadConfigFile(bin) {
     }
 }
 
+// Decode a config or shard written in the compact schema (version 2) by config_builder.py.
+//
+// Compact layout:
+//   fields - names of the entry properties stored positionally, e.g. ["index", "english", "korean"]
+//   paths  - audio path templates such as "English/Words/{category}/{index}_{english}.mp3",
+//            or "audio/{hashEn:.2}/{hashEn}.mp3" for clips in the audio store, whose rows
+//            carry hashEn/hashKo (hashEnName/hashKoName) fields. {category} and {<field>}
+//            placeholders are filled in from the entry, {<field>:.N} with its first N
+//            characters; a template with an empty placeholder expands to ""
+//   words  - category -> array of rows (a shard holds a single array of rows). Each row has
+//            the field values in order, optionally followed by an object of extra properties
+//            that are added to the entry and override templated paths.
+// Configs without a schema are already in the standard layout and are returned unchanged.
+function decodeConfig(config) {
+    if (!config || config.schema !== 2) {
+        return config;
+    }
+
+    const decodeRows = (category, rows) => rows.map(row => decodeCompactRow(config, category, row));
+
+    let words;
+    if (Array.isArray(config.words)) {
+        words = decodeRows(config.category, config.words);
+    } else {
+        words = {};
+        Object.entries(config.words).forEach(([category, rows]) => {
+            words[category] = decodeRows(category, rows);
+        });
+    }
+
+    return { ...config, words };
+}
+
+// Decode one compact row into a word entry
+function decodeCompactRow(config, category, row) {
+    const entry = {};
+    config.fields.forEach((field, i) => {
+        entry[field] = row[i];
+    });
+
+    // Expand the audio path templates
+    const values = { ...entry, category };
+    Object.entries(config.paths).forEach(([key, template]) => {
+        entry[key] = expandPathTemplate(template, values);
+    });
+
+    // Extra properties and paths that differ from their template
+    const extra = row[config.fields.length];
+    if (extra && typeof extra === 'object') {
+        Object.assign(entry, extra);
+    }
+
+    return entry;
+}
+
+// Fill in a compact path template; an empty placeholder value means the entry has no such clip
+function expandPathTemplate(template, values) {
+    let empty = false;
+    const path = template.replace(/\{(\w+)(?::\.(\d+))?\}/g, (match, name, length) => {
+        const value = String(values[name] ?? '');
+        if (!value) {
+            empty = true;
+        }
+        return length ? value.slice(0, Number(length)) : value;
+    });
+    return empty ? '' : path;
+}
+
+// Fetch the shard index of a bin, or null if the bin has no shards
+async function fetchShardIndex(bin) {
+    const indexFile = shardIndexFiles[bin];
+    if (!indexFile) {
+        return null;
+    }
+
+    try {
+        // Always revalidate the index; shards are cache-busted by their checksums
+        const response = await fetch(indexFile, { cache: 'no-cache' });
+        if (!response.ok) {
+            return null;
+        }
+        return await response.json();
+    } catch (error) {
+        console.warn(`Shard index not available for ${bin}: ${error.message}`);
+        return null;
+    }
+}
+
+// Load the word lists of the given categories from their shards
+async function loadCategoryShards(categories) {
+    const shardIndex = gameState.shardIndex;
+    if (!shardIndex) {
+        return true; // Single config file, everything is already loaded
+    }
+
+    const missingCategories = categories.filter(category => !gameState.words[category]);
+    if (missingCategories.length === 0) {
+        return true;
+    }
+
+    try {
+        showLoading('Loading categories...');
+
+        const shards = await Promise.all(missingCategories.map(async category => {
+            const shardInfo = shardIndex.shards[category];
+            if (!shardInfo) {
+                throw new Error(`No shard defined for category: ${category}`);
+            }
+
+            // The checksum changes whenever the shard does, so cached copies stay valid
+            const response = await fetch(`${shardInfo.file}?v=${shardInfo.checksum}`);
+            if (!response.ok) {
+                throw new Error(`Failed to load ${shardInfo.file}: ${response.status} ${response.statusText}`);
+            }
+            return decodeConfig(await response.json());
+        }));
+
+        // Ignore the shards if another bin was selected while they were loading
+        if (gameState.shardIndex === shardIndex) {
+            shards.forEach(shard => {
+                gameState.words[shard.category] = shard.words || [];
+            });
+        }
+
+        hideLoading();
+        return true;
+    } catch (error) {
+        console.error('Error loading category shards:', error);
+        showErrorMessage('Failed to load the selected categories. Please try again.');
+        hideLoading();
+        return false;
+    }
+}
+
 // Select a bin
 async function selectBin(bin) {
     if (gameState.selectedBin === bin) {
@@ -372,7 +899,11 @@ function setupEventListeners() {
     document.getElementById('deselect-all').addEventListener('click', deselectAllCategories);
 
     // Start Game button
-    document.getElementById('start-game').addEventListener('click', () => {
+    document.getElementById('start-game').addEventListener('click', async () => {
+        // Audio contexts can only start during a user gesture such as this
+        // click, and Safari drops the gesture at the first await
+        unlockAudio();
+
         // Ensure a bin is selected
         if (!gameState.selectedBin) {
             showErrorMessage('Please select a content type (Alphabet, Words, or Phrases) before starting the game.');
@@ -385,6 +916,15 @@ function setupEventListeners() {
             return;
         }
 
+        // Make sure the word lists of the selected categories are loaded
+        const loaded = await loadCategoryShards(gameState.selectedCategories);
+        if (!loaded) {
+            return;
+        }
+
+        // Fetch the audio of the selected categories in the background
+        precacheCategories(gameState.selectedBin, gameState.selectedCategories);
+
         startGame();
     });
 
@@ -453,6 +993,7 @@ function initQuizWords() {
     try {
         // Reset arrays
         gameState.quizWords = [];
+        gameState.upcomingQuestions = [];
         gameState.correctlyAnsweredWords = [];
         
         // Get all selected words
@@ -518,6 +1059,7 @@ function startGame() {
         gameState.correctAnswers = 0;
         gameState.totalQuestions = 0;
         gameState.correctlyAnsweredWords = [];
+        gameState.upcomingQuestions = [];
 
         if (gameState.gameMode === 'quiz') {
             initQuizWords();
@@ -604,6 +1146,10 @@ function updateFlashCardDisplay() {
         
         // Update progress display
         updateFlashCardProgress();
+
+        // Load the front side audio of this card and the next ones
+        const index = gameState.currentCardIndex;
+        preloadWords(gameState.flashcards.slice(index, index + 1 + PRELOAD_LOOKAHEAD));
     } catch (error) {
         console.error('Error updating flash card display:', error);
         showErrorMessage('Failed to update flash card. Please try again.');
@@ -634,21 +1180,16 @@ function flipCard() {
 // Play the current flash card sound
 function playFlashCardSound() {
     const currentCard = gameState.flashcards[gameState.currentCardIndex];
+    unlockAudio();
     
     // Determine which audio to play based on the card side
-    let audioPath;
-    if (gameState.cardSide === 'front') {
-        // Play the audio for the front side
-        audioPath = gameState.languageMode === 'korean' ? currentCard.audioKo : currentCard.audioEn;
-    } else {
-        // Play the audio for the back side
-        audioPath = gameState.languageMode === 'korean' ? currentCard.audioEn : currentCard.audioKo;
-    }
-    
+    const frontIsKorean = gameState.languageMode === 'korean';
+    const playKorean = gameState.cardSide === 'front' ? frontIsKorean : !frontIsKorean;
+    const clip = getWordClips(currentCard, playKorean ? 'Ko' : 'En').audio;
+
     // Play the audio
-    if (audioPath) {
-        audioPlayer.src = audioPath;
-        audioPlayer.play().catch(error => {
+    if (clip) {
+        playClip(clip).catch(error => {
             console.warn(`Error playing audio: ${error.message}`);
         });
     }
@@ -750,6 +1291,7 @@ function resetGameButKeepSettings() {
     gameState.currentQuestion = null;
     gameState.timeRemaining = 60;
     gameState.quizWords = [];
+    gameState.upcomingQuestions = [];
     gameState.correctlyAnsweredWords = [];
     gameState.totalUniqueWords = 0;
 
@@ -803,6 +1345,7 @@ function resetGame() {
     gameState.currentQuestion = null;
     gameState.timeRemaining = 60;
     gameState.quizWords = [];
+    gameState.upcomingQuestions = [];
     gameState.correctlyAnsweredWords = [];
     gameState.totalUniqueWords = 0;
 
@@ -846,46 +1389,68 @@ function getAllSelectedWords() {
     return allWords;
 }
 
+// Pick the word of a new question following the rules of the game mode,
+// or return null if there is none. previous is the word asked before it.
+function pickNextWord(previous) {
+    if (gameState.gameMode === 'quiz') {
+        // Quiz mode logic - enhanced shuffling algorithm
+        if (gameState.quizWords.length === 0) {
+            return null;
+        }
+
+        // Take a random remaining word out of the quiz words
+        const nextWordIndex = Math.floor(Math.random() * gameState.quizWords.length);
+        return gameState.quizWords.splice(nextWordIndex, 1)[0];
+    }
+
+    // Endless and timed modes
+    const allWords = getAllSelectedWords();
+    if (allWords.length === 0) {
+        return null;
+    }
+
+    // Get a random word that's different from the previous one
+    let nextWord;
+    do {
+        nextWord = allWords[Math.floor(Math.random() * allWords.length)];
+    } while (previous && nextWord.index === previous.index);
+    return nextWord;
+}
+
+// Decide the next PRELOAD_LOOKAHEAD questions and start loading their audio
+function fillQuestionQueue() {
+    const queue = gameState.upcomingQuestions;
+    while (queue.length < PRELOAD_LOOKAHEAD) {
+        const previous = queue.length > 0 ? queue[queue.length - 1] : gameState.currentQuestion;
+        const word = pickNextWord(previous);
+        if (!word) {
+            break;
+        }
+        queue.push(word);
+    }
+    preloadWords(queue);
+}
+
 // Load the next question
 function loadNextQuestion() {
     try {
-        // Handle different game modes
-        if (gameState.gameMode === 'quiz') {
-            // Quiz mode logic - enhanced shuffling algorithm
-            if (gameState.quizWords.length === 0) {
+        // The next question comes from the lookahead queue
+        fillQuestionQueue();
+        if (gameState.upcomingQuestions.length === 0) {
+            if (gameState.gameMode === 'quiz') {
                 // All words have been answered correctly, end the game
                 endGame();
-                return;
-            }
-
-            // Get the next word
-            const nextWordIndex = Math.floor(Math.random() * gameState.quizWords.length);
-            const nextWord = gameState.quizWords[nextWordIndex];
-            
-            // Remove the word from the quiz words array
-            gameState.quizWords.splice(nextWordIndex, 1);
-            
-            // Set as current question
-            gameState.currentQuestion = nextWord;
-        } else {
-            // Endless and timed modes
-            const allWords = getAllSelectedWords();
-            if (allWords.length === 0) {
+            } else {
                 showErrorMessage('No words available. Please select more categories.');
                 returnToMainMenu();
-                return;
             }
-
-            // Get a random word that's different from the current one
-            let nextWord;
-            do {
-                nextWord = allWords[Math.floor(Math.random() * allWords.length)];
-            } while (gameState.currentQuestion && nextWord.index === gameState.currentQuestion.index);
-
-            // Set as current question
-            gameState.currentQuestion = nextWord;
+            return;
         }
 
+        // Set as current question, and decide the one after the queue
+        gameState.currentQuestion = gameState.upcomingQuestions.shift();
+        fillQuestionQueue();
+
         // Record start time for time bonus calculation
         gameState.questionStartTime = Date.now();
 
@@ -961,58 +1526,36 @@ function displayQuestion() {
 // Play the current word's sound
 function playCurrentWordSound() {
     if (!gameState.currentQuestion) return;
-    
-    // Get the audio paths based on the language mode
-    let audioPath, nameAudioPath;
-    
-    if (gameState.languageMode === 'korean') {
-        audioPath = gameState.currentQuestion.audioKo;
-        nameAudioPath = gameState.currentQuestion.audioKoName;
-    } else {
-        audioPath = gameState.currentQuestion.audioEn;
-        nameAudioPath = gameState.currentQuestion.audioEnName;
-    }
-    
-    // For alphabet, check if there's a "name" audio that should play first
-    if (gameState.selectedBin === 'Alphabet' && nameAudioPath) {
-        // First play the name
-        const nameAudio = new Audio(nameAudioPath);
-        nameAudio.volume = 1.0;
-        
-        // Add event listener for when name audio ends
-        nameAudio.addEventListener('ended', () => {
-            // Wait 0.5 seconds, then play the sound
+
+    // Get the clips based on the language mode
+    const question = gameState.currentQuestion;
+    const clips = getWordClips(question);
+    if (!clips.audio) return;
+
+    const playSoundClip = () => {
+        playClip(clips.audio).catch(error => {
+            console.warn(`Error playing audio: ${error.message}`);
+        });
+    };
+
+    // For alphabet, the letter name plays first, then the sound
+    if (clips.name) {
+        playClip(clips.name, () => {
+            // Wait 0.5 seconds, then play the sound (unless the question changed)
             setTimeout(() => {
-                // Play the regular sound after the name
-                audioPlayer.src = audioPath;
-                audioPlayer.play().catch(error => {
-                    console.warn(`Error playing sound audio: ${error.message}`);
-                });
+                if (gameState.currentQuestion !== question) return;
+                playSoundClip();
             }, 500); // 0.5 second pause
-            
-            // Clean up this audio resource
-            nameAudio.src = '';
-        });
-        
-        // Play the name audio
-        nameAudio.play().catch(error => {
+        }).catch(error => {
             console.warn(`Error playing name audio: ${error.message}`);
-            
+
             // If name audio fails, fall back to regular audio
-            audioPlayer.src = audioPath;
-            audioPlayer.play().catch(err => {
-                console.warn(`Error playing fallback audio: ${err.message}`);
-            });
+            playSoundClip();
         });
-        
         return;
     }
-    
-    // Regular audio playback for non-alphabet or if alphabet enhancement fails
-    audioPlayer.src = audioPath;
-    audioPlayer.play().catch(error => {
-        console.warn(`Error playing audio: ${error.message}`);
-    });
+
+    playSoundClip();
 }
 
 // Check the selected answer
@@ -0,0 +1,245 @@
+// Service worker: keeps the game shell and the audio of played categories in
+// the Cache Storage, so clips play without a network round trip and the game
+// works offline once a category has been precached.
+//
+// - The shell (the page, the fingerprinted script, stylesheet and configs
+//   listed in asset-manifest.json, the feedback sounds) is cached on install.
+// - Pages and manifests are fetched from the network first, falling back to
+//   the cache when offline.
+// - Audio, sprites, assets and shards are served from the cache first. Audio
+//   elements request byte ranges, which are answered from the cached file.
+// - The page posts {type: 'precache', manifests, renditions} when a game
+//   starts; every file listed in the precache manifests of its categories
+//   (written by config_builder.py) is then fetched unless already cached.
+
+const CACHE_VERSION = 'v1';
+const SHELL_CACHE = `kengrean-shell-${CACHE_VERSION}`;
+const AUDIO_CACHE = `kengrean-audio-${CACHE_VERSION}`;
+
+// Header storing the content hash of a precached file in its cache entry
+const HASH_HEADER = 'X-Content-Hash';
+
+// Files fetched from the network first; they change whenever the build runs.
+// The plain script and stylesheet are only requested by the unbuilt index.html.
+const NETWORK_FIRST = [
+    /\/$/,
+    /\/index\.html$/,
+    /\/index\.build\.html$/,
+    /\/script\.js$/,
+    /\/styles\.css$/,
+    /\/asset-manifest\.json$/,
+    /_config\.json$/,
+    /\/config_shards\/[^/]+\/_index\.json$/,
+    /\/precache\/.+\.json$/
+];
+
+// Files cached on install besides those in asset-manifest.json
+const SHELL_FILES = [
+    './',
+    'index.html',
+    'index.build.html',
+    'asset-manifest.json',
+    'sounds/correct.mp3',
+    'sounds/incorrect.mp3'
+];
+
+// Files requested by concurrent precache fetches at most
+const PRECACHE_CONCURRENCY = 6;
+
+self.addEventListener('install', event => {
+    event.waitUntil(cacheShell().then(() => self.skipWaiting()));
+});
+
+self.addEventListener('activate', event => {
+    event.waitUntil((async () => {
+        // Drop the caches of earlier versions
+        const names = await caches.keys();
+        await Promise.all(names
+            .filter(name => name.startsWith('kengrean-') && name !== SHELL_CACHE && name !== AUDIO_CACHE)
+            .map(name => caches.delete(name)));
+        await self.clients.claim();
+    })());
+});
+
+self.addEventListener('fetch', event => {
+    const request = event.request;
+    const url = new URL(request.url);
+    if (request.method !== 'GET' || url.origin !== self.location.origin) {
+        return;
+    }
+
+    if (request.mode === 'navigate' || NETWORK_FIRST.some(pattern => pattern.test(url.pathname))) {
+        event.respondWith(networkFirst(request));
+    } else {
+        event.respondWith(cacheFirst(request));
+    }
+});
+
+self.addEventListener('message', event => {
+    const message = event.data || {};
+    if (message.type === 'precache') {
+        event.waitUntil(precacheManifests(message.manifests || [], message.renditions || []));
+    }
+});
+
+// Cache the page, the fingerprinted assets and the feedback sounds
+async function cacheShell() {
+    const cache = await caches.open(SHELL_CACHE);
+    const files = [...SHELL_FILES];
+    try {
+        const response = await fetch('asset-manifest.json', { cache: 'no-cache' });
+        if (response.ok) {
+            files.push(...Object.values(await response.json()));
+        }
+    } catch (error) {
+        // Not built with asset_builder.py; the plain files are cached as they are used
+    }
+
+    // One missing file must not keep the worker from installing
+    await Promise.all(files.map(file => cache.add(file).catch(error => {
+        console.warn(`Service worker could not cache ${file}: ${error.message}`);
+    })));
+}
+
+async function networkFirst(request) {
+    const cache = await caches.open(SHELL_CACHE);
+    try {
+        const response = await fetch(request);
+        if (response.ok) {
+            cache.put(stripSearch(request), response.clone());
+        }
+        return response;
+    } catch (error) {
+        const cached = await cache.match(stripSearch(request));
+        if (cached) {
+            return cached;
+        }
+        throw error;
+    }
+}
+
+async function cacheFirst(request) {
+    const cached = await caches.match(request, { ignoreVary: true });
+    if (cached) {
+        return request.headers.has('Range') ? rangeResponse(request, cached) : cached;
+    }
+
+    // Fetch the whole file, so it can be cached and ranges served from it
+    const response = await fetch(request.url);
+    if (response.ok && response.status === 200) {
+        const cache = await caches.open(isAudio(request.url) ? AUDIO_CACHE : SHELL_CACHE);
+        await cache.put(request.url, response.clone());
+        return request.headers.has('Range') ? rangeResponse(request, response) : response;
+    }
+    return response;
+}
+
+// Answer a Range request from a complete cached response
+async function rangeResponse(request, response) {
+    const body = await response.arrayBuffer();
+    const match = /^bytes=(\d*)-(\d*)$/.exec(request.headers.get('Range') || '');
+    if (!match || (!match[1] && !match[2])) {
+        return new Response(body, { status: 200, headers: response.headers });
+    }
+
+    let start, end;
+    if (match[1]) {
+        start = Number(match[1]);
+        end = match[2] ? Math.min(Number(match[2]), body.byteLength - 1) : body.byteLength - 1;
+    } else {
+        // Suffix range: the last N bytes
+        start = Math.max(body.byteLength - Number(match[2]), 0);
+        end = body.byteLength - 1;
+    }
+    if (start > end || start >= body.byteLength) {
+        return new Response(null, {
+            status: 416,
+            headers: { 'Content-Range': `bytes */${body.byteLength}` }
+        });
+    }
+
+    const headers = new Headers(response.headers);
+    headers.set('Content-Range', `bytes ${start}-${end}/${body.byteLength}`);
+    headers.set('Content-Length', String(end - start + 1));
+    return new Response(body.slice(start, end + 1), { status: 206, statusText: 'Partial Content', headers });
+}
+
+// Fetch every file of the given precache manifests that is not cached yet
+async function precacheManifests(manifestUrls, renditions) {
+    const files = new Map();
+    for (const manifestUrl of manifestUrls) {
+        try {
+            const response = await fetch(manifestUrl, { cache: 'no-cache' });
+            if (!response.ok) {
+                continue;
+            }
+            const manifest = await response.json();
+            for (const file of manifest.files || []) {
+                // Renditions are encoded from the clip, so its hash versions them too
+                files.set(selectRendition(file, renditions), file.hash);
+            }
+        } catch (error) {
+            console.warn(`Service worker could not load ${manifestUrl}: ${error.message}`);
+        }
+    }
+
+    const cache = await caches.open(AUDIO_CACHE);
+    const queue = [...files.entries()];
+    let fetched = 0;
+    const worker = async () => {
+        while (queue.length > 0) {
+            const [url, hash] = queue.shift();
+            if (await precacheFile(cache, url, hash)) {
+                fetched++;
+            }
+        }
+    };
+    await Promise.all(Array.from({ length: PRECACHE_CONCURRENCY }, worker));
+    console.log(`Service worker precached ${fetched} of ${files.size} files`);
+}
+
+// Cache one file unless the cached copy has the same content hash.
+// Returns true if it was fetched.
+async function precacheFile(cache, url, hash) {
+    const cached = await cache.match(url);
+    if (cached && (!hash || cached.headers.get(HASH_HEADER) === hash)) {
+        return false;
+    }
+
+    try {
+        const response = await fetch(url, { cache: 'no-cache' });
+        if (!response.ok) {
+            return false;
+        }
+        const headers = new Headers(response.headers);
+        if (hash) {
+            headers.set(HASH_HEADER, hash);
+        }
+        await cache.put(url, new Response(await response.blob(), { status: 200, headers }));
+        return true;
+    } catch (error) {
+        // Offline or unreachable; the file is fetched when it is played
+        return false;
+    }
+}
+
+// The rendition the page plays for a manifest file, or the file itself
+function selectRendition(file, renditions) {
+    for (const name of renditions) {
+        if (file.renditions && file.renditions[name]) {
+            return new URL(file.renditions[name], self.registration.scope).href;
+        }
+    }
+    return new URL(file.url, self.registration.scope).href;
+}
+
+function isAudio(url) {
+    return /\.(mp3|ogg|m4a)$/.test(new URL(url).pathname);
+}
+
+// Cache pages and manifests without cache-busting queries
+function stripSearch(request) {
+    const url = new URL(request.url);
+    url.search = '';
+    return url.href;
+}
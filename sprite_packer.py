@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+
+import os
+import json
+import time
+from pydub import AudioSegment
+import config_builder
+import staged_output
+
+# Configuration
+ENGLISH_DIR = config_builder.ENGLISH_DIR
+KOREAN_DIR = config_builder.KOREAN_DIR
+SPRITES_DIR = config_builder.SPRITES_DIR
+BINS = config_builder.BINS
+
+# Silence inserted after every clip, so seeking a little late or stopping a
+# little early never plays part of the neighbouring clip
+SPRITE_GAP_MS = 300
+
+# Bitrate of the exported sprite files
+SPRITE_BITRATE = "64k"
+
+# Each category directory (e.g. English/Words/animals_1) is packed into one
+# sprite, sprites/<bin>/<language>_<category>.mp3, plus a table
+# sprites/<bin>/<language>_<category>.json that maps every clip's audio path
+# to its [start, duration] in milliseconds within the sprite.
+# config_builder reads these tables and adds the sprite positions to the
+# config entries.
+
+
+def get_sprite_paths(bin_name, category, language):
+    """
+    Return (sprite path, table path) of a category directory.
+    """
+    base = os.path.join(SPRITES_DIR, bin_name, f"{language}_{category}")
+    return f"{base}.mp3", f"{base}.json"
+
+
+def pack_directory(bin_name, category, language):
+    """
+    Concatenate all clips of one category directory into a sprite and write
+    its offset table. Returns the number of packed clips.
+    """
+    root_dir = ENGLISH_DIR if language == "en" else KOREAN_DIR
+    directory = os.path.join(root_dir, bin_name, category)
+    sprite_path, table_path = get_sprite_paths(bin_name, category, language)
+
+    # Read the clips of a staged build before they go live
+    source_directory = staged_output.input_path(directory)
+    try:
+        clip_names = sorted(entry.name for entry in os.scandir(source_directory)
+                            if entry.is_file() and entry.name.lower().endswith(".mp3"))
+    except FileNotFoundError:
+        clip_names = []
+
+    if not clip_names:
+        remove_sprite(bin_name, category, language)
+        return 0
+
+    gap = AudioSegment.silent(duration=SPRITE_GAP_MS)
+    sprite = AudioSegment.empty()
+    clips = {}
+    for clip_name in clip_names:
+        try:
+            clip = AudioSegment.from_mp3(os.path.join(source_directory, clip_name))
+        except Exception as e:
+            print(f"  - Error reading {clip_name}: {e}")
+            continue
+
+        clips[f"{root_dir}/{bin_name}/{category}/{clip_name}"] = [len(sprite), len(clip)]
+        sprite += clip + gap
+
+    os.makedirs(os.path.dirname(sprite_path), exist_ok=True)
+    sprite.export(staged_output.output_path(sprite_path), format="mp3", bitrate=SPRITE_BITRATE)
+
+    table = {"file": sprite_path.replace(os.sep, "/"), "clips": clips}
+    with open(staged_output.output_path(table_path), "w", encoding="utf-8") as f:
+        json.dump(table, f, ensure_ascii=False, indent=2)
+
+    print(f"Packed {len(clips)} clips into {sprite_path}")
+    return len(clips)
+
+
+def remove_sprite(bin_name, category, language):
+    """
+    Remove the sprite and table of a category directory, e.g. when its clips
+    were regenerated and the old offsets no longer apply.
+    """
+    for path in get_sprite_paths(bin_name, category, language):
+        staged_output.remove_output(path)
+
+
+def category_languages(category):
+    """
+    Return the languages that have an output directory for a category.
+    """
+    if category.startswith("english_"):
+        return ["en"]
+    if category.startswith("korean_"):
+        return ["ko"]
+    return ["en", "ko"]
+
+
+def pack_results(results):
+    """
+    Pack the categories processed by audio_generator.
+    """
+    packed = 0
+    for result in results:
+        for language in category_languages(result["category"]):
+            packed += pack_directory(result["bin"], result["category"], language)
+    return packed
+
+
+def pack_all(bins=None):
+    """
+    Pack every category directory of the given bins.
+    """
+    if bins is None:
+        bins = BINS
+
+    packed = 0
+    for language, root_dir in (("en", ENGLISH_DIR), ("ko", KOREAN_DIR)):
+        for bin_name in bins:
+            bin_dir = os.path.join(root_dir, bin_name)
+            if not os.path.isdir(bin_dir):
+                continue
+            for entry in sorted(os.scandir(bin_dir), key=lambda e: e.name):
+                if entry.is_dir():
+                    packed += pack_directory(bin_name, entry.name, language)
+    return packed
+
+
+def main():
+    """
+    Pack all categories into sprites and rebuild the config files with the
+    sprite positions.
+    """
+    print("Packing category audio sprites...")
+    start_time = time.time()
+    # Swap the sprites and the configs using them in together
+    staging = staged_output.begin()
+    try:
+        packed = pack_all()
+        print(f"Packed {packed} clips in {time.time() - start_time:.1f} seconds")
+
+        with staging.lock():
+            config_builder.build_configs()
+            config_builder.commit_build(staging)
+    finally:
+        staged_output.end()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+
+import os
+import uuid
+import shutil
+
+try:
+    import fcntl
+except ImportError:
+    # Windows
+    fcntl = None
+    import msvcrt
+
+# Directory the output of a run is written to before it goes live. It sits in
+# the output root, so it is on the same file system and swapping is a rename.
+# Every run stages under its own root inside it, so concurrent runs (e.g. one
+# per bin) never write to or clean up each other's staged files.
+STAGING_DIR = ".build_staging"
+
+# Live directories moved aside by a commit, inside a run's staging root
+REPLACED_DIR = "_replaced"
+
+# Lock file in STAGING_DIR held while a run swaps its output into place, so
+# the commits of concurrent runs (and the audio store cleanup that follows
+# them) never interleave
+COMMIT_LOCK_FILE = "commit.lock"
+
+
+class FileLock:
+    """
+    Exclusive lock on a file, shared between processes. It is released
+    when the holding process exits, however it exits. Acquiring a lock the
+    process already holds nests.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+        self._depth = 0
+
+    def acquire(self, blocking=True):
+        """
+        Take the lock, waiting for other processes to release it unless
+        blocking is False. Returns True if the lock is held.
+        """
+        if self._depth == 0:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            lock_file = open(self.path, "a+")
+            try:
+                if fcntl is not None:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+                else:
+                    lock_file.seek(0)
+                    # LK_LOCK gives up after ten seconds; keep waiting
+                    while True:
+                        try:
+                            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK, 1)
+                            break
+                        except OSError:
+                            if not blocking:
+                                raise
+            except OSError:
+                lock_file.close()
+                return False
+            self._file = lock_file
+        self._depth += 1
+        return True
+
+    def release(self):
+        self._depth -= 1
+        if self._depth == 0:
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            else:
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+
+# Locks of this process by path, so nested uses share one lock
+_locks = {}
+
+
+def get_lock(path):
+    """
+    Return this process's lock on the file at path.
+    """
+    path = os.path.abspath(path)
+    if path not in _locks:
+        _locks[path] = FileLock(path)
+    return _locks[path]
+
+
+def new_root(staging_dir=STAGING_DIR):
+    """
+    Return a staging root of its own for a run that does not resume.
+    """
+    return os.path.join(staging_dir, f"run-{os.getpid()}-{uuid.uuid4().hex[:8]}")
+
+
+class StagedOutput:
+    """
+    Output of a run that is written beside the live files and swapped into
+    place once the run is complete.
+
+    A staged path keeps its live relative path inside the staging root, e.g.
+    Korean/Words/animals is written to .build_staging/Korean/Words/animals.
+    The live tree is not touched until commit(), which renames every staged
+    path into place in the order it was staged: audio directories first,
+    sprites, manifests and shards next, and the config files last.
+
+    A file swap is a single atomic os.replace. A directory cannot replace a
+    non-empty directory in one rename, so the live directory is moved aside
+    first and the staged one renamed into its place right after; only
+    between those two renames is the live path missing. If a commit is
+    interrupted, recover() moves displaced directories back on the next run.
+
+    Commits hold the commit lock of the staging directory the root is in,
+    so concurrent runs swap their output in one after the other.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.claimed = False
+        # Live path -> "file", "dir", or None when the live file is removed
+        # on commit. Dicts keep insertion order, which is the commit order.
+        self.paths = {}
+
+    def staged_path(self, path):
+        return os.path.join(self.root, os.path.normpath(path))
+
+    def lock(self):
+        """
+        Return the lock serializing the commits of every run staging beside this one.
+        """
+        return get_lock(os.path.join(os.path.dirname(self.root), COMMIT_LOCK_FILE))
+
+    def claim(self):
+        """
+        Mark the staging root as in use by this process. Returns False if
+        another running process already uses it.
+        """
+        if not self.claimed:
+            self.claimed = get_lock(self.root + ".lock").acquire(blocking=False)
+        return self.claimed
+
+    def release(self):
+        """
+        Give up a claim on the staging root.
+        """
+        if self.claimed:
+            get_lock(self.root + ".lock").release()
+            self.claimed = False
+
+    def find(self, path):
+        """
+        Return the registered path that is path or one of its parents, or None.
+        """
+        current = os.path.normpath(path)
+        while current:
+            if current in self.paths:
+                return current
+            parent = os.path.dirname(current)
+            if parent == current:
+                break
+            current = parent
+        return None
+
+    def stage(self, path, kind="file"):
+        """
+        Register path as part of the run's output and return where to write
+        it. Paths inside an already staged directory are not registered
+        again. Directories are created; for files, their parent is.
+
+        Staging a path again moves it to the end of the commit order, so a
+        file that is restaged once written goes live after everything that
+        was staged while it was written (e.g. a config after its clips).
+        """
+        covering = self.find(path)
+        if covering is None or self.paths[covering] is None or covering == os.path.normpath(path):
+            self.paths.pop(os.path.normpath(path), None)
+            self.paths[os.path.normpath(path)] = kind
+        staged = self.staged_path(path)
+        os.makedirs(staged if kind == "dir" else os.path.dirname(staged), exist_ok=True)
+        return staged
+
+    def remove(self, path):
+        """
+        Remove the live file at path when the run is committed.
+        """
+        staged = self.staged_path(path)
+        if os.path.isfile(staged):
+            os.remove(staged)
+        self.paths[os.path.normpath(path)] = None
+
+    def resolve(self, path):
+        """
+        Return where the current content of a live path is: its staged copy
+        if this run wrote it, the live path otherwise, or None if this run
+        removes it.
+        """
+        covering = self.find(path)
+        if covering is None:
+            return path
+        if self.paths[covering] is None:
+            return None
+        return self.staged_path(path)
+
+    def listdir(self, path):
+        """
+        List a directory as it will be after the commit: the live entries
+        plus staged files in it, without removed ones.
+        """
+        resolved = self.resolve(path)
+        try:
+            names = set(os.listdir(resolved)) if resolved is not None else set()
+        except FileNotFoundError:
+            names = set()
+
+        path = os.path.normpath(path)
+        if resolved == path:
+            for staged, kind in self.paths.items():
+                if os.path.dirname(staged) != path:
+                    continue
+                if kind is None:
+                    names.discard(os.path.basename(staged))
+                else:
+                    names.add(os.path.basename(staged))
+        return sorted(names)
+
+    def merge(self, paths):
+        """
+        Add paths staged by another process (e.g. a worker) into this one.
+        """
+        for path, kind in paths.items():
+            self.paths[path] = kind
+
+    def commit(self):
+        """
+        Swap every staged path into place. Returns the number of swapped paths.
+        """
+        with self.lock():
+            return self._commit()
+
+    def _commit(self):
+        replaced_root = os.path.join(self.root, REPLACED_DIR)
+        count = 0
+        for path, kind in self.paths.items():
+            staged = self.staged_path(path)
+            if kind is None:
+                if os.path.isfile(path):
+                    os.remove(path)
+                    # Drop the directory as well if that was its last file
+                    try:
+                        os.rmdir(os.path.dirname(path))
+                    except OSError:
+                        pass
+                continue
+            if not os.path.exists(staged):
+                continue
+
+            parent = os.path.dirname(path)
+            if parent:
+                os.makedirs(parent, exist_ok=True)
+            if kind == "file":
+                os.replace(staged, path)
+            else:
+                if os.path.isdir(path):
+                    replaced = os.path.join(replaced_root, path)
+                    shutil.rmtree(replaced, ignore_errors=True)
+                    os.makedirs(os.path.dirname(replaced), exist_ok=True)
+                    os.rename(path, replaced)
+                os.rename(staged, path)
+            count += 1
+
+        committed = list(self.paths)
+        self.paths = {}
+        shutil.rmtree(replaced_root, ignore_errors=True)
+        self.prune(committed)
+        return count
+
+    def prune(self, paths):
+        """
+        Remove the directories left empty in the staging root by committing
+        the given paths, up to the root itself. Only the directories these
+        paths were staged in are looked at; clips kept for resuming an
+        interrupted run stay.
+        """
+        root = os.path.normpath(self.root)
+        for path in paths:
+            directory = os.path.dirname(self.staged_path(path))
+            while directory.startswith(root):
+                try:
+                    os.rmdir(directory)
+                except OSError:
+                    # Not empty, or already removed
+                    if os.path.exists(directory):
+                        break
+                directory = os.path.dirname(directory)
+
+    def recover(self):
+        """
+        Move live directories displaced by an interrupted commit back into
+        place. Runs killed mid-commit may have staged in any root, so the
+        roots of every run are checked; holding the commit lock, no other
+        commit is in progress.
+        """
+        staging_dir = os.path.dirname(self.root)
+        with self.lock():
+            try:
+                roots = [os.path.join(staging_dir, name) for name in sorted(os.listdir(staging_dir))]
+            except FileNotFoundError:
+                roots = []
+            for root in roots:
+                replaced_root = os.path.join(root, REPLACED_DIR)
+                for dirpath, dirnames, _ in os.walk(replaced_root):
+                    for name in list(dirnames):
+                        replaced = os.path.join(dirpath, name)
+                        path = os.path.relpath(replaced, replaced_root)
+                        if not os.path.exists(path):
+                            print(f"Restoring {path} from an interrupted commit")
+                            os.rename(replaced, path)
+                            dirnames.remove(name)
+                shutil.rmtree(replaced_root, ignore_errors=True)
+
+
+# The staged output of the running build, shared by the generator, the sprite
+# packer and the config builder. Without one, output is written in place.
+_active = None
+
+
+def begin(root=None):
+    """
+    Start staging output under root, or under a new root of this run's own.
+    Returns the new StagedOutput.
+    """
+    global _active
+    _active = StagedOutput(root if root is not None else new_root())
+    return _active
+
+
+def active():
+    """
+    Return the StagedOutput of the running build, or None.
+    """
+    return _active
+
+
+def end():
+    """
+    Stop staging; output is written in place again.
+    """
+    global _active
+    if _active is not None:
+        _active.release()
+    _active = None
+
+
+def commit_lock():
+    """
+    Return the commit lock of the running build, or the one in STAGING_DIR
+    for output written in place.
+    """
+    if _active is not None:
+        return _active.lock()
+    return get_lock(os.path.join(STAGING_DIR, COMMIT_LOCK_FILE))
+
+
+def output_path(path, kind="file"):
+    """
+    Return the path to write the new content of a live path to.
+    """
+    if _active is None:
+        return path
+    return _active.stage(path, kind)
+
+
+def input_path(path):
+    """
+    Return the path to read the current content of a live path from, or
+    None if the running build removes it.
+    """
+    if _active is None:
+        return path
+    return _active.resolve(path)
+
+
+def remove_output(path):
+    """
+    Remove a live file, when the running build is committed if one is staging.
+    """
+    if _active is None:
+        if os.path.exists(path):
+            os.remove(path)
+    else:
+        _active.remove(path)
+
+
+def list_output(path):
+    """
+    List the file names in a live directory as the running build leaves it.
+    """
+    if _active is None:
+        try:
+            return sorted(os.listdir(path))
+        except FileNotFoundError:
+            return []
+    return _active.listdir(path)
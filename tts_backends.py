@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+
+import os
+import time
+import random
+import threading
+import shutil
+import subprocess
+import tempfile
+
+
+class TransientTTSError(Exception):
+    """
+    A synthesis request failed for a reason that may go away on retry
+    (network error, server overload).
+    """
+
+
+class RateLimitError(TransientTTSError):
+    """
+    The service rejected a request because we sent too many (HTTP 429).
+    retry_after is the wait in seconds the service asked for, if any.
+    """
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class TTSBackend:
+    """
+    Base class for text-to-speech engines used by audio_generator.
+
+    A backend writes one MP3 file per synthesize() call and must be safe to
+    call from several threads at once. "version" is part of the synthesis
+    cache key, so it must change whenever the produced audio changes.
+    Failures worth retrying are raised as TransientTTSError, throttling as
+    RateLimitError.
+    """
+
+    name = ""
+    version = "0"
+
+    # Requests per second the service tolerates, or None for local engines
+    # that need no rate limit
+    requests_per_second = None
+
+    # Maximum characters of text packed into one synthesize_batch request.
+    # 0 means the backend has no batching and synthesize_batch makes one
+    # request per text.
+    max_batch_chars = 0
+
+    def is_available(self):
+        """
+        Return True if the engine can be used on this machine.
+        """
+        return True
+
+    def synthesize(self, text, language, slow, output_filename):
+        """
+        Write speech for text to output_filename as MP3. Raises on failure.
+        """
+        raise NotImplementedError
+
+    def synthesize_batch(self, texts, language, slow, output_filenames):
+        """
+        Write one MP3 per text. Backends with per-request overhead override
+        this to synthesize all texts in one request.
+        """
+        for text, output_filename in zip(texts, output_filenames):
+            self.synthesize(text, language, slow, output_filename)
+
+
+# Pause inserted between packed texts, and the silence detection used to
+# split the batched audio back into clips
+BATCH_SEPARATOR = ". "
+SPLIT_MIN_SILENCE_MS = 250
+SPLIT_SILENCE_BELOW_AVERAGE_DB = 16
+SPLIT_KEEP_SILENCE_MS = 60
+
+
+def pack_texts(texts):
+    """
+    Join texts into one utterance with a sentence pause after each of them.
+    """
+    packed = []
+    for text in texts:
+        text = text.strip()
+        # Keep existing end punctuation (e.g. "?") so intonation is unchanged
+        packed.append(text if text[-1:] in ".?!" else text + BATCH_SEPARATOR.strip())
+    return " ".join(packed)
+
+
+def split_batch_audio(batch_filename, output_filenames):
+    """
+    Split the audio of a packed request into one MP3 per text, cutting at
+    the silences between them. Raises ValueError if the number of speech
+    segments does not match the number of texts.
+    """
+    from pydub import AudioSegment
+    from pydub.silence import detect_nonsilent
+
+    audio = AudioSegment.from_mp3(batch_filename)
+    segments = detect_nonsilent(audio, min_silence_len=SPLIT_MIN_SILENCE_MS,
+                                silence_thresh=audio.dBFS - SPLIT_SILENCE_BELOW_AVERAGE_DB)
+    if len(segments) != len(output_filenames):
+        raise ValueError(f"found {len(segments)} speech segments for {len(output_filenames)} texts")
+
+    for (start, end), output_filename in zip(segments, output_filenames):
+        start = max(0, start - SPLIT_KEEP_SILENCE_MS)
+        end = min(len(audio), end + SPLIT_KEEP_SILENCE_MS)
+        audio[start:end].export(output_filename, format="mp3", bitrate="32k")
+
+
+class GTTSBackend(TTSBackend):
+    """
+    Google Translate text-to-speech through gTTS (requires network access).
+    """
+
+    name = "gtts"
+
+    # gTTS splits longer text into several requests of at most 100 characters
+    max_batch_chars = 100
+
+    # Google throttles bursts of anonymous requests
+    requests_per_second = 10.0
+
+    def __init__(self):
+        try:
+            import gtts
+        except ImportError:
+            gtts = None
+        self._gtts = gtts
+        self.version = getattr(gtts, "__version__", "unknown")
+
+    def is_available(self):
+        return self._gtts is not None
+
+    def synthesize(self, text, language, slow, output_filename):
+        tts = self._gtts.gTTS(text=text, lang=language, slow=slow)
+        try:
+            tts.save(output_filename)
+        except self._gtts.gTTSError as e:
+            response = getattr(e, "rsp", None)
+            status = getattr(response, "status_code", None)
+            if status == 429:
+                retry_after = response.headers.get("Retry-After")
+                raise RateLimitError(f"gTTS rate limited (429): {e}",
+                                     float(retry_after) if retry_after and retry_after.isdigit() else None)
+            if status is None or status >= 500:
+                # No response or status at all (connection error) or a server-side failure
+                raise TransientTTSError(f"gTTS request failed: {e}")
+            raise
+
+    def synthesize_batch(self, texts, language, slow, output_filenames):
+        fd, batch_filename = tempfile.mkstemp(suffix=".mp3")
+        os.close(fd)
+        try:
+            self.synthesize(pack_texts(texts), language, slow, batch_filename)
+            split_batch_audio(batch_filename, output_filenames)
+        finally:
+            os.remove(batch_filename)
+
+
+class EspeakBackend(TTSBackend):
+    """
+    Offline synthesis with espeak-ng (or espeak). The WAV output is encoded
+    to MP3 with pydub, which needs ffmpeg.
+    """
+
+    name = "espeak"
+
+    # Words per minute for normal and slow speech
+    SPEED = 150
+    SLOW_SPEED = 100
+
+    def __init__(self):
+        self.executable = shutil.which("espeak-ng") or shutil.which("espeak")
+        self.version = "unknown"
+        if self.executable:
+            try:
+                output = subprocess.run([self.executable, "--version"], capture_output=True,
+                                        text=True, timeout=10).stdout
+                self.version = output.strip() or "unknown"
+            except (OSError, subprocess.SubprocessError):
+                pass
+
+    def is_available(self):
+        return self.executable is not None
+
+    def synthesize(self, text, language, slow, output_filename):
+        from pydub import AudioSegment
+
+        speed = self.SLOW_SPEED if slow else self.SPEED
+        fd, wav_path = tempfile.mkstemp(suffix=".wav")
+        os.close(fd)
+        try:
+            subprocess.run([self.executable, "-v", language, "-s", str(speed), "-w", wav_path, text],
+                           check=True, capture_output=True, timeout=60)
+            AudioSegment.from_wav(wav_path).export(output_filename, format="mp3", bitrate="32k")
+        finally:
+            os.remove(wav_path)
+
+
+class StubBackend(TTSBackend):
+    """
+    Deterministic offline stand-in that writes a short silent MP3 after a
+    delay. Used to run the pipeline in tests and benchmarks without network.
+    """
+
+    name = "stub"
+    version = "1"
+    max_batch_chars = 100
+
+    # Simulated round-trip time for one synthesis request, in seconds
+    latency = 0.05
+
+    # Share of requests rejected with a simulated 429 response
+    throttle_rate = 0.0
+
+    # One silent MPEG-1 Layer III frame (128 kbps, 44.1 kHz, mono)
+    FRAME = b"\xff\xfb\x90\xc4" + b"\x00" * 413
+
+    def __init__(self):
+        # Seeded so throttled runs are reproducible
+        self._random = random.Random(0)
+        self._random_lock = threading.Lock()
+
+    def _request(self):
+        time.sleep(self.latency)
+        with self._random_lock:
+            throttled = self._random.random() < self.throttle_rate
+        if throttled:
+            raise RateLimitError("stub rate limited (429)")
+
+    def synthesize(self, text, language, slow, output_filename):
+        self._request()
+        self._write_clip(text, slow, output_filename)
+
+    def synthesize_batch(self, texts, language, slow, output_filenames):
+        # One simulated round trip for the whole batch
+        self._request()
+        for text, output_filename in zip(texts, output_filenames):
+            self._write_clip(text, slow, output_filename)
+
+    def _write_clip(self, text, slow, output_filename):
+        # Longer text gives a longer clip, slow speech doubles it
+        frame_count = 5 + len(text) * (2 if slow else 1)
+        with open(output_filename, "wb") as f:
+            f.write(self.FRAME * frame_count)
+
+
+class ThrottledStubBackend(StubBackend):
+    """
+    Stub backend that answers about a third of all requests with a 429,
+    to exercise rate limiting, retries and resuming.
+    """
+
+    name = "stub-throttled"
+    throttle_rate = 0.3
+    requests_per_second = 50.0
+
+
+# Backends selectable by name
+BACKENDS = {
+    GTTSBackend.name: GTTSBackend,
+    EspeakBackend.name: EspeakBackend,
+    StubBackend.name: StubBackend,
+    ThrottledStubBackend.name: ThrottledStubBackend,
+}
+
+
+def get_backend(name):
+    """
+    Create the backend with the given name. Raises ValueError if the name is
+    unknown or the engine is not installed.
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown TTS backend '{name}'. Options: {', '.join(BACKENDS)}")
+    backend = BACKENDS[name]()
+    if not backend.is_available():
+        raise ValueError(f"TTS backend '{name}' is not available on this machine")
+    return backend
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+
+import os
+import hashlib
+import shutil
+import threading
+
+# Share of max_bytes the cache is trimmed to once it grows past the cap, so
+# the entries are scanned and sorted once per eviction round rather than on
+# every store while the cache is full
+EVICTION_LOW_WATER = 0.9
+
+
+class TTSCache:
+    """
+    Persistent on-disk cache of synthesized MP3 files.
+
+    Entries are content addressed by a SHA-256 of (text, language, slow,
+    backend version), so the same text is only synthesized once across runs,
+    bins and categories. The cache is capped at max_bytes; when it grows past
+    the cap the least recently used entries are evicted until it is back
+    under the low-water mark. Recency is tracked through file modification
+    times, which are refreshed on every hit. The total size is kept as a
+    running count between evictions.
+    """
+
+    def __init__(self, cache_dir, max_bytes=200 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._total_bytes = None
+
+    @staticmethod
+    def make_key(text, language, slow, backend_version):
+        """
+        Build the cache key for a synthesis request.
+        """
+        raw = "\x1f".join([backend_version, language, "slow" if slow else "normal", text])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def path_for(self, key):
+        """
+        Return the cache file path for a key (sharded by the first two hex digits).
+        """
+        return os.path.join(self.cache_dir, key[:2], f"{key}.mp3")
+
+    def fetch(self, key, output_filename):
+        """
+        Copy a cached clip to output_filename. Returns True on a cache hit.
+        """
+        cached_path = self.path_for(key)
+        try:
+            shutil.copyfile(cached_path, output_filename)
+            # Mark as recently used for LRU eviction
+            os.utime(cached_path, None)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return False
+
+        with self._lock:
+            self.hits += 1
+        return True
+
+    def store(self, key, source_filename):
+        """
+        Add a freshly synthesized clip to the cache and evict old entries if needed.
+        """
+        cached_path = self.path_for(key)
+        os.makedirs(os.path.dirname(cached_path), exist_ok=True)
+
+        # Write to a temporary name first so readers never see a partial file
+        # (unique per process and thread, as several generator processes can share the cache)
+        temp_path = f"{cached_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        shutil.copyfile(source_filename, temp_path)
+        size = os.path.getsize(temp_path)
+        previous_size = os.path.getsize(cached_path) if os.path.exists(cached_path) else 0
+        os.replace(temp_path, cached_path)
+
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = self._scan_size()
+            else:
+                self._total_bytes += size - previous_size
+
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _list_entries(self):
+        """
+        List (mtime, size, path) for every cached clip.
+        """
+        entries = []
+        if not os.path.isdir(self.cache_dir):
+            return entries
+        for shard in os.scandir(self.cache_dir):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.is_file() and entry.name.endswith(".mp3"):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def _scan_size(self):
+        return sum(size for _, size, _ in self._list_entries())
+
+    def _evict(self):
+        """
+        Remove least recently used entries until the cache is under the
+        low-water mark. Called with the lock held.
+        """
+        entries = sorted(self._list_entries())
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * EVICTION_LOW_WATER
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+        self._total_bytes = total
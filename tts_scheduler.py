@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+
+import os
+import json
+import time
+import random
+import hashlib
+import threading
+from tts_backends import RateLimitError, TransientTTSError
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket limiting how many synthesis requests start per
+    second. Up to "burst" requests may start back to back; after that
+    requests are spaced out to "rate" per second.
+
+    When the service throttles us, penalize() halves the rate and blocks
+    every worker for a cool-down period. Each successful request then adds
+    a little of the rate back, until the configured rate is reached again.
+    """
+
+    def __init__(self, rate, burst=1):
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = max(1, burst)
+        # Never slow down below a tenth of the configured rate
+        self.min_rate = rate / 10
+        self._tokens = float(self.burst)
+        self._last_refill = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+
+    def acquire(self):
+        """
+        Block until a request may start.
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self._blocked_until:
+                    wait = self._blocked_until - now
+                elif self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                else:
+                    wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def penalize(self, cooldown):
+        """
+        Slow down after a rate-limit response: halve the rate, drop any saved
+        burst and keep all workers waiting for cooldown seconds.
+        """
+        with self._lock:
+            now = time.monotonic()
+            # Requests that were already in flight when the first 429 arrived
+            # report the same overload; only slow down once per cool-down
+            if now >= self._blocked_until:
+                self.rate = max(self.min_rate, self.rate / 2)
+            self._tokens = 0.0
+            self._last_refill = now
+            self._blocked_until = max(self._blocked_until, now + cooldown)
+
+    def reward(self):
+        """
+        Recover part of the rate after a successful request.
+        """
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+
+
+class SynthesisScheduler:
+    """
+    Runs backend requests through a shared token bucket and retries
+    transient failures (including rate limiting) with jittered exponential
+    backoff. Any other error is raised immediately. With rate None,
+    requests are not rate limited and only retried.
+    """
+
+    def __init__(self, rate, burst=1, max_attempts=5, backoff_base=1.0, backoff_max=60.0):
+        self.bucket = TokenBucket(rate, burst) if rate else None
+        self.max_attempts = max(1, max_attempts)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.requests = 0
+        self.retries = 0
+        self.throttled = 0
+        self._lock = threading.Lock()
+
+    def backoff_delay(self, attempt):
+        """
+        Return the wait before retry number attempt (1-based), using "full
+        jitter": a random delay up to the exponential cap, so workers that
+        failed together do not retry together.
+        """
+        cap = min(self.backoff_max, self.backoff_base * (2 ** (attempt - 1)))
+        return random.uniform(0, cap)
+
+    def call(self, func, *args):
+        """
+        Call func(*args) once a token is available, retrying transient errors.
+        """
+        attempt = 1
+        while True:
+            if self.bucket is not None:
+                self.bucket.acquire()
+            with self._lock:
+                self.requests += 1
+            try:
+                result = func(*args)
+            except TransientTTSError as e:
+                if attempt >= self.max_attempts:
+                    raise
+
+                delay = self.backoff_delay(attempt)
+                if isinstance(e, RateLimitError):
+                    # A server-provided Retry-After wins over our own guess
+                    delay = max(delay, e.retry_after or 0)
+                    if self.bucket is not None:
+                        self.bucket.penalize(delay)
+                    with self._lock:
+                        self.throttled += 1
+                with self._lock:
+                    self.retries += 1
+                print(f"  - {e}; retrying in {delay:.1f} s (attempt {attempt + 1} of {self.max_attempts})")
+                time.sleep(delay)
+                attempt += 1
+                continue
+
+            if self.bucket is not None:
+                self.bucket.reward()
+            return result
+
+
+class JobJournal:
+    """
+    Append-only log of synthesized clips, so an interrupted run can resume.
+
+    Every line records one clip written to its provisional slot path, with
+    a key describing what was synthesized, the pipeline stage the clip has
+    reached ("synthesized" or "postprocessed") and a hash of the file. On
+    the next run, a planned job whose key and path match a journal line, and
+    whose file still has the recorded hash, is not synthesized again. The
+    journal is deleted once the run's output has been committed.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        self._lock = threading.Lock()
+        self._file = None
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # Last line of a run killed mid-write
+                        continue
+                    self.entries[record["path"]] = record
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def make_key(text, language, slow, backend_version):
+        """
+        Build the journal key of a synthesis job.
+        """
+        raw = json.dumps([backend_version, language, slow, text], ensure_ascii=False)
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def file_hash(path):
+        with open(path, "rb") as f:
+            return hashlib.sha1(f.read()).hexdigest()
+
+    def paths(self):
+        """
+        Return the set of output paths recorded in the journal.
+        """
+        return set(self.entries)
+
+    def lookup(self, key, path):
+        """
+        Return the stage the clip at path reached for key in an earlier run,
+        or None if it is not journaled or the file changed since.
+        """
+        record = self.entries.get(path)
+        if record is None or record["key"] != key:
+            return None
+        try:
+            if self.file_hash(path) != record["hash"]:
+                return None
+        except FileNotFoundError:
+            return None
+        return record["stage"]
+
+    def record(self, key, path, stage="synthesized"):
+        """
+        Append a completed clip to the journal and flush it to disk.
+        """
+        record = {"key": key, "path": path, "stage": stage, "hash": self.file_hash(path)}
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(line)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self.entries[path] = record
+
+    def close(self):
+        """
+        Close the journal file; it stays on disk until remove() is called.
+        """
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def remove(self):
+        """
+        Delete the journal after a completed run.
+        """
+        self.close()
+        with self._lock:
+            self.entries = {}
+            if os.path.exists(self.path):
+                os.remove(self.path)